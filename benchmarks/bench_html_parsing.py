@@ -0,0 +1,83 @@
+"""
+뉴스 HTML 파싱 단계 처리량 측정
+저장된 HTML(benchmarks/fixtures/html)을 bytes로 복제해 백필과 같은 분량을 만들고,
+BeautifulSoup(html.parser) / lxml 단일 프로세스 / lxml 프로세스 풀(parse_many) 처리량을 비교합니다. (네트워크/DB 불필요)
+
+사용법:
+    python benchmarks/bench_html_parsing.py                      # 목록 2,000페이지 + 기사 2,000페이지
+    python benchmarks/bench_html_parsing.py --pages 500 --workers 4
+"""
+
+import sys
+import os
+import time
+import argparse
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finance_agent import html_parsing
+from finance_agent.html_parsing import parse_many, shutdown_pool
+from benchmarks.synthetic import load_html_fixtures
+
+ARTICLE_FIXTURES = ["naver_article.html", "generic_article.html", "paragraph_article.html"]
+LIST_FIXTURES = ["naver_news_list.html"]
+
+
+def _pages(names: List[str], n_pages: int) -> List[bytes]:
+    fixtures = load_html_fixtures()
+    return [fixtures[names[i % len(names)]].encode("utf-8") for i in range(n_pages)]
+
+
+def _timed(func: Callable[[], list]) -> tuple:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def _bs4(kind: str, pages: List[bytes]) -> list:
+    """lxml이 없을 때와 같은 경로 (이전 구현과 동일한 BeautifulSoup html.parser)"""
+    backend, html_parsing.lxml = html_parsing.lxml, None
+    try:
+        return parse_many(kind, pages, workers=1)
+    finally:
+        html_parsing.lxml = backend
+
+
+def main():
+    parser = argparse.ArgumentParser(description="뉴스 HTML 파싱 처리량 측정")
+    parser.add_argument("--pages", type=int, default=2000, help="종류(목록/기사)별 페이지 수")
+    parser.add_argument("--workers", type=int, default=0, help="프로세스 풀 크기 (0이면 CPU 수)")
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    print(f"페이지: 종류별 {args.pages}개, 프로세스 풀 {workers}개, lxml {'사용' if html_parsing.lxml else '미설치'}")
+    print(f"{'kind':<12}{'backend':<20}{'seconds':>10}{'pages/s':>12}")
+
+    mismatches = 0
+    for kind, names in [("news_list", LIST_FIXTURES), ("article", ARTICLE_FIXTURES)]:
+        pages = _pages(names, args.pages)
+        runs = [("bs4 html.parser", lambda: _bs4(kind, pages))]
+        if html_parsing.lxml:
+            runs.append(("lxml", lambda: parse_many(kind, pages, workers=1)))
+            # 풀 생성(프로세스 기동) 비용은 첫 호출에서 치르고 측정
+            parse_many(kind, pages[:workers * 8], workers=workers)
+            runs.append((f"lxml x{workers} process", lambda: parse_many(kind, pages, workers=workers)))
+
+        expected = None
+        for backend, func in runs:
+            elapsed, result = _timed(func)
+            expected = result if expected is None else expected
+            mismatches += result != expected
+            print(f"{kind:<12}{backend:<20}{elapsed:>10.2f}{len(pages) / elapsed:>12.0f}")
+    shutdown_pool()
+
+    if mismatches:
+        print("✗ 백엔드별 파싱 결과가 다릅니다.")
+        return 1
+    print("✓ 모든 백엔드의 파싱 결과가 같습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+fetch_all_stocks_data 변환 단계 메모리/시간 측정
+yf.download와 동일한 형태의 합성 데이터로 reshape_download의 peak 메모리를 측정하고
+Config.FETCH_MEMORY_BUDGET_MB 예산과 비교합니다. (네트워크/DB 불필요)
+"""
+
+import sys
+import os
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import Config
+from finance_agent.updater import reshape_download
+from benchmarks.synthetic import make_download_frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fetch_all_stocks_data 변환 메모리 측정")
+    parser.add_argument("--tickers", type=int, default=2700)
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    raw = make_download_frame(args.tickers, args.years)
+    raw_mb = raw.memory_usage(deep=True).sum() / 1024 ** 2
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = reshape_download(raw)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    peak_mb = peak / 1024 ** 2
+    result_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+    budget = Config.FETCH_MEMORY_BUDGET_MB
+
+    print(f"입력(wide): {raw.shape}, {raw_mb:.1f}MB")
+    print(f"결과(long): {df.shape}, {result_mb:.1f}MB")
+    print(f"변환 시간: {elapsed:.2f}s, 변환 중 추가 peak: {peak_mb:.1f}MB (예산 {budget}MB)")
+
+    if result_mb > budget or peak_mb > 2 * budget:
+        print("✗ 메모리 예산 초과")
+        return 1
+    print("✓ 메모리 예산 이내")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+SQL repair regression check
+SqlRepairer가 고쳐야 하는 것(대소문자만 다른 칼럼, 등록된 회사명 ticker)만 고치고,
+스키마에 없는 칼럼(ma_120, ma_200, ma_50 …)은 근사 일치로 바꾸지 않고 그대로 두는지 확인합니다. (DB/LLM 불필요)
+
+사용법:
+    python benchmarks/check_sql_repair.py
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from finance_agent.sql_repair import SqlRepairer
+
+COMPANIES = pd.DataFrame({"company_name": ["삼성전자", "테스트바이오"], "ticker": ["005930.KS", "0037T0.KQ"]})
+
+# (이름, 입력 SQL, 기대 SQL — None이면 수정 없이 그대로)
+REPAIR_CASES = [
+    ("unknown ma_120", "SELECT date, ma_120 FROM krx_stockprice WHERE ticker = '005930.KS'", None),
+    ("unknown ma_200", "SELECT date, ma_200 FROM krx_stockprice WHERE ticker = '005930.KS'", None),
+    ("unknown ma_50", "SELECT date, ma_50 FROM krx_stockprice WHERE ticker = '005930.KS'", None),
+    ("unknown prev_close", "SELECT date, prev_close FROM krx_stockprice WHERE ticker = '005930.KS'", None),
+    ("case-only column", "SELECT date, ma_VOL_20 FROM krx_stockprice WHERE ticker = '005930.KS'",
+     "SELECT date, ma_vol_20 FROM krx_stockprice WHERE ticker = '005930.KS'"),
+    ("company name literal", "SELECT close FROM krx_stockprice WHERE ticker = '삼성전자'",
+     "SELECT close FROM krx_stockprice WHERE ticker = '005930.KS'"),
+    ("alphanumeric ticker", "SELECT close FROM krx_stockprice WHERE ticker = '0037T0.KQ'", None),
+    ("unregistered name", "SELECT close FROM krx_stockprice WHERE ticker = '없는회사'", None),
+]
+
+# (이름, SQL, 오류 메시지) — 모두 로컬에서 고치지 않고 None (SQL Refiner로 넘김)
+REFINER_CASES = [
+    ("error ma_120", "SELECT ma_120 FROM krx_stockprice WHERE ticker = '005930.KS'",
+     "(1054, \"Unknown column 'ma_120' in 'field list'\")"),
+    ("error prev_close", "SELECT prev_close FROM krx_stockprice WHERE ticker = '005930.KS'",
+     "(1054, \"Unknown column 'prev_close' in 'field list'\")"),
+]
+
+
+def main():
+    repairer = SqlRepairer(COMPANIES)
+    failures = 0
+
+    for name, sql, expected in REPAIR_CASES:
+        fixed, fixes = repairer.repair(sql)
+        ok = (not fixes and fixed == sql) if expected is None else fixed == expected
+        failures += not ok
+        print(f"{'✓' if ok else '✗'} {name:<24} {fixed}" + ("" if ok else f"  (기대: {expected or sql})"))
+
+    for name, sql, error in REFINER_CASES:
+        fixed = repairer.repair_error(sql, error)
+        ok = fixed is None
+        failures += not ok
+        print(f"{'✓' if ok else '✗'} {name:<24} {'SQL Refiner로 넘김' if ok else fixed}")
+
+    if failures:
+        print(f"✗ {failures}개 케이스 실패")
+        return 1
+    print("✓ 모든 케이스 통과")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
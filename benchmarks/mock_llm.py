@@ -0,0 +1,181 @@
+"""
+Mock LLM
+ClovaX 접속이나 기록된 cassette 없이 골든 질문 하네스/부하 테스트를 실행하기 위한 결정적 LLM 클라이언트.
+프롬프트 종류(finance_agent/prompts.py 템플릿)를 알아보고 노드가 파싱하는 형식으로 답하며,
+호출마다 설정한 지연(latency ± jitter 비율)만큼 대기합니다.
+
+- query_parser: 질문에서 날짜 / 회사명(종목 레지스트리에서 가장 긴 일치) / 시장을 규칙으로 추출
+- sql_generation, sql_refinement: answers(질문 → SQL)에 있으면 그 SQL, 없으면 힌트 기반 기본 조회
+- 그 밖(명확화, 뉴스 요약, 일일 다이제스트, 주간 보고서, 대화 요약): 형식만 맞춘 고정 응답
+
+mock으로 잰 정답률은 LLM을 제외한 단계(SQL 수정/검사, 조회, 응답 구성, 뉴스 조회/크롤링)의 회귀를 확인하는 용도입니다.
+
+사용법:
+    from benchmarks.mock_llm import install_mock_llm, load_sql_answers
+    install_mock_llm(latency=0.8, answers=load_sql_answers(QUESTIONS_PATH))   # FinanceAgent 첫 호출 전에
+"""
+
+import re
+import json
+import time
+import random
+import threading
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+_QUESTION = re.compile(r"사용자 질문:\s*(.*)")
+_ORIGINAL_QUESTION = re.compile(r"원래 질문:\s*(.*)")
+_ORIGINAL_QUERY = re.compile(r"오류 쿼리:\s*(.*)")
+_TICKER_HINT = re.compile(r"종목 검색 힌트:\s*(ticker = '[^']+')")
+_MARKET_HINT = re.compile(r"시장 검색 힌트:\s*(ticker LIKE '[^']+')")
+_LATEST_DATE = re.compile(r"최신 날짜 (\d{4}-\d{2}-\d{2})")
+_DATE = re.compile(r"(\d{4})\s*[-./년]\s*(\d{1,2})\s*[-./월]\s*(\d{1,2})")
+_TITLE = re.compile(r"기사 제목:\s*(.*)")
+_BODY = re.compile(r"기사 본문:\s*(.*?)\n\s*요약:", re.DOTALL)
+_DIGEST_ARTICLE = re.compile(r"^\[기사 (\d+)\] (.*)$", re.MULTILINE)
+_DIGEST_COMPANY = re.compile(r"다음은 (.*?) 관련 \S+ 뉴스 기사들입니다")
+_REPORT_COMPANY = re.compile(r"\[회사명\]\s*(.*)")
+
+
+def load_sql_answers(path: str) -> Dict[str, str]:
+    """골든 질문 파일에서 질문 → 정답 SQL (check가 value/rows인 질문만)"""
+    answers = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                if item["check"]["type"] in ("value", "rows"):
+                    answers[item["question"].strip()] = item["check"]["sql"]
+    return answers
+
+
+def _last(pattern: re.Pattern, text: str) -> str:
+    matches = pattern.findall(text)
+    return matches[-1].strip() if matches else ""
+
+
+def _date(text: str) -> str:
+    m = _DATE.search(text)
+    return f"{int(m.group(1)):04d}-{int(m.group(2)):02d}-{int(m.group(3)):02d}" if m else ""
+
+
+def _json_block(data: Dict) -> str:
+    return "```json\n" + json.dumps(data, ensure_ascii=False, indent=4) + "\n```"
+
+
+class MockChatModel:
+    """ChatClovaX 대신 쓰는 클라이언트 (invoke(prompt)만 지원, 여러 스레드에서 공유 가능)"""
+
+    def __init__(self, latency: float = 0.8, jitter: float = 0.3,
+                 answers: Optional[Dict[str, str]] = None, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.answers = {q.strip(): sql for q, sql in (answers or {}).items()}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._company_names: Optional[List[str]] = None
+
+    # ----------------- 호출 -----------------
+    def invoke(self, prompt: str):
+        content = self.respond(prompt)
+        self._wait()
+        return SimpleNamespace(
+            content=content,
+            usage_metadata={"input_tokens": len(prompt) // 2, "output_tokens": len(content) // 2},
+            response_metadata={},
+        )
+
+    def _wait(self):
+        if self.latency <= 0:
+            return
+        with self._lock:
+            factor = self._rng.uniform(1 - self.jitter, 1 + self.jitter)
+        time.sleep(max(0.0, self.latency * factor))
+
+    def respond(self, prompt: str) -> str:
+        if "clarification_needed" in prompt:
+            return _json_block({"clarification_needed": False, "clarification_question": ""})
+        if "MYSQL 쿼리로 변환" in prompt:
+            return self._sql_generation(prompt)
+        if "다음 SQL 쿼리에서 오류가 발생했습니다" in prompt:
+            return self._sql_refinement(prompt)
+        if "금융 관련 질문이 주어졌을 때" in prompt:
+            return self._query_parser(_last(_QUESTION, prompt))
+        if "뉴스 기사 본문을 간결하게 요약" in prompt:
+            return self._news_summary(prompt)
+        if "뉴스 기사들입니다" in prompt:
+            return self._daily_digest(prompt)
+        if "주간 보고서" in prompt:
+            company = _last(_REPORT_COMPANY, prompt)
+            return (f"- **주요 동향:** {company} 관련 뉴스가 이어졌습니다.\n"
+                    f"- **핵심 이슈:** 일별 요약 참고\n- **종합 의견:** 추가 확인이 필요합니다.")
+        if "새로 합칠 대화" in prompt:
+            return "이전 대화에서 사용자가 종목 정보를 질문했습니다."
+        if prompt.strip() == "ping":
+            return "pong"
+        return "확인했습니다."
+
+    # ----------------- 프롬프트별 응답 -----------------
+    def _companies(self) -> List[str]:
+        if self._company_names is None:
+            from finance_agent.resources import get_company_df
+            df = get_company_df()
+            name_col = "company_name" if "company_name" in df.columns else "회사명"
+            # 긴 이름부터 비교해 'SK하이닉스'가 'SK'보다 먼저 일치하도록
+            self._company_names = sorted(set(df[name_col].astype(str).str.strip()), key=len, reverse=True)
+        return self._company_names
+
+    def _query_parser(self, question: str) -> str:
+        company = next((name for name in self._companies() if name and name in question), "")
+        upper = question.upper()
+        market = "KOSPI" if "KOSPI" in upper or "코스피" in question else "KOSDAQ" if "KOSDAQ" in upper or "코스닥" in question else ""
+        # 범위 질문(…부터 …까지)은 특정 날짜가 아니므로 ""
+        date = "" if len(_DATE.findall(question)) > 1 else _date(question)
+        return _json_block({"date": date, "company_name": company, "market": market})
+
+    def _default_sql(self, question: str, prompt: str) -> str:
+        date = _date(question) or _last(_LATEST_DATE, prompt)
+        ticker_hint = _last(_TICKER_HINT, prompt)
+        if ticker_hint:
+            where = f"{ticker_hint} AND date = '{date}'" if date else ticker_hint
+            return f"SELECT date, adj_close, volume FROM krx_stockprice WHERE {where} ORDER BY date DESC LIMIT 1"
+        conditions = [f"date = '{date}'"] if date else []
+        market_hint = _last(_MARKET_HINT, prompt)
+        if market_hint:
+            conditions.append(market_hint)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return f"SELECT ticker, adj_close, volume FROM krx_stockprice{where} ORDER BY volume DESC LIMIT 10"
+
+    def _sql_generation(self, prompt: str) -> str:
+        question = _last(_QUESTION, prompt)
+        sql = self.answers.get(question) or self._default_sql(question, prompt)
+        return f"```sql\n{sql}\n```"
+
+    def _sql_refinement(self, prompt: str) -> str:
+        question = _last(_ORIGINAL_QUESTION, prompt)
+        sql = self.answers.get(question) or _last(_ORIGINAL_QUERY, prompt)
+        return f"```sql\n{sql}\n```"
+
+    def _news_summary(self, prompt: str) -> str:
+        title = _last(_TITLE, prompt)
+        body = _BODY.search(prompt)
+        text = " ".join(body.group(1).split()) if body else ""
+        return f"{title}\n{text[:150]}"
+
+    def _daily_digest(self, prompt: str) -> str:
+        articles = _DIGEST_ARTICLE.findall(prompt)
+        company = _last(_DIGEST_COMPANY, prompt)
+        return _json_block({
+            "articles": [{"index": int(i), "summary": f"{title.strip()} 관련 기사"} for i, title in articles],
+            "key_facts": [f"{company}: {title.strip()}" for _, title in articles[:3]],
+        })
+
+
+def install_mock_llm(latency: float = 0.8, jitter: float = 0.3,
+                     answers: Optional[Dict[str, str]] = None, seed: int = 0) -> MockChatModel:
+    """프로세스의 모든 LLM 인스턴스가 MockChatModel 하나를 공유하도록 설정"""
+    from finance_agent.llm import set_client_factory
+
+    model = MockChatModel(latency=latency, jitter=jitter, answers=answers, seed=seed)
+    set_client_factory(lambda model_name, temperature: model)
+    return model
@@ -0,0 +1,247 @@
+"""
+Offline component micro-benchmarks
+CPU 위주 구간(지표 계산, 다운로드 변환, 결과 포맷, JSON/질의 파싱, 키워드 추출, 기사/목록 HTML 파싱)을
+합성 입력/저장된 HTML로 측정하고 benchmarks/baselines.json과 비교합니다. (네트워크/DB/LLM 불필요)
+
+사용법:
+    python benchmarks/run_benchmarks.py                     # 전체 실행 후 기준값과 비교
+    python benchmarks/run_benchmarks.py --filter indicators # 이름에 포함된 벤치마크만
+    python benchmarks/run_benchmarks.py --save-baseline     # 현재 결과를 기준값으로 저장
+"""
+
+import sys
+import os
+import gc
+import json
+import time
+import platform
+import argparse
+import statistics
+import contextlib
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import synthetic
+
+BASELINE_PATH = os.path.join("benchmarks", "baselines.json")
+
+# 이름 → 입력을 준비하고 측정할 함수를 돌려주는 setup 함수
+BENCHMARKS: List[Tuple[str, Callable[[], Callable[[], object]]]] = []
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+# ----------------- 지표 계산 -----------------
+def _indicators(n_tickers: int, n_days: int):
+    from finance_agent.updater import compute_technical_indicators
+
+    panel = synthetic.make_price_panel(n_tickers, n_days)
+    return lambda: compute_technical_indicators(panel)
+
+
+for _tickers, _days in [(100, 250), (1000, 250), (2700, 70)]:
+    benchmark(f"indicators[{_tickers}x{_days}]")(lambda t=_tickers, d=_days: _indicators(t, d))
+
+
+# ----------------- 다운로드 변환 -----------------
+def _reshape(n_tickers: int, n_years: int):
+    from finance_agent.updater import reshape_download
+
+    raw = synthetic.make_download_frame(n_tickers, n_years)
+    return lambda: reshape_download(raw)
+
+
+for _tickers, _years in [(500, 1), (2700, 1)]:
+    benchmark(f"reshape_download[{_tickers}x{_years}y]")(lambda t=_tickers, y=_years: _reshape(t, y))
+
+
+# ----------------- 결과 포맷 -----------------
+def _format_output(n_rows: int):
+    from finance_agent.nodes.output_formatter_node import OutputFormatterNode
+
+    node = OutputFormatterNode()
+    rows = synthetic.make_query_results(n_rows)
+    return lambda: node._format_output("거래량 많은 종목", rows)
+
+
+for _rows in [100, 1000, 10000]:
+    benchmark(f"format_output[{_rows}]")(lambda n=_rows: _format_output(n))
+
+
+# ----------------- JSON / 질의 파싱 -----------------
+@benchmark("extract_json_from_response[300]")
+def _extract_json():
+    from finance_agent.parsers import extract_json_from_response
+
+    responses = synthetic.make_llm_responses(300)
+    return lambda: [extract_json_from_response(r) for r in responses]
+
+
+@benchmark("query_parser._parse_json[300]")
+def _query_parser_json():
+    from finance_agent.nodes.query_parser_node import QueryParserNode
+
+    # LLM 클라이언트 없이 파싱 메서드만 사용
+    node = object.__new__(QueryParserNode)
+    responses = synthetic.make_llm_responses(300)
+    return lambda: [node._parse_json(r) for r in responses]
+
+
+@benchmark("input_node._parse_json[300]")
+def _input_node_json():
+    from finance_agent.nodes.input_node import InputNode
+
+    node = InputNode()
+    responses = synthetic.make_llm_responses(300)
+    return lambda: [node._parse_json(r) for r in responses]
+
+
+@benchmark("query_parser.rules[300]")
+def _query_rules():
+    from finance_agent.nodes.query_parser_node import QueryParserNode
+    from finance_agent.utils import extract_date, extract_keywords
+
+    node = object.__new__(QueryParserNode)
+    queries = synthetic.make_user_queries(300)
+
+    def run():
+        for q in queries:
+            node.classify_intent(q)
+            extract_date(q)
+            extract_keywords(q)
+    return run
+
+
+# ----------------- 뉴스 -----------------
+def _top_keywords(n_titles: int):
+    from finance_agent.news_db_manager import extract_top_keywords
+
+    titles = synthetic.make_news_titles(n_titles)
+    return lambda: extract_top_keywords(titles)
+
+
+for _titles in [100, 5000]:
+    benchmark(f"extract_top_keywords[{_titles}]")(lambda n=_titles: _top_keywords(n))
+
+
+def _parse_article(name: str):
+    from finance_agent.html_parsing import parse_article_html
+
+    html = synthetic.load_html_fixtures()[name]
+    return lambda: parse_article_html(html)
+
+
+for _page in ["naver_article.html", "generic_article.html", "paragraph_article.html"]:
+    benchmark(f"parse_article_html[{_page.rsplit('.', 1)[0]}]")(lambda p=_page: _parse_article(p))
+
+
+def _parse_news_list():
+    from finance_agent.html_parsing import parse_news_list_html
+
+    html = synthetic.load_html_fixtures()["naver_news_list.html"]
+    return lambda: parse_news_list_html(html)
+
+
+benchmark("parse_news_list_html[naver_news_list]")(_parse_news_list)
+
+
+# ----------------- 실행 -----------------
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """워밍업 1회 후 repeat회 측정 (GC는 측정 중 비활성화, 디버그 print 출력은 버림)"""
+    timings = []
+    gc_enabled = gc.isenabled()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        func()
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            if gc_enabled:
+                gc.enable()
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def load_baselines() -> Dict:
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="오프라인 컴포넌트 마이크로 벤치마크")
+    parser.add_argument("--filter", default="", help="이름에 이 문자열이 포함된 벤치마크만 실행")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.3, help="기준값 대비 허용 느려짐 비율 (0.3 = 30%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="현재 결과를 baselines.json에 저장")
+    parser.add_argument("--json", help="결과를 JSON 파일로도 저장")
+    args = parser.parse_args()
+
+    baselines = load_baselines().get("results", {})
+    results, regressions = {}, []
+
+    print(f"{'benchmark':<42}{'median':>12}{'min':>12}{'baseline':>12}{'ratio':>8}")
+    for name, setup in BENCHMARKS:
+        if args.filter and args.filter not in name:
+            continue
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            func = setup()
+        stats = measure(func, args.repeat)
+        results[name] = stats
+
+        base = baselines.get(name, {}).get("median_ms")
+        ratio = stats["median_ms"] / base if base else None
+        flag = ""
+        if ratio is not None and ratio > 1 + args.tolerance:
+            regressions.append(name)
+            flag = "  ✗ 느려짐"
+        print(
+            f"{name:<42}{stats['median_ms']:>10.2f}ms{stats['min_ms']:>10.2f}ms"
+            f"{(f'{base:.2f}ms' if base else '-'):>12}{(f'{ratio:.2f}' if ratio else '-'):>8}{flag}"
+        )
+
+    report = {
+        "machine": {
+            "python": platform.python_version(),
+            "platform": f"{platform.system()}-{platform.machine()}",
+            "cpu_count": os.cpu_count(),
+        },
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        if args.filter:
+            # 일부만 실행한 경우 나머지 기준값은 유지
+            merged = dict(baselines)
+            merged.update(results)
+            report["results"] = merged
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"기준값 저장: {BASELINE_PATH}")
+        return 0
+
+    if regressions:
+        print(f"\n기준값 대비 {args.tolerance:.0%} 이상 느려진 벤치마크: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+Golden-question harness
+골든 질문(benchmarks/fixtures/golden_questions.jsonl)을 FinanceAgent.process_query로 실행하고
+의도별 지연 시간(p50/p95/p99), LLM 호출 수, SQL 시도 수, 정답 여부를 집계합니다.
+
+DB는 로컬 대체 DB(benchmarks/standin.py: 합성 krx_stockprice Parquet + 스냅샷, SQLite News,
+저장된 기사 HTML을 제공하는 로컬 HTTP 서버)를 사용하고, LLM은 mock(benchmarks/mock_llm.py, 기본값)을 쓰거나
+ClovaX 호출을 cassette로 기록/재생합니다. 기준값(golden_baseline.json)은 같은 --llm 모드로 저장된 경우에만 비교합니다.
+
+사용법:
+    python benchmarks/run_golden.py                       # mock LLM (오프라인, 호출당 --mock-latency초 대기)
+    python benchmarks/run_golden.py --llm record          # ClovaX로 실행하며 cassette 기록
+    python benchmarks/run_golden.py --llm replay          # cassette 재생 (기록된 LLM 지연 그대로)
+    python benchmarks/run_golden.py --filter screen       # id/category에 포함된 질문만
+    python benchmarks/run_golden.py --save-baseline       # 현재 결과를 기준값으로 저장
+"""
+
+import sys
+import os
+import json
+import time
+import platform
+import argparse
+import tempfile
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_llm import install_mock_llm, load_sql_answers
+from benchmarks.standin import build_standin, standin_env, start_article_server
+
+QUESTIONS_PATH = os.path.join("benchmarks", "fixtures", "golden_questions.jsonl")
+CASSETTE_PATH = os.path.join("benchmarks", "fixtures", "golden_cassette.jsonl")
+BASELINE_PATH = os.path.join("benchmarks", "golden_baseline.json")
+FAILURE_MARKERS = ("❌", "❗", "오류가 발생", "처리 중 오류")
+
+
+def load_questions(path: str, base_url: str, name_filter: str) -> List[Dict]:
+    questions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if name_filter and name_filter not in item["id"] and name_filter not in item["category"]:
+                continue
+            item["question"] = item["question"].format(base_url=base_url)
+            questions.append(item)
+    return questions
+
+
+# ----------------- 정답 확인 -----------------
+def _same_value(actual, expected) -> bool:
+    if isinstance(actual, bool) or isinstance(expected, bool):
+        return actual == expected
+    try:
+        a, e = float(actual), float(expected)
+    except (TypeError, ValueError):
+        return str(actual) == str(expected)
+    return abs(a - e) <= max(1e-6, abs(e) * 1e-3)
+
+
+def check_answer(check: Dict, result: Dict, engine) -> Tuple[bool, str]:
+    """질문별 정답 규칙 (value: 기대값이 결과 행에 포함 / rows: 칼럼 값 집합 일치 / output: 응답 문구)"""
+    rows = (result.get("state") or {}).get("query_results") or []
+    output = result.get("response") or result.get("clarification_question") or ""
+
+    if check["type"] == "value":
+        expected = engine.execute(check["sql"])
+        if not expected:
+            return False, "기대값을 계산할 수 없음"
+        value = next(iter(expected[0].values()))
+        found = any(_same_value(v, value) for row in rows for v in row.values())
+        return found, "" if found else f"기대값 {value} 없음"
+
+    if check["type"] == "rows":
+        column = check["column"]
+        expected = {row[column] for row in engine.execute(check["sql"])}
+        actual = {row.get(column) for row in rows}
+        if expected == actual:
+            return True, ""
+        return False, f"누락 {sorted(expected - actual)[:5]}, 초과 {sorted(map(str, actual - expected))[:5]}"
+
+    missing = [s for s in check.get("contains", []) if s not in output]
+    failed = [m for m in FAILURE_MARKERS if m in output]
+    if not output or missing or failed:
+        return False, f"누락 {missing} / 실패 문구 {failed}" if output else "응답 없음"
+    return True, ""
+
+
+# ----------------- 실행 / 집계 -----------------
+def run_question(agent, tracer, item: Dict, engine) -> Dict:
+    started = time.perf_counter()
+    result = agent.process_query(item["question"])
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    spans = tracer.recent_spans(result.get("trace_id")) if result.get("trace_id") else []
+    correct, detail = check_answer(item["check"], result, engine)
+    return {
+        "id": item["id"],
+        "category": item["category"],
+        "latency_ms": round(elapsed_ms, 1),
+        "llm_calls": sum(1 for s in spans if s["kind"] == "llm"),
+        "sql_attempts": result.get("sql_attempts", 0),
+        "refinements": sum(1 for s in spans if s["name"] == "node.sql_refiner"),
+        "correct": correct,
+        "detail": detail,
+    }
+
+
+def summarize(records: List[Dict]) -> Dict[str, Dict]:
+    from finance_agent.tracing import percentiles
+
+    by_category = defaultdict(list)
+    for record in records:
+        by_category[record["category"]].append(record)
+
+    summary = {}
+    for category, items in by_category.items():
+        n = len(items)
+        latency = percentiles([r["latency_ms"] for r in items])
+        summary[category] = {
+            "count": n,
+            "p50_ms": latency["p50"],
+            "p95_ms": latency["p95"],
+            "p99_ms": latency["p99"],
+            "llm_calls": round(sum(r["llm_calls"] for r in items) / n, 2),
+            "sql_attempts": round(sum(r["sql_attempts"] for r in items) / n, 2),
+            "refinements": round(sum(r["refinements"] for r in items) / n, 2),
+            "accuracy": round(sum(r["correct"] for r in items) / n, 3),
+        }
+    return summary
+
+
+def compare(summary: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """기준값 대비 느려짐 / 정답률 하락 / LLM 호출 증가 의도 목록"""
+    regressions = []
+    for category, stats in summary.items():
+        base = baseline.get(category)
+        if not base:
+            continue
+        if base["p50_ms"] and stats["p50_ms"] > base["p50_ms"] * (1 + tolerance):
+            regressions.append(f"{category}: p50 {base['p50_ms']:.0f}ms → {stats['p50_ms']:.0f}ms")
+        if stats["accuracy"] < base["accuracy"]:
+            regressions.append(f"{category}: 정답률 {base['accuracy']:.0%} → {stats['accuracy']:.0%}")
+        if stats["llm_calls"] > base["llm_calls"] + 0.5:
+            regressions.append(f"{category}: LLM 호출 {base['llm_calls']} → {stats['llm_calls']}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="골든 질문 end-to-end 지연 시간/정답률 하네스")
+    parser.add_argument("--llm", choices=["mock", "replay", "record", "live"], default="mock",
+                        help="mock: 오프라인 mock LLM, replay: cassette 재생, record: ClovaX 호출 후 기록, live: 기록 없이 ClovaX 호출")
+    parser.add_argument("--cassette", default=CASSETTE_PATH)
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="재생 시 기록된 LLM 지연 배율")
+    parser.add_argument("--mock-latency", type=float, default=0.8, help="mock LLM 호출당 지연 (초)")
+    parser.add_argument("--mock-jitter", type=float, default=0.3, help="mock LLM 지연 변동 비율 (0.3이면 ±30%%)")
+    parser.add_argument("--root", default=os.path.join(tempfile.gettempdir(), "finance_agent_standin"), help="대체 DB 생성 경로")
+    parser.add_argument("--tickers", type=int, default=200, help="대체 krx_stockprice 종목 수")
+    parser.add_argument("--http-port", type=int, default=18765, help="기사 HTML 로컬 서버 포트 (cassette 기록 시와 같아야 함)")
+    parser.add_argument("--filter", default="", help="id/category에 이 문자열이 포함된 질문만 실행")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--tolerance", type=float, default=0.3, help="기준값 대비 허용 p50 느려짐 비율")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--json", help="질문별 결과/요약을 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    # Config는 import 시점에 환경 변수를 읽으므로 FinanceAgent import 전에 설정
+    os.environ.update(standin_env(args.root))
+    os.environ["REPLAY_MODE"] = "off" if args.llm in ("live", "mock") else args.llm
+    os.environ["REPLAY_KINDS"] = "llm"
+    os.environ["REPLAY_CASSETTE"] = args.cassette
+    os.environ["REPLAY_LATENCY_SCALE"] = str(args.latency_scale)
+    if args.llm == "record" and os.path.exists(args.cassette):
+        os.remove(args.cassette)
+
+    start_article_server(args.http_port)
+    base_url = f"http://127.0.0.1:{args.http_port}"
+    build_standin(args.root, base_url, n_tickers=args.tickers)
+    questions = load_questions(QUESTIONS_PATH, base_url, args.filter)
+    if args.llm == "mock":
+        install_mock_llm(args.mock_latency, args.mock_jitter, answers=load_sql_answers(QUESTIONS_PATH))
+
+    from finance_agent.agent import FinanceAgent
+    from finance_agent.local_engine import LocalQueryEngine
+    from finance_agent.tracing import get_tracer
+
+    agent = FinanceAgent()
+    engine = LocalQueryEngine()
+    tracer = get_tracer()
+
+    records = []
+    with open(os.devnull, "w") as devnull:
+        for _ in range(args.repeat):
+            for item in questions:
+                stdout, sys.stdout = sys.stdout, devnull  # 노드 디버그 출력 숨김
+                try:
+                    record = run_question(agent, tracer, item, engine)
+                finally:
+                    sys.stdout = stdout
+                records.append(record)
+                mark = "✓" if record["correct"] else "✗"
+                print(f"{mark} {record['id']:<28}{record['latency_ms']:>10.1f}ms  llm={record['llm_calls']} "
+                      f"sql={record['sql_attempts']} {record['detail']}")
+
+    summary = summarize(records)
+    print(f"\n{'intent':<14}{'n':>4}{'p50':>10}{'p95':>10}{'p99':>10}{'llm':>7}{'sql':>7}{'refine':>8}{'정답률':>8}")
+    for category, s in sorted(summary.items()):
+        print(f"{category:<14}{s['count']:>4}{s['p50_ms']:>8.0f}ms{s['p95_ms']:>8.0f}ms{s['p99_ms']:>8.0f}ms"
+              f"{s['llm_calls']:>7.2f}{s['sql_attempts']:>7.2f}{s['refinements']:>8.2f}{s['accuracy']:>8.0%}")
+
+    report = {
+        "machine": {"python": platform.python_version(), "platform": f"{platform.system()}-{platform.machine()}"},
+        "llm": args.llm,
+        "latency_scale": args.latency_scale,
+        **({"mock_latency": args.mock_latency, "mock_jitter": args.mock_jitter} if args.llm == "mock" else {}),
+        "summary": summary,
+        "questions": records,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"기준값 저장: {BASELINE_PATH}")
+        return 0
+
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("llm") != args.llm:
+            print(f"\n기준값은 --llm {baseline.get('llm')}로 저장되어 비교하지 않습니다.")
+            return 0
+        regressions = compare(summary, baseline["summary"], args.tolerance)
+        if regressions:
+            print("\n기준값 대비 회귀:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
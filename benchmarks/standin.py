@@ -0,0 +1,117 @@
+"""
+Local stand-in databases
+골든 질문 하네스용 로컬 대체 DB를 만듭니다. (RDS 대신 사용)
+- krx_stockprice: 실제 종목 코드의 합성 주가 + 기술적 지표 → Parquet 사본 (DuckDB 로컬 엔진으로 조회)
+- krx_daily_snapshot / krx_daily_events: 위 주가로 계산한 스냅샷 → LOCAL_TABLES_DIR
+- News: SQLite (NEWS_DB_URL), 기사 링크는 저장된 HTML을 제공하는 로컬 HTTP 서버를 가리킴
+"""
+
+import os
+import random
+import shutil
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import pandas as pd
+
+from benchmarks.synthetic import FIXTURE_DIR, make_download_frame
+
+# 골든 질문에서 이름으로 묻는 종목 (항상 포함)
+NAMED_TICKERS = ["005930.KS", "000660.KS", "035720.KS", "016790.KQ"]
+NEWS_COMPANIES = ["삼성전자", "SK하이닉스", "카카오", "현대사료"]
+NEWS_TOPICS = ["2분기 실적 발표", "외국인 순매수 확대", "목표주가 상향", "신규 투자 발표", "HBM 수출 증가", "주가 급등 마감"]
+NEWS_PAGES = ["naver_article.html", "generic_article.html", "paragraph_article.html"]
+
+
+def pick_tickers(n_tickers: int, seed: int = 0) -> List[str]:
+    tickers = pd.read_csv("./data/krx_tickers.csv")["ticker"].astype(str).tolist()
+    others = [t for t in tickers if t not in NAMED_TICKERS]
+    random.Random(seed).shuffle(others)
+    return NAMED_TICKERS + others[:max(0, n_tickers - len(NAMED_TICKERS))]
+
+
+def standin_env(root: str) -> Dict[str, str]:
+    """FinanceAgent가 대체 DB를 사용하도록 하는 환경 변수 (Config가 import 시점에 읽으므로 먼저 설정)"""
+    root = os.path.abspath(root)
+    return {
+        "SQL_EXECUTION_BACKEND": "local",
+        "PARQUET_DIR": os.path.join(root, "parquet", "krx_stockprice"),
+        "LOCAL_TABLES_DIR": os.path.join(root, "tables"),
+        "LOCAL_ENGINE_MYSQL_FALLBACK": "false",
+        "NEWS_DB_URL": f"sqlite:///{os.path.join(root, 'news.db')}",
+    }
+
+
+def build_stock_tables(root: str, n_tickers: int = 200, n_years: int = 2, seed: int = 0):
+    """합성 주가로 krx_stockprice Parquet 사본과 스냅샷/이벤트 Parquet 파일 생성"""
+    from finance_agent.parquet_store import ParquetStore
+    from finance_agent.updater import build_daily_snapshots, compute_technical_indicators, reshape_download
+    from finance_agent.schema import SNAPSHOT_TABLE, EVENTS_TABLE
+
+    env = standin_env(root)
+    parquet_dir, tables_dir = env["PARQUET_DIR"], env["LOCAL_TABLES_DIR"]
+    if os.path.isdir(parquet_dir):
+        shutil.rmtree(parquet_dir)
+    os.makedirs(tables_dir, exist_ok=True)
+
+    raw = make_download_frame(n_tickers, n_years, seed, tickers=pick_tickers(n_tickers, seed))
+    df = compute_technical_indicators(reshape_download(raw))
+    ParquetStore(parquet_dir).write(df)
+
+    snapshot_df, events_df = build_daily_snapshots(df)
+    snapshot_df.to_parquet(os.path.join(tables_dir, f"{SNAPSHOT_TABLE}.parquet"), index=False)
+    events_df.to_parquet(os.path.join(tables_dir, f"{EVENTS_TABLE}.parquet"), index=False)
+    print(f"[StandIn] krx_stockprice {len(df):,}행, snapshot {len(snapshot_df):,}행, events {len(events_df):,}행")
+
+
+def build_news_db(root: str, base_url: str, dates: List[str], seed: int = 0):
+    """News 테이블(SQLite) 생성. date는 운영 테이블과 같이 YYYYMMDD 문자열"""
+    rng = random.Random(seed)
+    path = os.path.join(root, "news.db")
+    if os.path.exists(path):
+        os.remove(path)
+
+    rows = []
+    for date in dates:
+        for company in NEWS_COMPANIES:
+            for topic in rng.sample(NEWS_TOPICS, 2):
+                page = NEWS_PAGES[len(rows) % len(NEWS_PAGES)]
+                rows.append((f"{company} {topic}…증권가 전망은", f"{base_url}/{page}?id={len(rows) + 1}", date))
+
+    con = sqlite3.connect(path)
+    try:
+        con.execute("CREATE TABLE News (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT, link TEXT, date TEXT)")
+        con.executemany("INSERT INTO News (title, link, date) VALUES (?, ?, ?)", rows)
+        con.commit()
+    finally:
+        con.close()
+    print(f"[StandIn] News {len(rows)}건 ({dates[0]} ~ {dates[-1]})")
+
+
+def start_article_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """저장된 기사 HTML(benchmarks/fixtures/html)을 제공하는 로컬 HTTP 서버"""
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    handler = partial(QuietHandler, directory=os.path.join(FIXTURE_DIR, "html"))
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_standin(root: str, base_url: str, n_tickers: int = 200, seed: int = 0):
+    """standin_env(root) 경로에 대체 DB 생성"""
+    os.makedirs(root, exist_ok=True)
+    build_stock_tables(root, n_tickers=n_tickers, seed=seed)
+
+    # 골든 질문 날짜(2025-07) + 오늘 뉴스 질문용 최근 3일
+    news_dates = [d.strftime("%Y%m%d") for d in pd.bdate_range("2025-07-01", "2025-07-31")]
+    today = datetime.now()
+    news_dates += [(today - timedelta(days=i)).strftime("%Y%m%d") for i in (2, 1, 0)]
+    build_news_db(root, base_url, news_dates, seed=seed)
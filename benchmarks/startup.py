@@ -0,0 +1,90 @@
+"""
+CLI 시작 시간 측정
+scripts/run_agent.py를 새 프로세스로 실행해 첫 입력 프롬프트("🧑: ")가 나올 때까지 걸린 시간과
+`import finance_agent` / 에이전트 모듈 import 시간을 측정합니다. (LLM/DB 호출 없음, 프롬프트가 나오면 바로 종료)
+
+사용법:
+    python benchmarks/startup.py              # 5회 측정 후 중앙값 출력
+    python benchmarks/startup.py --runs 10 --budget 1.5
+    python -X importtime scripts/run_agent.py < /dev/null 2> importtime.log   # 모듈별 import 시간
+"""
+
+import sys
+import os
+import time
+import argparse
+import statistics
+import subprocess
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PROMPT = "🧑: ".encode("utf-8")
+
+
+def time_to_first_prompt(timeout: float) -> float:
+    """run_agent.py 시작부터 첫 프롬프트 출력까지 (초)"""
+    env = dict(os.environ, PYTHONUNBUFFERED="1", PYTHONIOENCODING="utf-8")
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join("scripts", "run_agent.py")],
+        cwd=ROOT, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    output = b""
+    try:
+        while PROMPT not in output:
+            chunk = proc.stdout.read1(4096)
+            if not chunk:
+                raise RuntimeError(f"프롬프트 전에 종료되었습니다 (exit {proc.wait()}):\n{output.decode(errors='replace')}")
+            output += chunk
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError(f"{timeout:g}초 안에 프롬프트가 나오지 않았습니다.")
+        return time.perf_counter() - start
+    finally:
+        # stdin EOF → run_agent가 대화를 중단하고 종료
+        proc.stdin.close()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def time_import(statement: str) -> float:
+    """새 인터프리터에서 statement 실행 시간 (인터프리터 기동 시간 제외)"""
+    code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def _summary(samples: List[float]) -> str:
+    return f"중앙값 {statistics.median(samples) * 1000:.0f}ms (최소 {min(samples) * 1000:.0f}ms, 최대 {max(samples) * 1000:.0f}ms)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI 시작 시간(첫 프롬프트까지) 측정")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0, help="1회 실행 최대 대기 시간 (초)")
+    parser.add_argument("--budget", type=float, default=0.0, help="첫 프롬프트까지 허용 시간 (초, 0이면 비교 안 함)")
+    args = parser.parse_args()
+
+    imports = {
+        "import finance_agent": "import finance_agent",
+        "import agent + news_bot": "import finance_agent.agent, finance_agent.news_bot",
+    }
+    for label, statement in imports.items():
+        samples = [time_import(statement) for _ in range(args.runs)]
+        print(f"{label:<26} {_summary(samples)}")
+
+    samples = [time_to_first_prompt(args.timeout) for _ in range(args.runs)]
+    median = statistics.median(samples)
+    print(f"{'첫 프롬프트까지':<26} {_summary(samples)}")
+
+    if args.budget and median > args.budget:
+        print(f"✗ 시작 시간 예산 초과 ({median:.2f}s > {args.budget:g}s)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
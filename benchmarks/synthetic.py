@@ -0,0 +1,130 @@
+"""
+Synthetic benchmark inputs
+실제 데이터와 같은 형태의 합성 입력 (yf.download wide 프레임, long 주가 패널, 쿼리 결과, LLM 응답, 뉴스 제목)
+"""
+
+import os
+import random
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def make_tickers(n_tickers: int) -> List[str]:
+    return [f"{i:06d}.{'KS' if i % 2 else 'KQ'}" for i in range(n_tickers)]
+
+
+def make_download_frame(n_tickers: int, n_years: int, seed: int = 0, tickers: Optional[List[str]] = None) -> pd.DataFrame:
+    """yf.download(ticker_list, ...)와 같은 (Price, Ticker) MultiIndex 컬럼의 wide 프레임 생성"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2025-07-31", periods=n_years * 250, name="Date")
+    tickers = tickers or make_tickers(n_tickers)
+    n_tickers = len(tickers)
+
+    base = rng.uniform(1_000, 500_000, size=n_tickers)
+    returns = rng.normal(0, 0.02, size=(len(dates), n_tickers))
+    close = np.round(base * np.exp(np.cumsum(returns, axis=0)))
+    # 상장 전 구간 (NaN) 흉내
+    listing = rng.integers(0, len(dates) // 4, size=n_tickers)
+    close[np.arange(len(dates))[:, None] < listing[None, :]] = np.nan
+
+    frames = {
+        "Adj Close": close,
+        "Close": close,
+        "High": close * 1.01,
+        "Low": close * 0.99,
+        "Open": close,
+        "Volume": np.where(np.isnan(close), np.nan, rng.integers(1_000, 50_000_000, size=close.shape)),
+    }
+    columns = pd.MultiIndex.from_product([list(frames), tickers], names=["Price", "Ticker"])
+    values = np.concatenate([frames[k] for k in frames], axis=1)
+    return pd.DataFrame(values, index=dates, columns=columns)
+
+
+def make_price_panel(n_tickers: int, n_days: int, seed: int = 0) -> pd.DataFrame:
+    """reshape_download 결과와 같은 long 포맷 주가 패널 (지표 계산 입력)"""
+    from finance_agent.updater import reshape_download
+
+    n_years = -(-n_days // 250)
+    raw = make_download_frame(n_tickers, n_years, seed).iloc[-n_days:]
+    return reshape_download(raw)
+
+
+def make_query_results(n_rows: int, seed: int = 0) -> List[Dict]:
+    """format_rows 이후 형태의 krx_stockprice 조회 결과"""
+    rng = random.Random(seed)
+    tickers_csv = pd.read_csv("./data/krx_tickers.csv")["ticker"].tolist()
+    rows = []
+    for i in range(n_rows):
+        price = float(rng.randint(1_000, 900_000))
+        rows.append({
+            "date": "2025-07-08",
+            "ticker": tickers_csv[i % len(tickers_csv)],
+            "adj_close": price,
+            "open": price * 0.99,
+            "volume": float(rng.randint(1_000, 50_000_000)),
+            "price_change_pct": rng.uniform(-30, 30),
+            "volume_ratio_20": rng.uniform(0, 10),
+            "rsi_14": rng.uniform(0, 100),
+            "volume_rank": float(i + 1),
+            "golden_cross": rng.random() < 0.05,
+        })
+    return rows
+
+
+def make_llm_responses(n: int, seed: int = 0) -> List[str]:
+    """명확화/쿼리 파서 단계의 LLM 응답 모양 (```json 블록, 홑따옴표/트레일링 콤마 섞임)"""
+    rng = random.Random(seed)
+    companies = ["삼성전자", "SK하이닉스", "현대사료", "카카오", ""]
+    markets = ["KOSPI", "KOSDAQ", ""]
+    responses = []
+    for i in range(n):
+        date = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        if i % 3 == 0:
+            body = f"{{\n    \"date\": \"{date}\",\n    \"company_name\": \"{rng.choice(companies)}\",\n    \"market\": \"{rng.choice(markets)}\"\n}}"
+        elif i % 3 == 1:
+            body = f"{{\n    'date': '{date}',\n    \"company_name\": '{rng.choice(companies)}',\n    \"market\": \"{rng.choice(markets)}\",\n}}"
+        else:
+            body = "{\n    \"clarification_needed\": false,\n    \"clarification_question\": \"\"\n}"
+        responses.append(f"질문을 분석한 결과는 다음과 같습니다.\n```json\n{body}\n```\n추가 설명이 필요하면 말씀해주세요.")
+    return responses
+
+
+def make_user_queries(n: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    templates = [
+        "{d} KOSPI에서 거래량 많은 종목 10개는?",
+        "삼성전자의 {d} 종가는?",
+        "오늘 핫한 뉴스 알려줘",
+        "{m}월 {day}일 SK하이닉스 뉴스를 요약해줘",
+        "https://n.news.naver.com/article/001/0014800000 요약해줘",
+        "{d}에 RSI가 70 이상인 과매수 종목을 알려줘",
+        "현대사료에서 2024-06-01부터 2025-06-30까지 골든크로스가 몇번 발생했어?",
+    ]
+    queries = []
+    for _ in range(n):
+        m, day = rng.randint(1, 12), rng.randint(1, 28)
+        queries.append(rng.choice(templates).format(d=f"2025-{m:02d}-{day:02d}", m=m, day=day))
+    return queries
+
+
+def make_news_titles(n: int, seed: int = 0) -> pd.Series:
+    rng = random.Random(seed)
+    words = ["삼성전자", "SK하이닉스", "반도체", "HBM", "코스피", "외국인", "순매수", "금리", "동결", "환율",
+             "2차전지", "실적", "영업이익", "급등", "하락", "전망", "목표주가", "상향", "수출", "AI"]
+    titles = [" ".join(rng.choice(words) for _ in range(rng.randint(5, 10))) + "…" + rng.choice(["속보", "종합", ""]) for _ in range(n)]
+    return pd.Series(titles, name="title")
+
+
+def load_html_fixtures() -> Dict[str, str]:
+    """저장된 기사 HTML 페이지 (benchmarks/fixtures/html)"""
+    html_dir = os.path.join(FIXTURE_DIR, "html")
+    pages = {}
+    for name in sorted(os.listdir(html_dir)):
+        if name.endswith(".html"):
+            with open(os.path.join(html_dir, name), encoding="utf-8") as f:
+                pages[name] = f.read()
+    return pages
@@ -7,16 +7,158 @@ class Config:
     CLOVA_API_KEY = os.getenv("CLOVA_API_KEY", "your-api-key")
 
     MYSQL_HOST = os.getenv("MYSQL_HOST")
-    MYSQL_PORT = int(os.getenv("MYSQL_PORT"))
+    MYSQL_PORT = int(os.getenv("MYSQL_PORT", "3306"))
     MYSQL_USER = os.getenv("MYSQL_USER")
     MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD")
     MYSQL_DATABASE = os.getenv("MYSQL_DATABASE", "finance_db")
     MYSQL_DATABASE2 = os.getenv("MYSQL_DATABASE2", "news_DB")
+    # News DB SQLAlchemy URL 직접 지정 (예: sqlite:///news.db, 비어 있으면 MySQL news_DB)
+    NEWS_DB_URL = os.getenv("NEWS_DB_URL", "")
+    # 조회용 MySQL 커넥션 풀 (DatabaseManager / NewsDatabaseManager, 여러 스레드가 공유)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", "10"))
+    # 풀이 가득 찼을 때 커넥션 반납을 기다리는 최대 시간 (초)
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+    # MySQL wait_timeout보다 짧게 두어 서버가 끊은 커넥션을 재사용하지 않도록 함 (초)
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+    # Bulk write settings (krx_stockprice upsert)
+    DB_WRITE_CHUNK_SIZE = int(os.getenv("DB_WRITE_CHUNK_SIZE", "5000"))
+
+    # Local Parquet mirror of krx_stockprice
+    PARQUET_MIRROR_ENABLED = os.getenv("PARQUET_MIRROR_ENABLED", "true").lower() == "true"
+    PARQUET_DIR = os.getenv("PARQUET_DIR", "./data/parquet/krx_stockprice")
+    PARQUET_ROW_GROUP_SIZE = int(os.getenv("PARQUET_ROW_GROUP_SIZE", "16384"))
+    PARQUET_COMPACT_MIN_FILES = int(os.getenv("PARQUET_COMPACT_MIN_FILES", "8"))
+
+    # SQL execution backend for generated queries: "mysql" or "local" (DuckDB over the Parquet mirror)
+    SQL_EXECUTION_BACKEND = os.getenv("SQL_EXECUTION_BACKEND", "mysql")
+    LOCAL_ENGINE_THREADS = int(os.getenv("LOCAL_ENGINE_THREADS", "4"))
+    # krx_daily_snapshot.parquet / krx_daily_events.parquet가 있으면 로컬 엔진에서 함께 조회
+    # (설정하면 일일 업데이트/백필이 이 디렉터리에 두 파일을 작성)
+    LOCAL_TABLES_DIR = os.getenv("LOCAL_TABLES_DIR", "")
+    # true면 사본 날짜 범위 밖을 참조하거나 로컬 결과가 비어 있는 쿼리를 MySQL에서 다시 실행
+    # (MySQL 없이 로컬 사본만 쓰는 대체 환경에서는 false)
+    LOCAL_ENGINE_MYSQL_FALLBACK = os.getenv("LOCAL_ENGINE_MYSQL_FALLBACK", "true").lower() == "true"
+
+    # Generated SQL log (EXPLAIN corpus for scripts/manage_schema.py)
+    SQL_QUERY_LOG_ENABLED = os.getenv("SQL_QUERY_LOG_ENABLED", "true").lower() == "true"
+    SQL_QUERY_LOG_PATH = os.getenv("SQL_QUERY_LOG_PATH", "logs/generated_sql.jsonl")
+    # krx_stockprice에 market stored 칼럼이 생성된 뒤 true로 설정 (ticker LIKE '%.KS' → market = 'KOSPI')
+    USE_MARKET_COLUMN = os.getenv("USE_MARKET_COLUMN", "false").lower() == "true"
+
+    # Guardrail for LLM-generated SQL
+    SQL_MAX_ROWS = int(os.getenv("SQL_MAX_ROWS", "1000"))
+    SQL_MAX_EXECUTION_TIME_MS = int(os.getenv("SQL_MAX_EXECUTION_TIME_MS", "10000"))
+    SQL_MAX_EXAMINED_ROWS = int(os.getenv("SQL_MAX_EXAMINED_ROWS", "5000000"))
+
+    # Prompt assembly (finance_agent/prompt_builder.py)
+    SQL_EXAMPLES_PATH = os.getenv("SQL_EXAMPLES_PATH", "./data/sql_examples.jsonl")
+    PROMPT_EXAMPLE_COUNT = int(os.getenv("PROMPT_EXAMPLE_COUNT", "3"))
+    PROMPT_HISTORY_TOKEN_BUDGET = int(os.getenv("PROMPT_HISTORY_TOKEN_BUDGET", "600"))
+    PROMPT_HISTORY_MESSAGE_CHARS = int(os.getenv("PROMPT_HISTORY_MESSAGE_CHARS", "300"))
+    # LLM 호출별 prompt/completion 토큰 수 기록
+    LLM_USAGE_LOG_ENABLED = os.getenv("LLM_USAGE_LOG_ENABLED", "true").lower() == "true"
+    LLM_USAGE_LOG_PATH = os.getenv("LLM_USAGE_LOG_PATH", "logs/llm_usage.jsonl")
+
+    # Tracing (node / LLM / SQL / HTTP spans)
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACE_LOG_PATH = os.getenv("TRACE_LOG_PATH", "logs/traces.jsonl")
+    TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "10000"))
+    # 0이면 /metrics 서버를 띄우지 않음
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+    # Record / replay of LLM, HTTP and DB traffic (finance_agent/replay.py): "off", "record", "replay"
+    REPLAY_MODE = os.getenv("REPLAY_MODE", "off")
+    REPLAY_CASSETTE = os.getenv("REPLAY_CASSETTE", "data/cassettes/default.jsonl")
+    # 재생 시 기록된 소요 시간에 곱하는 값 (1.0 = 운영과 같은 지연, 0 = 대기 없음)
+    REPLAY_LATENCY_SCALE = float(os.getenv("REPLAY_LATENCY_SCALE", "1.0"))
+    # true면 요청이 정확히 일치하는 기록만 재생 (false면 같은 호출 지점의 기록을 순서대로 대체 사용)
+    REPLAY_STRICT = os.getenv("REPLAY_STRICT", "false").lower() == "true"
+    # 기록/재생할 호출 종류 (예: "llm,http"이면 DB 조회는 실제 DB 또는 로컬 대체 DB에서 실행)
+    REPLAY_KINDS = os.getenv("REPLAY_KINDS", "llm,http,sql")
+
+    # Session store (finance_agent/session_store.py)
+    # 대화 기록이 이 토큰 수를 넘으면 오래된 대화를 요약 1건으로 접고 최근 SESSION_HISTORY_KEEP_TOKENS만 유지
+    SESSION_HISTORY_TOKEN_CAP = int(os.getenv("SESSION_HISTORY_TOKEN_CAP", "1200"))
+    SESSION_HISTORY_KEEP_TOKENS = int(os.getenv("SESSION_HISTORY_KEEP_TOKENS", "600"))
+    SESSION_SUMMARY_TOKEN_CAP = int(os.getenv("SESSION_SUMMARY_TOKEN_CAP", "300"))
+    # "extractive": LLM 호출 없이 접히는 대화의 앞부분만 남김, "llm": LLM으로 요약 (접을 때만 1회 호출)
+    SESSION_SUMMARY_MODE = os.getenv("SESSION_SUMMARY_MODE", "extractive")
+    # 마지막 사용 후 이 시간이 지난 세션은 제거 (0이면 만료 없음)
+    SESSION_IDLE_TTL_SECONDS = int(os.getenv("SESSION_IDLE_TTL_SECONDS", "3600"))
+    # 세션 수 / 대화 기록 메모리 추정치가 상한을 넘으면 가장 오래 사용되지 않은 세션부터 제거
+    SESSION_STORE_MAX_SESSIONS = int(os.getenv("SESSION_STORE_MAX_SESSIONS", "10000"))
+    SESSION_STORE_MEMORY_MB = int(os.getenv("SESSION_STORE_MEMORY_MB", "256"))
+    # 웹 데모(web_demo.py)가 방문자별로 화면에 다시 그리는 메시지 수 상한 (오래된 메시지부터 제거)
+    WEB_DEMO_MAX_MESSAGES = int(os.getenv("WEB_DEMO_MAX_MESSAGES", "100"))
+
+    # LangGraph checkpoint store (finance_agent/checkpoint.py), 세션을 여러 프로세스/재시작 간에 이어가기
+    # "": 사용 안 함, "sqlite:///data/checkpoints.db": 로컬 파일, "mysql": MYSQL_DATABASE, 그 외 SQLAlchemy URL
+    CHECKPOINT_DB_URL = os.getenv("CHECKPOINT_DB_URL", "")
+    CHECKPOINT_KEEP_PER_SESSION = int(os.getenv("CHECKPOINT_KEEP_PER_SESSION", "2"))
+    # 마지막 대화 후 이 시간이 지난 세션의 체크포인트는 삭제 (0이면 보관)
+    CHECKPOINT_TTL_SECONDS = int(os.getenv("CHECKPOINT_TTL_SECONDS", str(7 * 24 * 3600)))
+
+    # NewsBot 정기 알림 스케줄러 (finance_agent/job_scheduler.py)
+    SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "4"))
+    SCHEDULER_JOB_TIMEOUT_SECONDS = float(os.getenv("SCHEDULER_JOB_TIMEOUT_SECONDS", "300"))
+    # 회사별 오늘 다이제스트 재사용 시간 (지나면 기사 목록을 다시 조회하고, 바뀐 경우에만 다시 요약)
+    NEWS_DIGEST_CACHE_SECONDS = float(os.getenv("NEWS_DIGEST_CACHE_SECONDS", "900"))
+    # 일일 다이제스트에 넣는 기사 수 / 기사당 본문 글자 수 / 보관 기간 (일)
+    NEWS_DIGEST_ARTICLES = int(os.getenv("NEWS_DIGEST_ARTICLES", "3"))
+    NEWS_DIGEST_ARTICLE_CHARS = int(os.getenv("NEWS_DIGEST_ARTICLE_CHARS", "1500"))
+    NEWS_DIGEST_RETENTION_DAYS = int(os.getenv("NEWS_DIGEST_RETENTION_DAYS", "30"))
+    # 뉴스 알림 구독 저장소 (finance_agent/subscription_store.py): "sqlite:///..." / "mysql" / SQLAlchemy URL
+    NEWS_SUBSCRIPTION_DB_URL = os.getenv("NEWS_SUBSCRIPTION_DB_URL", "sqlite:///data/news_subscriptions.db")
+    # 실행 시각이 된 구독 확인 주기 (초) / 한 번에 읽어 오는 구독 수
+    NEWS_DISPATCH_INTERVAL_SECONDS = float(os.getenv("NEWS_DISPATCH_INTERVAL_SECONDS", "30"))
+    NEWS_DISPATCH_BATCH_SIZE = int(os.getenv("NEWS_DISPATCH_BATCH_SIZE", "500"))
+    # 서버 중단으로 놓친 알림은 예정 시각에서 이 시간 이내면 재시작 후 1번 보내고, 넘으면 건너뜀
+    NEWS_CATCHUP_HOURS = float(os.getenv("NEWS_CATCHUP_HOURS", "6"))
+
+    # HTTP API (finance_agent/api.py)
+    API_HOST = os.getenv("API_HOST", "0.0.0.0")
+    API_PORT = int(os.getenv("API_PORT", "8000"))
+    # 에이전트를 실행하는 작업 스레드 수 (LLM/DB 대기가 대부분이므로 CPU 수보다 크게 둠)
+    API_WORKER_THREADS = int(os.getenv("API_WORKER_THREADS", "8"))
+    # 동시에 처리(대기 포함)하는 요청 상한, 넘으면 API_QUEUE_TIMEOUT_SECONDS 동안 기다린 뒤 503
+    API_MAX_CONCURRENCY = int(os.getenv("API_MAX_CONCURRENCY", "16"))
+    API_QUEUE_TIMEOUT_SECONDS = float(os.getenv("API_QUEUE_TIMEOUT_SECONDS", "5"))
+    # 요청 하나의 응답 마감 시간, 넘으면 504
+    API_REQUEST_TIMEOUT_SECONDS = float(os.getenv("API_REQUEST_TIMEOUT_SECONDS", "60"))
+
+    # 뉴스 목록/기사 HTML 파싱 프로세스 풀 (finance_agent/html_parsing.py), 0이면 CPU 수
+    HTML_PARSE_WORKERS = int(os.getenv("HTML_PARSE_WORKERS", "0"))
+    # 파싱할 페이지가 이보다 적으면 프로세스 풀 없이 현재 프로세스에서 파싱 (전달 비용이 더 큼)
+    HTML_PARSE_MIN_POOL_PAGES = int(os.getenv("HTML_PARSE_MIN_POOL_PAGES", "8"))
+
+    # 시작 시 워밍업 (finance_agent/warmup.py): 커넥션 풀, 최신 거래일, 종목 목록, 노드/그래프, LLM 연결을 백그라운드에서 준비
+    # API의 GET /readyz는 워밍업이 끝나고 필수 단계(WARMUP_REQUIRED_STEPS)가 모두 성공한 뒤에 200
+    WARMUP_ON_START = os.getenv("WARMUP_ON_START", "true").lower() == "true"
+    # 워밍업 때 미리 맺어 두는 MySQL 커넥션 수 (DB_POOL_SIZE 이하)
+    WARMUP_POOL_CONNECTIONS = int(os.getenv("WARMUP_POOL_CONNECTIONS", "2"))
+    # true면 워밍업 때 LLM에 짧은 요청을 1번 보내 ClovaX 연결(TLS)을 맺어 둠 (토큰 소량 사용)
+    WARMUP_LLM_PING = os.getenv("WARMUP_LLM_PING", "true").lower() == "true"
+    # 실패하면 /readyz가 503인 워밍업 단계 (쉼표 구분, 나머지 단계는 실패해도 degraded로 200)
+    # 단계: company_df, nodes, graph, sql_parser, db_pool, latest_date, llm
+    WARMUP_REQUIRED_STEPS = [
+        step.strip() for step in os.getenv("WARMUP_REQUIRED_STEPS", "company_df,nodes,graph,db_pool,latest_date").split(",")
+        if step.strip()
+    ]
+    # 필수 단계가 실패했을 때 다시 시도하는 간격 (초), 0이면 재시도하지 않음
+    WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "30"))
+    # 최신 거래일(SQL 프롬프트의 기본 날짜) 재사용 시간 (초), 질문마다 DISTINCT date 조회를 하지 않도록 함
+    LATEST_DATE_CACHE_SECONDS = float(os.getenv("LATEST_DATE_CACHE_SECONDS", "300"))
 
     
     # Yahoo Finance settings
     YFINANCE_MAX_RETRIES = 3
     YFINANCE_TIMEOUT = 10
+    # 이동평균(60일)/RSI 계산을 위해 업데이트 시작일 이전에 추가로 받는 기간 (달력 기준 일수)
+    INDICATOR_LOOKBACK_DAYS = int(os.getenv("INDICATOR_LOOKBACK_DAYS", "100"))
+    # fetch_all_stocks_data 결과 프레임 메모리 예산 (2,700종목 x 5년 ≈ 3.4M행 x 42B ≈ 140MB)
+    FETCH_MEMORY_BUDGET_MB = int(os.getenv("FETCH_MEMORY_BUDGET_MB", "256"))
     
     # LangGraph settings
     MAX_ITERATIONS = 10
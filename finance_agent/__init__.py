@@ -1,28 +1,39 @@
 """
 Finance Agent Package
 한국 주식 시장 데이터 분석 에이전트
+
+하위 모듈(langgraph, pandas, selenium 등)은 아래 이름에 처음 접근할 때 import합니다.
+(`from finance_agent.chat_router import ...`처럼 패키지의 다른 모듈만 쓸 때는 불러오지 않음)
 """
 
-from .agent import FinanceAgent, FinanceAgentInterface
-from .database import DatabaseManager
-from .updater import DailyStockUpdater
-from .nodes.input_node import InputNode
-from .nodes.query_parser_node import QueryParserNode
-from .nodes.sql_generator_node import SqlGeneratorNode
-from .nodes.sql_refiner_node import SqlRefinerNode
-from .nodes.output_formatter_node import OutputFormatterNode
+import importlib
 
 __version__ = "2.0.0"
 __author__ = "Finance Agent Team"
 
-__all__ = [
-    "FinanceAgent",
-    "FinanceAgentInterface", 
-    "DatabaseManager",
-    "DailyStockUpdater",
-    "InputNode",
-    "QueryParserNode",
-    "SqlGeneratorNode",
-    "SqlRefinerNode",
-    "OutputFormatterNode"
-]
\ No newline at end of file
+_EXPORTS = {
+    "FinanceAgent": ".agent",
+    "FinanceAgentInterface": ".agent",
+    "DatabaseManager": ".database",
+    "DailyStockUpdater": ".updater",
+    "InputNode": ".nodes.input_node",
+    "QueryParserNode": ".nodes.query_parser_node",
+    "SqlGeneratorNode": ".nodes.sql_generator_node",
+    "SqlRefinerNode": ".nodes.sql_refiner_node",
+    "OutputFormatterNode": ".nodes.output_formatter_node",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,17 +1,15 @@
 import uuid
 import copy
-from typing import Dict, List, TypedDict, Sequence
-from langgraph.graph import StateGraph, END
+import importlib
+import threading
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, TypedDict
 from langchain_core.messages import BaseMessage
 from datetime import datetime
 
-# Assuming all your nodes are imported correctly
-from finance_agent.nodes.input_node import InputNode
-from finance_agent.nodes.query_parser_node import QueryParserNode
-from finance_agent.nodes.sql_generator_node import SqlGeneratorNode
-from finance_agent.nodes.sql_refiner_node import SqlRefinerNode
-from finance_agent.nodes.output_formatter_node import OutputFormatterNode
-from finance_agent.nodes.news_handler import NewsHandler
+from finance_agent.tracing import get_tracer
+
+# 체크포인트 저장소를 아직 만들지 않았음을 나타내는 값 (None은 "사용 안 함")
+_UNSET = object()
 
 
 class GraphState(TypedDict):
@@ -32,22 +30,73 @@ class GraphState(TypedDict):
     # pending_action은 더 이상 사용하지 않음
 
 
+class _LazyNode:
+    """처음 접근할 때 노드 모듈을 import하고 인스턴스를 만드는 속성
+    (주가 질문만 하면 NewsHandler/뉴스 DB는 만들지 않음)"""
+
+    def __init__(self, module: str, class_name: str):
+        self.module = module
+        self.class_name = class_name
+
+    def __set_name__(self, owner, name):
+        self.attr = f"_{name}"
+
+    def __get__(self, agent, owner=None):
+        if agent is None:
+            return self
+        node = agent.__dict__.get(self.attr)
+        if node is None:
+            with agent._init_lock:
+                node = agent.__dict__.get(self.attr)
+                if node is None:
+                    node_class = getattr(importlib.import_module(self.module), self.class_name)
+                    node = agent.__dict__[self.attr] = node_class()
+        return node
+
+
 class FinanceAgent:
     """ graph framework using separated nodes"""
+    input_node = _LazyNode("finance_agent.nodes.input_node", "InputNode")
+    query_parser_node = _LazyNode("finance_agent.nodes.query_parser_node", "QueryParserNode")
+    sql_generator_node = _LazyNode("finance_agent.nodes.sql_generator_node", "SqlGeneratorNode")
+    sql_refiner_node = _LazyNode("finance_agent.nodes.sql_refiner_node", "SqlRefinerNode")
+    output_formatter_node = _LazyNode("finance_agent.nodes.output_formatter_node", "OutputFormatterNode")
+    news_node = _LazyNode("finance_agent.nodes.news_handler", "NewsHandler")
+
     def __init__(self):
-        # Initialize nodes
-        self.input_node = InputNode()
-        self.query_parser_node = QueryParserNode()
-        self.sql_generator_node = SqlGeneratorNode()
-        self.sql_refiner_node = SqlRefinerNode()
-        self.output_formatter_node = OutputFormatterNode()
-        self.news_node = NewsHandler()
-        
-        # Build graph
-        self.graph = self._build_graph()
-    
-    def _build_graph(self) -> StateGraph:
+        # 노드, 체크포인트 저장소, 그래프는 처음 사용할 때 생성 (CLI/API 시작 시간 단축)
+        self._init_lock = threading.RLock()
+        self._checkpointer = _UNSET
+        self._graph = None
+
+    @property
+    def checkpointer(self):
+        """CHECKPOINT_DB_URL이 있으면 세션별 그래프 상태를 DB에 저장 (다른 프로세스/재시작 후에도 이어가기)"""
+        if self._checkpointer is _UNSET:
+            with self._init_lock:
+                if self._checkpointer is _UNSET:
+                    from finance_agent.checkpoint import create_checkpointer
+                    self._checkpointer = create_checkpointer()
+        return self._checkpointer
+
+    @property
+    def graph(self):
+        if self._graph is None:
+            with self._init_lock:
+                if self._graph is None:
+                    self._graph = self._build_graph()
+        return self._graph
+
+    def warm_up(self, background: bool = True):
+        """노드/그래프/커넥션 풀/최신 거래일/LLM 연결을 미리 준비 (finance_agent/warmup.py), Warmup 반환"""
+        from finance_agent.warmup import Warmup
+        warmup = Warmup(self)
+        return warmup.start() if background else warmup.run()
+
+    def _build_graph(self):
         """Build graph framework"""
+        from langgraph.graph import StateGraph, END
+
         workflow = StateGraph(GraphState)
         
         # Add nodes
@@ -99,26 +148,38 @@ class FinanceAgent:
         workflow.add_edge("output_formatter", END)
         workflow.add_edge("news_handler", END)
         
-        return workflow.compile()
+        return workflow.compile(checkpointer=self.checkpointer)
     
     # ---- Node wrappers ----
+    def _run_node(self, name: str, node, state: GraphState) -> GraphState:
+        """노드 실행을 span으로 기록 (SQL 노드는 몇 번째 시도인지 함께 기록)"""
+        with get_tracer().span(f"node.{name}", kind="node", session_id=state.get("session_id")) as span:
+            result = node.process(state)
+            span.set(
+                intent=(result.get("parsed_query") or {}).get("intent"),
+                sql_attempts=result.get("sql_attempts") or None,
+                sql_error=bool(result.get("sql_error")),
+                rows=len(result.get("query_results") or []) if name.startswith("sql_") else None,
+            )
+            return result
+
     def input_handler(self, state: GraphState) -> GraphState:
-        return self.input_node.process(state)
+        return self._run_node("input_handler", self.input_node, state)
 
     def query_parser(self, state: GraphState) -> GraphState:
-        return self.query_parser_node.process(state)
+        return self._run_node("query_parser", self.query_parser_node, state)
     
     def sql_generator(self, state: GraphState) -> GraphState:
-        return self.sql_generator_node.process(state)
+        return self._run_node("sql_generator", self.sql_generator_node, state)
     
     def sql_refiner(self, state: GraphState) -> GraphState:
-        return self.sql_refiner_node.process(state)
+        return self._run_node("sql_refiner", self.sql_refiner_node, state)
     
     def output_formatter(self, state: GraphState) -> GraphState:
-        return self.output_formatter_node.process(state)
+        return self._run_node("output_formatter", self.output_formatter_node, state)
     
     def news_handler(self, state: GraphState) -> GraphState:
-        return self.news_node.process(state)
+        return self._run_node("news_handler", self.news_node, state)
     
     # ---- Routers ----
     def route_after_query_parser(self, state: GraphState) -> str:
@@ -143,16 +204,31 @@ class FinanceAgent:
         else:
             return "format"
     
-    # ---- Public API ----
-    def process_query(self, user_query: str, session_id: str = None, chat_history: list = None, initial_state: Dict = None) -> Dict:
-        if session_id is None:
-            session_id = str(uuid.uuid4())
+    # ---- Session state (checkpointer) ----
+    def _run_config(self, session_id: str) -> Optional[Dict]:
+        if self.checkpointer is None:
+            return None
+        return {"configurable": {"thread_id": session_id}}
 
-        if chat_history is None:
-            chat_history = []
+    def saved_state(self, session_id: str) -> Dict:
+        """체크포인트에 저장된 세션의 마지막 그래프 상태 (없거나 체크포인트 미사용이면 {})"""
+        if self.checkpointer is None:
+            return {}
+        return dict(self.graph.get_state(self._run_config(session_id)).values or {})
+
+    def save_history(self, session_id: str, chat_history: list):
+        """턴이 끝난 뒤(응답이 대화 기록에 추가된 뒤)의 대화 기록을 체크포인트에 반영"""
+        if self.checkpointer is None:
+            return
+        try:
+            self.graph.update_state(self._run_config(session_id), {"chat_history": list(chat_history)})
+        except Exception as e:
+            print(f"[FinanceAgent] 대화 기록 저장 실패: {e}")
 
+    # ---- Public API ----
+    def _initial_state(self, user_query: str, session_id: str, chat_history: list, initial_state: Dict = None) -> GraphState:
         if initial_state is None:
-            initial_state = {
+            return {
                 "user_query": user_query,
                 "chat_history": chat_history,
                 "session_id": session_id,
@@ -167,30 +243,79 @@ class FinanceAgent:
                 "final_output": "",
                 "is_complete": False
             }
-        else:
-            initial_state["user_query"] = user_query
+        initial_state["user_query"] = user_query
+        return initial_state
+
+    def _result(self, result_state: Dict, session_id: str, trace_id: str) -> Dict:
+        return {
+            "clarification_question": result_state.get("clarification_question"),
+            "response": result_state.get("final_output"),
+            "needs_user_input": result_state.get("needs_user_input", False),
+            "is_complete": result_state.get("is_complete", False),
+            "session_id": session_id,
+            "sql_query": result_state.get("sql_query", ""),
+            "sql_attempts": result_state.get("sql_attempts", 0),
+            "trace_id": trace_id,
+            "state": result_state,
+        }
+
+    def _error_result(self, error: Exception, session_id: str) -> Dict:
+        return {
+            "response": f"처리 중 오류가 발생했습니다: {str(error)}",
+            "needs_user_input": False,
+            "is_complete": True,
+            "session_id": session_id,
+            "sql_query": "",
+            "sql_attempts": 0,
+        }
+
+    def process_query(self, user_query: str, session_id: str = None, chat_history: list = None, initial_state: Dict = None) -> Dict:
+        if chat_history is None:
+            # 기존 세션이면 체크포인트에 저장된 대화 기록으로 이어감
+            chat_history = list(self.saved_state(session_id).get("chat_history") or []) if session_id else []
+
+        if session_id is None:
+            session_id = str(uuid.uuid4())
+
+        initial_state = self._initial_state(user_query, session_id, chat_history, initial_state)
 
         try:
-            result_state = self.graph.invoke(initial_state)
-            return {
-                "clarification_question": result_state.get("clarification_question"),
-                "response": result_state.get("final_output"),
-                "needs_user_input": result_state.get("needs_user_input", False),
-                "is_complete": result_state.get("is_complete", False),
-                "session_id": session_id,
-                "sql_query": result_state.get("sql_query", ""),
-                "sql_attempts": result_state.get("sql_attempts", 0),
-                "state": result_state,
-            }
+            with get_tracer().span("agent.process_query", kind="request", session_id=session_id) as span:
+                # 체크포인트는 실행이 끝날 때 한 번만 저장 (노드마다 저장하지 않음)
+                result_state = self.graph.invoke(initial_state, self._run_config(session_id), checkpoint_during=False)
+                span.set(
+                    intent=(result_state.get("parsed_query") or {}).get("intent") or "sql",
+                    sql_attempts=result_state.get("sql_attempts", 0),
+                )
+            return self._result(result_state, session_id, span.trace_id)
         except Exception as e:
-            return {
-                "response": f"처리 중 오류가 발생했습니다: {str(e)}",
-                "needs_user_input": False,
-                "is_complete": True,
-                "session_id": session_id,
-                "sql_query": "",
-                "sql_attempts": 0,
-            }
+            return self._error_result(e, session_id)
+
+    def stream_query(self, user_query: str, session_id: str = None, chat_history: list = None, initial_state: Dict = None) -> Iterator[Tuple[str, object]]:
+        """process_query와 같지만 노드가 끝날 때마다 ("node", 노드 이름)을 내보내고,
+        마지막에 ("result", process_query와 같은 결과 dict)를 내보냄 (API의 SSE 진행 상황 표시용)"""
+        if chat_history is None:
+            # 기존 세션이면 체크포인트에 저장된 대화 기록으로 이어감
+            chat_history = list(self.saved_state(session_id).get("chat_history") or []) if session_id else []
+
+        if session_id is None:
+            session_id = str(uuid.uuid4())
+
+        state = dict(self._initial_state(user_query, session_id, chat_history, initial_state))
+
+        try:
+            with get_tracer().span("agent.process_query", kind="request", session_id=session_id, streamed=True) as span:
+                for update in self.graph.stream(state, self._run_config(session_id), stream_mode="updates", checkpoint_during=False):
+                    for node_name, node_state in update.items():
+                        state.update(node_state or {})
+                        yield "node", node_name
+                span.set(
+                    intent=(state.get("parsed_query") or {}).get("intent") or "sql",
+                    sql_attempts=state.get("sql_attempts", 0),
+                )
+            yield "result", self._result(state, session_id, span.trace_id)
+        except Exception as e:
+            yield "result", self._error_result(e, session_id)
 
 
 class FinanceAgentInterface:
@@ -0,0 +1,288 @@
+"""
+HTTP API
+FinanceAgent 질의응답과 NewsBot 스케줄 관리를 FastAPI로 제공합니다.
+
+- FinanceAgent / NewsBot / DB 커넥션 풀은 프로세스 시작 시 한 번 만들어 모든 요청이 공유
+- 에이전트 실행은 블로킹(LLM/DB 대기)이므로 작업 스레드 풀(API_WORKER_THREADS)에서 실행
+  (세션 복원/스케줄 관리처럼 DB를 조회하는 짧은 처리도 이벤트 루프 밖(FastAPI 스레드 풀)에서 실행)
+- 동시 처리 상한(API_MAX_CONCURRENCY)을 넘으면 API_QUEUE_TIMEOUT_SECONDS 동안 기다린 뒤 503
+- 요청별 응답 마감 시간(API_REQUEST_TIMEOUT_SECONDS)을 넘으면 504
+  (작업 스레드의 처리는 중단되지 않고 끝까지 실행된 뒤 결과만 버려지며, 끝날 때까지 동시 처리 슬롯을 차지하므로
+  작업 스레드 풀 대기열도 API_MAX_CONCURRENCY를 넘지 않음)
+- POST /chat/stream: 그래프 노드 진행 상황과 최종 응답을 SSE(text/event-stream)로 전송
+- 시작 시 백그라운드 워밍업(WARMUP_ON_START), GET /readyz는 워밍업이 끝나기 전까지, 그리고 필수 단계가 실패한 동안 503
+  (GET /healthz는 프로세스 생존 확인용으로 항상 200)
+
+실행: python scripts/run_api.py
+"""
+
+import json
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+
+from config.config import Config
+from finance_agent.chat_router import ChatRouter, ChatSession
+from finance_agent.session_store import SessionStore
+from finance_agent.tracing import get_tracer
+
+
+class ChatRequest(BaseModel):
+    message: str
+    session_id: Optional[str] = None
+
+
+class ScheduleRequest(BaseModel):
+    company_name: str
+    schedule_time: str  # HH:MM
+
+
+class WeeklyReportRequest(BaseModel):
+    company_name: Optional[str] = None
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class AgentService:
+    """프로세스 공용 에이전트 + 세션 저장소 + 작업 스레드 풀 + 동시 처리 상한"""
+
+    def __init__(self, router: Optional[ChatRouter] = None, start_scheduler: bool = True,
+                 warm_up: Optional[bool] = None):
+        self.config = Config()
+        self.router = router or ChatRouter()
+        # 유휴/LRU로 제거되는 세션은 NewsBot 대화 상태도 함께 정리하고,
+        # 다른 프로세스에서 시작된 세션은 체크포인트에서 대화 기록을 복원
+        self.sessions = SessionStore(on_evict=self.router.news_bot.forget_session, loader=self.router.restore)
+        self.executor = ThreadPoolExecutor(max_workers=self.config.API_WORKER_THREADS, thread_name_prefix="agent-worker")
+        self.semaphore = asyncio.Semaphore(self.config.API_MAX_CONCURRENCY)
+        self.in_flight = 0
+        if start_scheduler:
+            threading.Thread(target=self.router.news_bot.run_scheduler, daemon=True).start()
+        # 첫 요청이 접속/로드 비용을 내지 않도록 백그라운드에서 준비 (끝날 때까지 /readyz 503)
+        if self.config.WARMUP_ON_START if warm_up is None else warm_up:
+            self.warmup = self.router.finance_agent.warm_up()
+        else:
+            self.warmup = None
+
+    def readiness(self) -> dict:
+        if self.warmup is None:
+            return {"ready": True, "status": "ready", "warmup": "disabled"}
+        return self.warmup.status()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # ----------------- 동시 처리 상한 / 마감 시간 -----------------
+    async def acquire(self):
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout=self.config.API_QUEUE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            get_tracer().metrics.inc("finance_agent_api_rejected_total", reason="busy")
+            raise HTTPException(status_code=503, detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.")
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self.semaphore.release()
+
+    def submit(self, func: Callable, *args) -> Future:
+        """acquire() 이후 호출: 작업 스레드에 제출하고, 작업이 끝나면(응답 마감 후라도) 슬롯을 반납"""
+        loop = asyncio.get_running_loop()
+        try:
+            future = self.executor.submit(func, *args)
+        except Exception:
+            self.release()
+            raise
+
+        def _release(_):
+            try:
+                loop.call_soon_threadsafe(self.release)
+            except RuntimeError:  # 종료 중 이벤트 루프가 이미 닫힘
+                pass
+
+        future.add_done_callback(_release)
+        return future
+
+    async def run(self, func: Callable, *args):
+        """작업 스레드에서 func(*args) 실행 (동시 처리 상한 + 응답 마감 시간 적용)"""
+        await self.acquire()
+        future = self.submit(func, *args)
+        try:
+            # 마감 시간이 지나도 작업은 취소하지 않음 (shield) → 슬롯은 작업이 끝날 때 반납
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)),
+                                          timeout=self.config.API_REQUEST_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            get_tracer().metrics.inc("finance_agent_api_rejected_total", reason="timeout")
+            raise HTTPException(status_code=504, detail="응답 시간이 초과되었습니다.")
+
+    # ----------------- 작업 스레드에서 실행되는 함수 -----------------
+    def handle(self, session: ChatSession, message: str) -> Optional[str]:
+        with session.lock:
+            response = self.router.handle(session, message)
+        self.sessions.update(session)
+        return response
+
+    def stream(self, session: ChatSession, message: str, emit: Callable[[str, dict], None]):
+        try:
+            with session.lock:
+                for event, payload in self.router.stream(session, message):
+                    if event == "node":
+                        emit("node", {"node": payload})
+                    else:
+                        emit("answer", {"response": payload, "session_id": session.session_id, "mode": session.active_mode})
+        except Exception as e:
+            emit("error", {"detail": f"처리 중 오류가 발생했습니다: {e}"})
+        finally:
+            self.sessions.update(session)
+            emit("done", {})
+
+
+def create_app(service_factory: Callable[[], AgentService] = AgentService) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        app.state.service = service_factory()
+        yield
+        app.state.service.close()
+
+    app = FastAPI(title="finance-agent", lifespan=lifespan)
+
+    def service(request: Request) -> AgentService:
+        return request.app.state.service
+
+    # ----------------- 질의응답 -----------------
+    @app.post("/chat")
+    async def chat(body: ChatRequest, request: Request):
+        svc = service(request)
+        # 처음 보는 session_id는 체크포인트 DB에서 복원하므로 이벤트 루프 밖에서 조회
+        session = await run_in_threadpool(svc.sessions.get, body.session_id)
+        response = await svc.run(svc.handle, session, body.message)
+        return {"response": response, "session_id": session.session_id, "mode": session.active_mode}
+
+    @app.post("/chat/stream")
+    async def chat_stream(body: ChatRequest, request: Request):
+        svc = service(request)
+        session = await run_in_threadpool(svc.sessions.get, body.session_id)
+        await svc.acquire()
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def emit(event: str, data: dict):
+            loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+
+        # 슬롯은 클라이언트 연결이 아니라 작업 스레드의 처리가 끝날 때 반납
+        svc.submit(svc.stream, session, body.message, emit)
+
+        async def events():
+            deadline = loop.time() + svc.config.API_REQUEST_TIMEOUT_SECONDS
+            yield _sse("session", {"session_id": session.session_id})
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), timeout=max(0.0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    get_tracer().metrics.inc("finance_agent_api_rejected_total", reason="timeout")
+                    yield _sse("error", {"detail": "응답 시간이 초과되었습니다."})
+                    yield _sse("done", {})
+                    break
+                yield _sse(event, data)
+                if event == "done":
+                    break
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.delete("/sessions/{session_id}")
+    async def drop_session(session_id: str, request: Request):
+        if not service(request).sessions.drop(session_id):
+            raise HTTPException(status_code=404, detail="세션이 없습니다.")
+        return {"session_id": session_id, "deleted": True}
+
+    # ----------------- 뉴스 스케줄 -----------------
+    # 구독 DB를 조회하는 블로킹 처리이므로 async가 아닌 def (FastAPI가 스레드 풀에서 실행)
+    def news_bot(request: Request, session_id: str):
+        svc = service(request)
+        svc.sessions.get(session_id)  # 스케줄만 관리하는 세션도 저장소에 등록 (만료 시 NewsBot 상태 정리)
+        return svc.router.news_bot
+
+    @app.get("/sessions/{session_id}/schedules")
+    def list_schedules(session_id: str, request: Request):
+        return {"session_id": session_id, "schedules": news_bot(request, session_id).list_schedules(session_id)}
+
+    @app.post("/sessions/{session_id}/schedules", status_code=201)
+    def add_schedule(session_id: str, body: ScheduleRequest, request: Request):
+        try:
+            entry = news_bot(request, session_id).add_schedule(session_id, body.company_name, body.schedule_time)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="schedule_time은 '09:00', '14:30'과 같은 HH:MM 형식이어야 합니다.")
+        return {"session_id": session_id, "schedule": entry}
+
+    @app.delete("/sessions/{session_id}/schedules/{company_name}")
+    def cancel_schedule(session_id: str, company_name: str, request: Request):
+        if not news_bot(request, session_id).cancel_schedule(session_id, company_name):
+            raise HTTPException(status_code=404, detail=f"'{company_name}' 스케줄이 없습니다.")
+        return {"session_id": session_id, "company_name": company_name, "cancelled": True}
+
+    def report_company(bot, session_id: str, company_name: Optional[str]) -> str:
+        """지정한 회사, 없으면 이 세션이 구독 중인 유일한 회사"""
+        companies = [s["company_name"] for s in bot.list_schedules(session_id)]
+        company_name = company_name or (companies[0] if len(companies) == 1 else None)
+        if not company_name:
+            raise HTTPException(status_code=400, detail=f"company_name을 지정해주세요. (등록된 회사: {companies})")
+        return company_name
+
+    @app.post("/sessions/{session_id}/weekly-report", status_code=202)
+    def weekly_report(session_id: str, request: Request, body: Optional[WeeklyReportRequest] = None):
+        bot = news_bot(request, session_id)
+        company_name = report_company(bot, session_id, body.company_name if body else None)
+        # 보고서 생성은 NewsBot 작업 스레드에서 실행, 완료되면 GET으로 조회
+        bot._send_weekly_report(session_id, company_name=company_name)
+        return {"session_id": session_id, "company_name": company_name, "started": True}
+
+    @app.get("/sessions/{session_id}/weekly-report")
+    def get_weekly_report(session_id: str, request: Request, company_name: Optional[str] = None):
+        bot = news_bot(request, session_id)
+        company_name = report_company(bot, session_id, company_name)
+        report = bot.latest_weekly_report(company_name)
+        if report is None:
+            raise HTTPException(status_code=404, detail=f"'{company_name}' 주간 보고서가 아직 없습니다.")
+        return {"session_id": session_id, "company_name": company_name,
+                "delivery": bot.last_delivery(session_id, company_name, kind="weekly"), **report}
+
+    # ----------------- 운영 -----------------
+    @app.get("/healthz")
+    async def healthz(request: Request):
+        svc = service(request)
+        return {
+            "status": "ok",
+            "sessions": len(svc.sessions),
+            "session_memory_bytes": svc.sessions.total_bytes,
+            "sessions_evicted": svc.sessions.evicted,
+            "in_flight": svc.in_flight,
+            "ready": svc.readiness()["ready"],
+        }
+
+    @app.get("/readyz")
+    async def readyz(request: Request):
+        status = service(request).readiness()
+        return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        return get_tracer().render_prometheus()
+
+    return app
+
+
+app = create_app()
@@ -0,0 +1,102 @@
+"""
+Chat routing
+사용자 메시지를 세션 모드에 따라 NewsBot(스케줄링 대화) 또는 FinanceAgent(주가/뉴스 Q&A)로 보내는 라우터
+(CLI, 부하 테스트, API가 같은 규칙을 사용)
+"""
+
+from typing import Iterator, Optional, Tuple
+
+from langchain_core.messages import HumanMessage, AIMessage
+
+from finance_agent.session_store import ChatSession, HistoryCompactor
+
+# NewsBot 명령 키워드 (FinanceAgent보다 우선)
+NEWS_BOT_COMMANDS = ["스케줄 확인", "스케줄 취소", "뉴스 스케줄링", "주간 보고서 테스트"]
+
+
+class ChatRouter:
+    def __init__(self, finance_agent=None, news_bot=None, compactor: Optional[HistoryCompactor] = None):
+        if finance_agent is None:
+            from finance_agent.agent import FinanceAgent
+            finance_agent = FinanceAgent()
+        if news_bot is None:
+            from finance_agent.news_bot import NewsBot
+            news_bot = NewsBot()
+        self.finance_agent = finance_agent
+        self.news_bot = news_bot
+        self.compactor = compactor or HistoryCompactor()
+
+    def restore(self, session: ChatSession):
+        """다른 프로세스에서 진행된 세션이면 체크포인트의 대화 기록을 가져옴 (CHECKPOINT_DB_URL 사용 시)"""
+        if not session.chat_history:
+            session.chat_history = list(self.finance_agent.saved_state(session.session_id).get("chat_history") or [])
+
+    def _routes_to_news_bot(self, session: ChatSession, user_input: str) -> bool:
+        # NewsBot 키워드가 우선순위를 가지고, NewsBot 모드에서 대화가 진행 중이면 계속 NewsBot이 처리
+        return any(kw in user_input for kw in NEWS_BOT_COMMANDS) or session.active_mode == 'news_bot'
+
+    def _handle_news_bot(self, session: ChatSession, user_input: str) -> Optional[str]:
+        response = None
+        news_bot = self.news_bot
+
+        if any(kw in user_input for kw in NEWS_BOT_COMMANDS):
+            session.active_mode = 'news_bot'
+            if "스케줄 확인" in user_input:
+                response = news_bot.show_schedules(session.session_id)
+            elif "스케줄 취소" in user_input:
+                response = news_bot.start_cancellation(session.session_id)
+            elif "뉴스 스케줄링" in user_input:
+                response = news_bot.start_conversation(session.session_id)
+            elif "주간 보고서 테스트" in user_input:
+                response = news_bot.trigger_weekly_report(session.session_id)
+        else:
+            response = news_bot.handle_message(session.session_id, user_input)
+
+        # NewsBot과의 대화가 끝났으면 finance 모드로 전환
+        session_state = news_bot.conversation_state.get(session.session_id, {})
+        if session_state.get("current_task") is None:
+            session.active_mode = 'finance'
+        return response
+
+    def _finish_finance(self, session: ChatSession, user_input: str, result: dict) -> Optional[str]:
+        response = result.get('response') or result.get("clarification_question")
+        if response:
+            session.chat_history.append(HumanMessage(content=user_input))
+            session.chat_history.append(AIMessage(content=response))
+            # 대화가 길어져도 다음 턴 프롬프트 크기가 일정하도록 오래된 대화는 요약으로 접음
+            session.chat_history = self.compactor.compact(session.chat_history)
+            self.finance_agent.save_history(session.session_id, session.chat_history)
+        return response
+
+    def handle(self, session: ChatSession, user_input: str) -> Optional[str]:
+        if self._routes_to_news_bot(session, user_input):
+            return self._handle_news_bot(session, user_input)
+
+        # 위 경우에 해당하지 않으면 FinanceAgent가 처리
+        session.active_mode = 'finance'
+        result = self.finance_agent.process_query(
+            user_query=user_input,
+            session_id=session.session_id,
+            chat_history=session.chat_history,
+        )
+        return self._finish_finance(session, user_input, result)
+
+    def stream(self, session: ChatSession, user_input: str) -> Iterator[Tuple[str, object]]:
+        """handle과 같은 라우팅, FinanceAgent 질문은 노드 진행 상황을 ("node", 이름)으로 먼저 내보냄
+        마지막 이벤트는 항상 ("answer", 응답 문자열)"""
+        if self._routes_to_news_bot(session, user_input):
+            yield "answer", self._handle_news_bot(session, user_input)
+            return
+
+        session.active_mode = 'finance'
+        result = {}
+        for event, payload in self.finance_agent.stream_query(
+            user_query=user_input,
+            session_id=session.session_id,
+            chat_history=session.chat_history,
+        ):
+            if event == "node":
+                yield "node", payload
+            else:
+                result = payload
+        yield "answer", self._finish_finance(session, user_input, result)
@@ -0,0 +1,284 @@
+"""
+LangGraph checkpointer
+FinanceAgent 그래프 상태를 session_id(thread_id) 단위로 SQL DB(SQLite 또는 MySQL)에 저장합니다.
+어느 프로세스에서든 같은 세션의 대화 기록/재질문 맥락을 이어갈 수 있고, 재시작해도 대화가 유지됩니다.
+
+- 세션당 최근 CHECKPOINT_KEEP_PER_SESSION개만 보관하고 이전 체크포인트는 저장 시 삭제
+- 결과 행(query_results)처럼 다음 턴에 필요 없는 큰 값은 저장하지 않고, 직렬화 결과는 zlib으로 압축
+- 마지막 저장 후 CHECKPOINT_TTL_SECONDS가 지난 세션은 주기적으로 삭제
+
+CHECKPOINT_DB_URL: "" (사용 안 함) / "sqlite:///data/checkpoints.db" / "mysql" (MYSQL_DATABASE 커넥션 풀) / SQLAlchemy URL
+"""
+
+import time
+import zlib
+import threading
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from sqlalchemy import (
+    Column, Double, Integer, LargeBinary, MetaData, String, Table, and_, delete, func, select,
+)
+from sqlalchemy.dialects import mysql
+
+from config.config import Config
+
+# 다음 턴에 다시 계산되는 값은 저장하지 않음 (입력 state가 매 턴 초기화)
+EXCLUDED_CHANNELS = frozenset({"query_results"})
+# 이 크기 이상인 직렬화 값만 압축
+COMPRESS_MIN_BYTES = 512
+# 만료 세션 삭제 주기 (초)
+PRUNE_INTERVAL_SECONDS = 600
+
+_Blob = LargeBinary().with_variant(mysql.MEDIUMBLOB(), "mysql")
+_metadata = MetaData()
+
+checkpoints_table = Table(
+    "langgraph_checkpoints", _metadata,
+    Column("thread_id", String(64), primary_key=True),
+    Column("checkpoint_ns", String(64), primary_key=True, default=""),
+    Column("checkpoint_id", String(64), primary_key=True),
+    Column("parent_checkpoint_id", String(64)),
+    Column("type", String(32)),
+    Column("checkpoint", _Blob),
+    Column("metadata_type", String(32)),
+    Column("metadata", _Blob),
+    Column("created_at", Double, index=True),
+)
+
+writes_table = Table(
+    "langgraph_writes", _metadata,
+    Column("thread_id", String(64), primary_key=True),
+    Column("checkpoint_ns", String(64), primary_key=True, default=""),
+    Column("checkpoint_id", String(64), primary_key=True),
+    Column("task_id", String(64), primary_key=True),
+    Column("idx", Integer, primary_key=True),
+    Column("channel", String(128)),
+    Column("type", String(32)),
+    Column("value", _Blob),
+    Column("task_path", String(256), default=""),
+)
+
+
+def _thread_config(thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> RunnableConfig:
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}}
+
+
+class SqlCheckpointSaver(BaseCheckpointSaver):
+    """SQLAlchemy 엔진 위의 LangGraph 체크포인트 저장소 (여러 스레드/프로세스 공유 가능)"""
+
+    def __init__(self, engine, keep_per_thread: Optional[int] = None, ttl_seconds: Optional[int] = None):
+        super().__init__()
+        self.config = Config()
+        self.engine = engine
+        self.keep_per_thread = max(1, keep_per_thread or self.config.CHECKPOINT_KEEP_PER_SESSION)
+        self.ttl_seconds = self.config.CHECKPOINT_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._last_prune = 0.0
+        self._prune_lock = threading.Lock()
+        _metadata.create_all(engine)
+        from finance_agent.database import widen_float_columns
+        widen_float_columns(engine, checkpoints_table)
+
+    # ----------------- 직렬화 -----------------
+    def _dumps(self, value: Any) -> Tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(value)
+        if len(data) >= COMPRESS_MIN_BYTES:
+            return f"{type_}+zlib", zlib.compress(data)
+        return type_, data
+
+    def _loads(self, type_: str, data: bytes) -> Any:
+        if type_.endswith("+zlib"):
+            type_, data = type_[:-len("+zlib")], zlib.decompress(data)
+        return self.serde.loads_typed((type_, data))
+
+    def _to_tuple(self, row, conn) -> CheckpointTuple:
+        writes = conn.execute(
+            select(writes_table.c.task_id, writes_table.c.channel, writes_table.c.type, writes_table.c.value)
+            .where(and_(
+                writes_table.c.thread_id == row.thread_id,
+                writes_table.c.checkpoint_ns == row.checkpoint_ns,
+                writes_table.c.checkpoint_id == row.checkpoint_id,
+            ))
+            .order_by(writes_table.c.task_id, writes_table.c.idx)
+        ).all()
+        return CheckpointTuple(
+            config=_thread_config(row.thread_id, row.checkpoint_ns, row.checkpoint_id),
+            checkpoint=self._loads(row.type, row.checkpoint),
+            metadata=self._loads(row.metadata_type, row.metadata),
+            parent_config=(
+                _thread_config(row.thread_id, row.checkpoint_ns, row.parent_checkpoint_id)
+                if row.parent_checkpoint_id else None
+            ),
+            pending_writes=[(w.task_id, w.channel, self._loads(w.type, w.value)) for w in writes],
+        )
+
+    # ----------------- 조회 -----------------
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        configurable = config["configurable"]
+        query = select(checkpoints_table).where(and_(
+            checkpoints_table.c.thread_id == configurable["thread_id"],
+            checkpoints_table.c.checkpoint_ns == configurable.get("checkpoint_ns", ""),
+        ))
+        checkpoint_id = get_checkpoint_id(config)
+        if checkpoint_id:
+            query = query.where(checkpoints_table.c.checkpoint_id == checkpoint_id)
+        else:
+            query = query.order_by(checkpoints_table.c.checkpoint_id.desc()).limit(1)
+        with self.engine.connect() as conn:
+            row = conn.execute(query).first()
+            return self._to_tuple(row, conn) if row else None
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        query = select(checkpoints_table)
+        if config:
+            configurable = config["configurable"]
+            query = query.where(checkpoints_table.c.thread_id == configurable["thread_id"])
+            if "checkpoint_ns" in configurable:
+                query = query.where(checkpoints_table.c.checkpoint_ns == configurable["checkpoint_ns"])
+            if get_checkpoint_id(config):
+                query = query.where(checkpoints_table.c.checkpoint_id == get_checkpoint_id(config))
+        if before and get_checkpoint_id(before):
+            query = query.where(checkpoints_table.c.checkpoint_id < get_checkpoint_id(before))
+        query = query.order_by(checkpoints_table.c.checkpoint_id.desc())
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(query).all()
+            for row in rows:
+                item = self._to_tuple(row, conn)
+                if filter and not all(item.metadata.get(k) == v for k, v in filter.items()):
+                    continue
+                if limit is not None:
+                    if limit <= 0:
+                        break
+                    limit -= 1
+                yield item
+
+    # ----------------- 저장 -----------------
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        saved = dict(checkpoint)
+        saved["channel_values"] = {
+            k: v for k, v in checkpoint["channel_values"].items() if k not in EXCLUDED_CHANNELS
+        }
+        type_, data = self._dumps(saved)
+        meta_type, meta = self._dumps(get_checkpoint_metadata(config, metadata))
+
+        with self.engine.begin() as conn:
+            conn.execute(checkpoints_table.insert().values(
+                thread_id=thread_id,
+                checkpoint_ns=checkpoint_ns,
+                checkpoint_id=checkpoint["id"],
+                parent_checkpoint_id=configurable.get("checkpoint_id"),
+                type=type_,
+                checkpoint=data,
+                metadata_type=meta_type,
+                metadata=meta,
+                created_at=time.time(),
+            ))
+            self._prune_thread(conn, thread_id, checkpoint_ns)
+        self._maybe_prune_expired()
+        return _thread_config(thread_id, checkpoint_ns, checkpoint["id"])
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                   task_path: str = "") -> None:
+        configurable = config["configurable"]
+        keys = {
+            "thread_id": configurable["thread_id"],
+            "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+            "checkpoint_id": configurable["checkpoint_id"],
+            "task_id": task_id,
+        }
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            if channel in EXCLUDED_CHANNELS:
+                continue
+            type_, data = self._dumps(value)
+            rows.append({**keys, "idx": WRITES_IDX_MAP.get(channel, idx), "channel": channel,
+                         "type": type_, "value": data, "task_path": task_path})
+        if not rows:
+            return
+        with self.engine.begin() as conn:
+            # 같은 task의 기록은 덮어씀 (재시도 시 중복 방지)
+            conn.execute(delete(writes_table).where(and_(
+                *(writes_table.c[k] == v for k, v in keys.items()),
+                writes_table.c.idx.in_([r["idx"] for r in rows]),
+            )))
+            conn.execute(writes_table.insert(), rows)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(delete(checkpoints_table).where(checkpoints_table.c.thread_id == thread_id))
+            conn.execute(delete(writes_table).where(writes_table.c.thread_id == thread_id))
+
+    # ----------------- 정리 -----------------
+    def _prune_thread(self, conn, thread_id: str, checkpoint_ns: str):
+        """세션의 최근 keep_per_thread개를 제외한 체크포인트와 그 기록 삭제"""
+        stale = conn.execute(
+            select(checkpoints_table.c.checkpoint_id)
+            .where(and_(checkpoints_table.c.thread_id == thread_id, checkpoints_table.c.checkpoint_ns == checkpoint_ns))
+            .order_by(checkpoints_table.c.checkpoint_id.desc())
+            .offset(self.keep_per_thread)
+        ).scalars().all()
+        if not stale:
+            return
+        for table in (checkpoints_table, writes_table):
+            conn.execute(delete(table).where(and_(
+                table.c.thread_id == thread_id,
+                table.c.checkpoint_ns == checkpoint_ns,
+                table.c.checkpoint_id.in_(stale),
+            )))
+
+    def prune(self, max_age_seconds: Optional[float] = None) -> int:
+        """마지막 저장 후 max_age_seconds가 지난 세션의 체크포인트 삭제, 삭제한 세션 수 반환"""
+        max_age_seconds = self.ttl_seconds if max_age_seconds is None else max_age_seconds
+        if not max_age_seconds:
+            return 0
+        cutoff = time.time() - max_age_seconds
+        with self.engine.begin() as conn:
+            threads = conn.execute(
+                select(checkpoints_table.c.thread_id)
+                .group_by(checkpoints_table.c.thread_id)
+                .having(func.max(checkpoints_table.c.created_at) < cutoff)
+            ).scalars().all()
+            for start in range(0, len(threads), 500):
+                chunk = threads[start:start + 500]
+                conn.execute(delete(checkpoints_table).where(checkpoints_table.c.thread_id.in_(chunk)))
+                conn.execute(delete(writes_table).where(writes_table.c.thread_id.in_(chunk)))
+        return len(threads)
+
+    def _maybe_prune_expired(self):
+        now = time.monotonic()
+        if now - self._last_prune < PRUNE_INTERVAL_SECONDS or not self._prune_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_prune = now
+            removed = self.prune()
+            if removed:
+                print(f"[Checkpoint] 만료된 세션 {removed}개 삭제")
+        except Exception as e:
+            print(f"[Checkpoint] 만료 세션 삭제 실패: {e}")
+        finally:
+            self._prune_lock.release()
+
+
+def create_checkpointer(url: Optional[str] = None) -> Optional[SqlCheckpointSaver]:
+    """CHECKPOINT_DB_URL 기준 체크포인트 저장소 (비어 있으면 None → 체크포인트 없이 실행)"""
+    url = Config.CHECKPOINT_DB_URL if url is None else url
+    if not url:
+        return None
+    from finance_agent.database import create_sql_engine
+    return SqlCheckpointSaver(create_sql_engine(url))
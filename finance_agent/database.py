@@ -3,61 +3,177 @@
 Database manager for krx_stockprice table
 """
 
+import time
 import pymysql
-from typing import List, Dict, Optional
+from contextlib import contextmanager
+from typing import Iterable, List, Dict, Optional, Tuple
+from sqlalchemy import Double, create_engine, inspect, text
+from sqlalchemy.engine import URL
 from config.config import Config
+from finance_agent.tracing import get_tracer
+from finance_agent.replay import get_cassette
+
+
+def format_rows(rows: Iterable[Dict]) -> List[Dict]:
+    """날짜는 YYYY-MM-DD 문자열, 숫자는 float으로 정규화"""
+    formatted = []
+    for row in rows:
+        out = {}
+        for k, v in row.items():
+            if hasattr(v, "strftime"):
+                out[k] = v.strftime("%Y-%m-%d")
+            elif hasattr(v, "__float__"):
+                out[k] = float(v)
+            else:
+                out[k] = v
+        formatted.append(out)
+    return formatted
+
+
+def create_mysql_engine(database: str, autocommit: bool = True):
+    """pymysql 커넥션 풀 (QueuePool) 엔진
+
+    커넥션은 처음 사용할 때 맺어지며, 조회마다 빌려 쓰고 반납하므로 여러 스레드가 하나의 매니저를 공유할 수 있습니다.
+    조회용은 autocommit으로 열어 오래 살아 있는 커넥션이 REPEATABLE READ 스냅샷에 묶여 새 데이터를 못 보는 일을 막습니다.
+    (쓰기 트랜잭션이 필요하면 autocommit=False)
+    """
+    config = Config()
+    url = URL.create(
+        "mysql+pymysql",
+        username=config.MYSQL_USER,
+        password=config.MYSQL_PASSWORD,
+        host=config.MYSQL_HOST,
+        port=config.MYSQL_PORT,
+        database=database,
+        query={"charset": "utf8mb4"},
+    )
+    return create_engine(
+        url,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_POOL_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        connect_args={"autocommit": autocommit},
+    )
+
+
+def create_sql_engine(url: str):
+    """저장소용 엔진: "mysql" (MYSQL_DATABASE 커넥션 풀, 트랜잭션 사용) / "sqlite:///..." / 그 밖의 SQLAlchemy URL"""
+    if url == "mysql":
+        return create_mysql_engine(Config.MYSQL_DATABASE, autocommit=False)
+    if url.startswith("sqlite"):
+        # 여러 작업 스레드가 같은 파일을 사용하므로 스레드 검사 해제, 쓰기 잠금은 최대 30초 대기
+        return create_engine(url, connect_args={"check_same_thread": False, "timeout": 30})
+    return create_engine(url, pool_pre_ping=True)
+
+
+def widen_float_columns(engine, table):
+    """이전 버전이 FLOAT(단정밀도)로 만든 칼럼 중 table 정의가 Double인 칼럼을 DOUBLE로 변경 (MySQL만 해당)
+
+    create_all은 이미 있는 테이블을 바꾸지 않으므로 저장소 생성 시 호출합니다.
+    MySQL FLOAT는 epoch 초를 수십~수백 초 단위로 반올림합니다.
+    """
+    if engine.dialect.name != "mysql":
+        return
+    existing = {c["name"]: c["type"] for c in inspect(engine).get_columns(table.name)}
+    columns = [
+        c for c in table.columns
+        if isinstance(c.type, Double) and c.name in existing
+        and type(existing[c.name]).__name__.upper() == "FLOAT"
+    ]
+    if not columns:
+        return
+    modify = ", ".join(f"MODIFY `{c.name}` DOUBLE{'' if c.nullable else ' NOT NULL'}" for c in columns)
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE `{table.name}` {modify}"))
+    print(f"[database] {table.name} 칼럼을 DOUBLE로 변경: {[c.name for c in columns]}")
+
+
+@contextmanager
+def pooled_cursor(engine, cursor_class=pymysql.cursors.DictCursor):
+    """풀에서 커넥션을 빌려 cursor를 열고, 끝나면 cursor를 닫고 커넥션을 풀에 반납"""
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor(cursor_class)
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+    finally:
+        connection.close()
 
 
 class DatabaseManager:
     """Database manager for executing SQL queries against krx_stockprice table"""
     
-    def __init__(self):
+    def __init__(self, backend: Optional[str] = None):
         self.config = Config()
-        self.connection = None
+        self.engine = None
+        # "mysql": 항상 원격 MySQL, "local": 읽기 쿼리는 로컬 Parquet 사본(DuckDB)에서 실행
+        self.backend = backend or self.config.SQL_EXECUTION_BACKEND
+        self.local_engine = None
+        self._latest_date: Optional[Tuple[str, float]] = None  # (날짜, 조회한 시각)
+        # sqlglot은 DatabaseManager를 만들 때만 import (구독 저장소처럼 엔진만 쓰는 곳은 불러오지 않음)
+        from finance_agent.sql_guard import SqlGuard
+        self.sql_guard = SqlGuard(self)
+        if self.backend == "local":
+            self._init_local_engine()
+        # 풀만 만들고 실제 접속은 첫 MySQL 조회 때 (replay/로컬 엔진만 쓰면 접속하지 않음)
         self.connect()
     
     def connect(self):
-        """Establish connection to MySQL database"""
+        """Create the MySQL connection pool"""
         try:
-            self.connection = pymysql.connect(
-                host=self.config.MYSQL_HOST,
-                port=self.config.MYSQL_PORT,
-                user=self.config.MYSQL_USER,
-                password=self.config.MYSQL_PASSWORD,
-                database=self.config.MYSQL_DATABASE,
-                charset="utf8mb4",
-            )
+            self.engine = create_mysql_engine(self.config.MYSQL_DATABASE)
         except Exception as e:
             print(f"Error connecting to MySQL: {e}")
             raise e
     
+    def _init_local_engine(self):
+        """로컬 실행 엔진 초기화 (duckdb 미설치/사본 없음이면 MySQL만 사용)"""
+        try:
+            from finance_agent.local_engine import LocalQueryEngine
+            engine = LocalQueryEngine()
+            if engine.is_available():
+                self.local_engine = engine
+            else:
+                print("[DatabaseManager] 로컬 Parquet 사본이 없어 MySQL을 사용합니다.")
+        except Exception as e:
+            print(f"[DatabaseManager] 로컬 엔진 초기화 실패, MySQL을 사용합니다: {e}")
+    
     def execute_query(self, query: str, params: Optional[List] = None) -> List[Dict]:
-        if not self.connection:
+        with get_tracer().span("db.execute_query", kind="sql") as span:
+            rows = get_cassette().call(
+                "sql", "db.execute_query", {"query": query, "params": params},
+                lambda: self._execute_query(query, params, span),
+            )
+            span.set(rows=len(rows))
+            return rows
+
+    def _execute_query(self, query: str, params: Optional[List], span) -> List[Dict]:
+        if self.local_engine and not params and self.local_engine.can_execute(query):
+            try:
+                rows = self.local_engine.execute(query)
+                if rows or not self.config.LOCAL_ENGINE_MYSQL_FALLBACK:
+                    span.set(backend="local")
+                    return rows
+                # 사본에 빠진 기간/종목일 수 있으므로 빈 결과는 원본 저장소에서 다시 확인
+                span.set(local_miss=True)
+            except Exception as e:
+                # 방언 차이 등으로 실패하면 원본 저장소에서 다시 실행
+                print(f"[DatabaseManager] 로컬 실행 실패, MySQL로 재시도: {e}")
+
+        span.set(backend="mysql")
+        if self.engine is None:
             self.connect()
         
-        cursor = self.connection.cursor(pymysql.cursors.DictCursor)
-        try:
+        with pooled_cursor(self.engine) as cursor:
             if params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
-            results = cursor.fetchall()
-            formatted = []
-            for row in results:
-                out = {}
-                for k, v in row.items():
-                    if hasattr(v, "strftime"):
-                        out[k] = v.strftime("%Y-%m-%d")
-                    elif hasattr(v, "__float__"):
-                        out[k] = float(v)
-                    else:
-                        out[k] = v
-                formatted.append(out)
-            return formatted
-        except Exception as e:
-            raise e
-        finally:
-            cursor.close()
+            return format_rows(cursor.fetchall())
     
     def execute_query_single(self, query: str, params: Optional[List] = None) -> Optional[Dict]:
         res = self.execute_query(query, params)
@@ -159,32 +275,58 @@ class DatabaseManager:
             print(f"Error getting available dates: {e}")
             return []
     
-    def validate_query(self, query: str) -> bool:
-        """Validate SQL query syntax (SELECT-only)"""
+    def get_latest_date(self) -> Optional[str]:
+        """가장 최근 거래일 (LATEST_DATE_CACHE_SECONDS 동안 재사용, 조회 실패 시 마지막으로 알던 날짜)"""
+        now = time.monotonic()
+        cached = self._latest_date
+        if cached and now - cached[1] < self.config.LATEST_DATE_CACHE_SECONDS:
+            return cached[0]
+        dates = self.get_available_dates(1)
+        if dates:
+            self._latest_date = (str(dates[0]), now)
+            return str(dates[0])
+        return cached[0] if cached else None
+
+    def warm_pool(self, connections: int) -> int:
+        """풀 커넥션을 미리 맺어 둠 (첫 질문이 접속/인증 시간을 기다리지 않도록), 맺은 개수 반환"""
+        if self.engine is None:
+            self.connect()
+        opened = []
         try:
-            q = query.upper().strip()
-            if not q.startswith("SELECT"):
-                return False
-            for kw in ["INSERT", "UPDATE", "DELETE", "DROP", "ALTER", "CREATE", "TRUNCATE"]:
-                if kw in q:
-                    return False
-            if self.connection:
-                cursor = self.connection.cursor()
-                try:
-                    cursor.execute(f"EXPLAIN {query}")
-                    cursor.fetchall()
-                    return True
-                except:
-                    return False
-                finally:
-                    cursor.close()
-            return True
-        except:
-            return False
+            # 동시에 빌려야 서로 다른 커넥션이 만들어짐 (반납하면 풀에 남음)
+            for _ in range(max(1, min(connections, self.config.DB_POOL_SIZE))):
+                opened.append(self.engine.raw_connection())
+        finally:
+            for connection in opened:
+                connection.close()
+        return len(opened)
+
+    def explain(self, query: str) -> List[Dict]:
+        """MySQL EXPLAIN 결과 (실행 계획 행 목록)"""
+        return get_cassette().call("sql", "db.explain", {"query": query}, lambda: self._explain(query))
+
+    def _explain(self, query: str) -> List[Dict]:
+        if self.engine is None:
+            self.connect()
+        with pooled_cursor(self.engine) as cursor:
+            cursor.execute(f"EXPLAIN {query}")
+            return list(cursor.fetchall())
+
+    def execute_generated_query(self, query: str) -> List[Dict]:
+        """LLM이 생성한 SQL을 가드(SELECT 전용, LIMIT/실행 시간 상한, EXPLAIN 예산) 통과 후 실행"""
+        return self.execute_query(self.sql_guard.check(query))
+    
+    def validate_query(self, query: str) -> bool:
+        """Validate SQL query (SELECT-only, known tables, EXPLAIN row budget)"""
+        return self.sql_guard.is_valid(query)
     
     def close_connection(self):
-        if self.connection:
-            self.connection.close()
+        if self.engine is not None:
+            self.engine.dispose()
+            self.engine = None
+        if self.local_engine:
+            self.local_engine.close()
+            self.local_engine = None
     
     def __del__(self):
         self.close_connection()
@@ -0,0 +1,159 @@
+"""
+Digest store
+회사별 일일 뉴스 다이제스트(기사별 요약, 핵심 사실)를 하루 1건씩 구독 저장소와 같은 DB에 저장합니다.
+
+- 일일 알림/대화 중 조회는 오늘 다이제스트가 있으면 재사용하고, 기사 목록이 바뀐 경우에만 다시 요약
+- 주간 보고서는 기사를 다시 조회하지 않고 최근 7일 다이제스트로 LLM 1번 호출, 생성된 보고서도 회사별 하루 1건 저장
+  (API: GET /sessions/{session_id}/weekly-report)
+- NEWS_DIGEST_RETENTION_DAYS가 지난 다이제스트는 주기적으로 삭제
+"""
+
+import json
+import time
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import Column, Double, Integer, MetaData, String, Table, Text, and_, delete, select, update
+
+from config.config import Config
+
+# 오래된 다이제스트 삭제 주기 (초)
+PRUNE_INTERVAL_SECONDS = 3600
+
+_metadata = MetaData()
+
+digests_table = Table(
+    "news_digests", _metadata,
+    Column("company_name", String(128), primary_key=True),
+    Column("digest_date", String(10), primary_key=True),  # YYYY-MM-DD
+    Column("created_at", Double, nullable=False),
+    Column("article_count", Integer, nullable=False),
+    Column("articles", Text, nullable=False),   # [{"title", "link", "summary"}] JSON
+    Column("key_facts", Text, nullable=False),  # ["..."] JSON
+)
+
+weekly_reports_table = Table(
+    "news_weekly_reports", _metadata,
+    Column("company_name", String(128), primary_key=True),
+    Column("report_date", String(10), primary_key=True),  # YYYY-MM-DD
+    Column("created_at", Double, nullable=False),
+    Column("report", Text, nullable=False),
+)
+
+
+class DigestStore:
+    """SQLAlchemy 엔진 위의 일일 다이제스트 저장소 (여러 스레드/프로세스 공유 가능)"""
+
+    def __init__(self, engine, retention_days: Optional[int] = None):
+        self.config = Config()
+        self.engine = engine
+        self.retention_days = self.config.NEWS_DIGEST_RETENTION_DAYS if retention_days is None else retention_days
+        self._last_prune = 0.0
+        self._prune_lock = threading.Lock()
+        _metadata.create_all(engine)
+        from finance_agent.database import widen_float_columns
+        widen_float_columns(engine, digests_table)
+
+    @staticmethod
+    def _to_dict(row) -> Dict:
+        digest = dict(row)
+        digest["articles"] = json.loads(digest["articles"])
+        digest["key_facts"] = json.loads(digest["key_facts"])
+        return digest
+
+    def get(self, company_name: str, digest_date: str) -> Optional[Dict]:
+        with self.engine.connect() as conn:
+            row = conn.execute(select(digests_table).where(and_(
+                digests_table.c.company_name == company_name,
+                digests_table.c.digest_date == digest_date,
+            ))).mappings().first()
+        return self._to_dict(row) if row else None
+
+    def recent(self, company_name: str, days: int = 7, end_date: Optional[str] = None) -> List[Dict]:
+        """end_date(기본 오늘)까지 최근 days일 다이제스트 (날짜순)"""
+        end = datetime.strptime(end_date, "%Y-%m-%d") if end_date else datetime.now()
+        start_date = (end - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(digests_table)
+                .where(and_(
+                    digests_table.c.company_name == company_name,
+                    digests_table.c.digest_date >= start_date,
+                    digests_table.c.digest_date <= end.strftime("%Y-%m-%d"),
+                ))
+                .order_by(digests_table.c.digest_date)
+            ).mappings().all()
+        return [self._to_dict(row) for row in rows]
+
+    def put(self, company_name: str, digest_date: str, articles: List[Dict], key_facts: List[str]) -> Dict:
+        """그날 다이제스트 저장 (이미 있으면 새 내용으로 교체)"""
+        values = {
+            "created_at": time.time(),
+            "article_count": len(articles),
+            "articles": json.dumps(articles, ensure_ascii=False),
+            "key_facts": json.dumps(key_facts, ensure_ascii=False),
+        }
+        key = and_(digests_table.c.company_name == company_name, digests_table.c.digest_date == digest_date)
+        with self.engine.begin() as conn:
+            if conn.execute(update(digests_table).where(key).values(**values)).rowcount == 0:
+                conn.execute(digests_table.insert().values(company_name=company_name, digest_date=digest_date, **values))
+        self._maybe_prune_expired()
+        return {"company_name": company_name, "digest_date": digest_date, **values,
+                "articles": articles, "key_facts": key_facts}
+
+    def touch(self, company_name: str, digest_date: str):
+        """기사 목록이 그대로라 다시 요약하지 않은 경우 확인 시각만 갱신"""
+        with self.engine.begin() as conn:
+            conn.execute(update(digests_table).where(and_(
+                digests_table.c.company_name == company_name,
+                digests_table.c.digest_date == digest_date,
+            )).values(created_at=time.time()))
+
+    def put_weekly_report(self, company_name: str, report: str, report_date: Optional[str] = None) -> Dict:
+        """생성된 주간 보고서 저장 (같은 날 다시 만들면 교체)"""
+        report_date = report_date or datetime.now().strftime("%Y-%m-%d")
+        values = {"created_at": time.time(), "report": report}
+        key = and_(weekly_reports_table.c.company_name == company_name,
+                   weekly_reports_table.c.report_date == report_date)
+        with self.engine.begin() as conn:
+            if conn.execute(update(weekly_reports_table).where(key).values(**values)).rowcount == 0:
+                conn.execute(weekly_reports_table.insert().values(
+                    company_name=company_name, report_date=report_date, **values))
+        self._maybe_prune_expired()
+        return {"company_name": company_name, "report_date": report_date, **values}
+
+    def latest_weekly_report(self, company_name: str) -> Optional[Dict]:
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(weekly_reports_table)
+                .where(weekly_reports_table.c.company_name == company_name)
+                .order_by(weekly_reports_table.c.report_date.desc())
+                .limit(1)
+            ).mappings().first()
+        return dict(row) if row else None
+
+    def prune(self, retention_days: Optional[int] = None) -> int:
+        retention_days = self.retention_days if retention_days is None else retention_days
+        if not retention_days:
+            return 0
+        cutoff = (datetime.now() - timedelta(days=retention_days)).strftime("%Y-%m-%d")
+        with self.engine.begin() as conn:
+            removed = conn.execute(delete(digests_table).where(digests_table.c.digest_date < cutoff)).rowcount
+            removed += conn.execute(
+                delete(weekly_reports_table).where(weekly_reports_table.c.report_date < cutoff)).rowcount
+        return removed
+
+    def _maybe_prune_expired(self):
+        now = time.monotonic()
+        if now - self._last_prune < PRUNE_INTERVAL_SECONDS or not self._prune_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_prune = now
+            removed = self.prune()
+            if removed:
+                print(f"[DigestStore] 오래된 다이제스트 {removed}건 삭제")
+        except Exception as e:
+            print(f"[DigestStore] 오래된 다이제스트 삭제 실패: {e}")
+        finally:
+            self._prune_lock.release()
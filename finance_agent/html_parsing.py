@@ -0,0 +1,271 @@
+"""
+HTML parsing
+뉴스 목록/기사 페이지 파싱 단계. fetch 단계에서 받은 원본 HTML(bytes)을 받아
+작은 레코드(기사 본문 문자열, 목록의 {title, link})만 돌려줍니다.
+
+- lxml(C 파서 + XPath)이 설치되어 있으면 사용하고, 없으면 BeautifulSoup(html.parser)으로 같은 규칙을 적용
+- parse_many(): 페이지가 HTML_PARSE_MIN_POOL_PAGES개 이상이면 프로세스 풀(HTML_PARSE_WORKERS)에 나눠 파싱
+  (백필처럼 수천 페이지를 파싱할 때 GIL에 묶이지 않도록, 풀은 프로세스당 1개를 재사용)
+  작업자가 죽어 풀이 깨지면 풀을 버리고(다음 호출에서 새로 만듦) 그 묶음은 현재 프로세스에서 파싱
+- 인코딩: 명시한 encoding → <meta charset> → utf-8 순
+"""
+
+import os
+import re
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from config.config import Config
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml 미설치 시 BeautifulSoup 사용
+    lxml = None
+
+ARTICLE_BODY_SELECTORS = ["#articleBody", ".article-body", ".news-article", "div.content", ".news_body"]
+# 네이버 뉴스 본문에서 제외하는 영역 (이미지 캡션, 기자 정보)
+ARTICLE_JUNK_CLASSES = ["byline", "img_center_box", "caption"]
+# 본문 fallback(<p> 모음)에 넣는 문단 최소 글자 수
+MIN_PARAGRAPH_CHARS = 30
+
+_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([\w-]+)""", re.IGNORECASE)
+# get_text와 마찬가지로 본문 텍스트에서 제외하는 태그
+_NON_TEXT_TAGS = {"script", "style", "template"}
+
+HtmlInput = Union[bytes, str]
+
+
+def decode_html(html: HtmlInput, encoding: Optional[str] = None) -> str:
+    if isinstance(html, str):
+        return html
+    if encoding is None:
+        match = _CHARSET.search(html[:4096])
+        encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return html.decode(encoding, errors="replace")
+    except LookupError:
+        return html.decode("utf-8", errors="replace")
+
+
+# ----------------- lxml -----------------
+def _css_to_xpath(selector: str) -> str:
+    """ARTICLE_BODY_SELECTORS 형태('#id', '.class', 'tag.class')만 지원"""
+    if selector.startswith("#"):
+        return f"//*[@id='{selector[1:]}']"
+    tag, _, cls = selector.partition(".")
+    return f"//{tag or '*'}[{_has_class(cls)}]"
+
+
+def _has_class(cls: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+_ARTICLE_BODY_XPATHS = [_css_to_xpath(selector) for selector in ARTICLE_BODY_SELECTORS]
+_JUNK_XPATH = ".//*[" + " or ".join(_has_class(cls) for cls in ARTICLE_JUNK_CLASSES) + "]"
+# 헤드라인 목록 → 일반 목록 순
+_LIST_ITEMS_XPATHS = [f"//ul[{_has_class('type06_headline')}]//li", f"//ul[{_has_class('type06')}]//li"]
+
+
+def _strings(element, skip: frozenset) -> Iterable[str]:
+    """BeautifulSoup get_text와 같은 순서의 텍스트 조각 (주석, script/style, skip 하위 제외)"""
+    if element.text and element.tag not in _NON_TEXT_TAGS:
+        yield element.text
+    for child in element:
+        if isinstance(child.tag, str) and child not in skip:
+            yield from _strings(child, skip)
+        if child.tail:
+            yield child.tail
+
+
+def _text(element, separator: str = " ", skip: frozenset = frozenset()) -> str:
+    return separator.join(s.strip() for s in _strings(element, skip) if s.strip())
+
+
+def _lxml_root(html: str):
+    try:
+        return lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def _lxml_article(html: str) -> str:
+    root = _lxml_root(html)
+    if root is None:
+        return ""
+
+    content = root.xpath("//*[@id='dic_area']")
+    if content:
+        # drop_tree()는 뒤 텍스트를 앞 텍스트에 붙이므로 제거하지 않고 건너뜀 (get_text와 같은 공백 처리)
+        return _text(content[0], skip=frozenset(content[0].xpath(_JUNK_XPATH)))
+
+    for xpath in _ARTICLE_BODY_XPATHS:
+        found = root.xpath(xpath)
+        if found:
+            return _text(found[0])
+
+    paragraphs = (_text(p) for p in root.iter("p") if len(_text(p, "")) > MIN_PARAGRAPH_CHARS)
+    return " ".join(paragraphs).strip()
+
+
+def _lxml_news_list(html: str) -> List[Dict]:
+    root = _lxml_root(html)
+    if root is None:
+        return []
+
+    items = []
+    for li in [li for xpath in _LIST_ITEMS_XPATHS for li in root.xpath(xpath)]:
+        title, href = None, None
+        img = li.xpath(f".//dt[{_has_class('photo')}]//img")
+        if img and img[0].get("alt") is not None:
+            title = img[0].get("alt").strip()
+            link = li.xpath(f".//dt[{_has_class('photo')}]//a[@href]")
+            if link:
+                href = link[0].get("href")
+
+        if not title or not href:
+            for a in li.xpath(".//dt//a"):
+                t, h = _text(a, ""), a.get("href", "")
+                if t and "n.news.naver.com" in h:
+                    title, href = t, h
+                    break
+        if title and href:
+            items.append({"title": title, "link": href})
+    return items
+
+
+# ----------------- BeautifulSoup (lxml 미설치 시) -----------------
+def _bs4_article(html: str) -> str:
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+
+    content_div = soup.select_one("#dic_area")
+    if content_div:
+        for junk in content_div.find_all(class_=ARTICLE_JUNK_CLASSES):
+            junk.decompose()
+        return content_div.get_text(" ", strip=True)
+
+    for selector in ARTICLE_BODY_SELECTORS:
+        div = soup.select_one(selector)
+        if div:
+            return div.get_text(" ", strip=True)
+
+    paragraphs = soup.select("p")
+    text = " ".join(p.get_text(" ", strip=True) for p in paragraphs if len(p.get_text(strip=True)) > MIN_PARAGRAPH_CHARS)
+    return text.strip()
+
+
+def _bs4_news_list(html: str) -> List[Dict]:
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+
+    items = []
+    for li in soup.select("ul.type06_headline li") + soup.select("ul.type06 li"):
+        title, href = None, None
+        img_tag = li.select_one("dt.photo img")
+        if img_tag and img_tag.has_attr("alt"):
+            title = img_tag["alt"].strip()
+            a_tag = li.select_one("dt.photo a")
+            if a_tag and a_tag.has_attr("href"):
+                href = a_tag["href"]
+
+        if not title or not href:
+            for a in li.select("dt a"):
+                t = a.get_text(strip=True)
+                h = a.get("href", "")
+                if t and "n.news.naver.com" in h:
+                    title, href = t, h
+                    break
+        if title and href:
+            items.append({"title": title, "link": href})
+    return items
+
+
+# ----------------- 공개 API -----------------
+def parse_article_html(html: HtmlInput, encoding: Optional[str] = None) -> str:
+    """기사 HTML에서 본문 텍스트 추출 (네이버 뉴스 #dic_area 우선, 언론사 본문 영역, <p> 순으로 fallback)"""
+    html = decode_html(html, encoding)
+    return _lxml_article(html) if lxml else _bs4_article(html)
+
+
+def parse_news_list_html(html: HtmlInput, encoding: Optional[str] = None) -> List[Dict]:
+    """네이버 뉴스 목록 페이지(경제, 날짜별)에서 [{title, link}] 추출, 빈 목록이면 마지막 페이지를 지난 것"""
+    html = decode_html(html, encoding)
+    return _lxml_news_list(html) if lxml else _bs4_news_list(html)
+
+
+PARSERS: Dict[str, Callable[[HtmlInput], object]] = {
+    "article": parse_article_html,
+    "news_list": parse_news_list_html,
+}
+_EMPTY = {"article": "", "news_list": []}
+
+
+def _parse_one(kind: str, html: HtmlInput):
+    try:
+        return PARSERS[kind](html)
+    except Exception as e:
+        print(f"[html_parsing] {kind} 파싱 실패: {e}")
+        return type(_EMPTY[kind])()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _workers(workers: Optional[int]) -> int:
+    workers = Config.HTML_PARSE_WORKERS if workers is None else workers
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """프로세스 공용 파싱 풀 (작업자 수가 바뀌면 새로 만듦)"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # 스케줄러/API 스레드가 있는 프로세스에서 fork하지 않도록 spawn 사용
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """작업자가 죽어 깨진 풀을 버림 (다음 호출에서 새로 만듦)"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def parse_many(kind: str, pages: Iterable[HtmlInput], workers: Optional[int] = None) -> List:
+    """kind('article' | 'news_list') 페이지들을 파싱해 입력 순서대로 반환 (실패한 페이지는 "" / [])"""
+    if kind not in PARSERS:
+        raise ValueError(f"kind는 {', '.join(PARSERS)} 중 하나여야 합니다: {kind}")
+    pages = list(pages)
+    workers = _workers(workers)
+    if workers <= 1 or len(pages) < Config.HTML_PARSE_MIN_POOL_PAGES:
+        return [_parse_one(kind, page) for page in pages]
+    chunksize = max(1, len(pages) // (workers * 4))
+    pool = _get_pool(workers)
+    try:
+        return list(pool.map(_parse_one, [kind] * len(pages), pages, chunksize=chunksize))
+    except BrokenProcessPool as e:
+        # 작업자 프로세스가 비정상 종료(OOM 등)하면 풀을 버리고 이번 묶음은 현재 프로세스에서 파싱
+        print(f"[html_parsing] 프로세스 풀 오류, 현재 프로세스에서 파싱: {e}")
+        _discard_pool(pool)
+        return [_parse_one(kind, page) for page in pages]
@@ -0,0 +1,48 @@
+"""
+HTTP fetch helper
+기사 본문/URL 요약용 HTTP GET을 한 곳에서 수행 (span 기록, cassette 기록/재생)
+"""
+
+import base64
+from typing import Dict, Optional
+
+import requests
+
+from finance_agent.tracing import get_tracer
+from finance_agent.replay import get_cassette
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+
+def fetch(url: str, timeout: float = 5, headers: Optional[Dict] = None) -> requests.Response:
+    """GET 요청 (상태 코드/응답 크기를 span에 기록, 예외는 호출자에게 전달)"""
+    with get_tracer().span("http.fetch", kind="http", url=url[:200]) as span:
+        res = get_cassette().call(
+            "http", "http.fetch", {"url": url},
+            lambda: requests.get(url, headers=headers or DEFAULT_HEADERS, timeout=timeout),
+            encode=_encode_response,
+            decode=_decode_response,
+            error_type=requests.exceptions.RequestException,
+        )
+        span.set(status=res.status_code, bytes=len(res.content))
+        return res
+
+
+def _encode_response(res: requests.Response) -> Dict:
+    return {
+        "status_code": res.status_code,
+        "url": res.url,
+        "encoding": res.encoding,
+        "headers": {k: v for k, v in res.headers.items() if k.lower() == "content-type"},
+        "content": base64.b64encode(res.content).decode("ascii"),
+    }
+
+
+def _decode_response(data: Dict) -> requests.Response:
+    res = requests.Response()
+    res.status_code = data["status_code"]
+    res.url = data["url"]
+    res.encoding = data["encoding"]
+    res.headers.update(data["headers"])
+    res._content = base64.b64decode(data["content"])
+    return res
@@ -0,0 +1,261 @@
+"""
+Job scheduler
+NewsBot 정기 알림(일일 뉴스 요약, 주간 보고서)용 스케줄러.
+
+- 다음 실행 시각 순 heap + Condition: 다음 작업 시각까지 잠들었다가 작업이 추가/취소되면 바로 깨어남
+  (스케줄 수와 관계없이 대기 중 CPU 사용량 ≈ 0)
+- 작업은 크기가 고정된 작업 스레드 풀(SCHEDULER_WORKERS)에서 실행
+- 같은 작업의 이전 실행이 끝나지 않았으면 이번 실행은 건너뜀 (중복 실행 방지, 일회성 작업은 submit(key=...)로 같은 규칙 적용)
+- SCHEDULER_JOB_TIMEOUT_SECONDS를 넘긴 실행(정기/일회성 모두)은 시간 초과로 기록 (파이썬 스레드는 강제 종료할 수 없으므로
+  작업은 끝까지 실행되고, 끝날 때까지 다음 실행은 건너뜀)
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from config.config import Config
+from finance_agent.tracing import get_tracer
+
+# 시계 변경(NTP 보정, 서머타임 등)에 대비해 최대 이 시간마다 깨어나 다음 실행 시각을 다시 확인
+MAX_SLEEP_SECONDS = 60.0
+
+
+def parse_time_of_day(at: str) -> Tuple[int, int]:
+    """'HH:MM' → (시, 분), 형식이 잘못되면 ValueError"""
+    parsed = datetime.strptime(at, "%H:%M")
+    return parsed.hour, parsed.minute
+
+
+def next_time_of_day(at: str, now: float) -> float:
+    """now 이후 처음 돌아오는 at(HH:MM, 로컬 시각)의 timestamp"""
+    hour, minute = parse_time_of_day(at)
+    candidate = datetime.fromtimestamp(now).replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate.timestamp() <= now:
+        candidate += timedelta(days=1)
+    return candidate.timestamp()
+
+
+class ScheduledJob:
+    """정기 작업 1개 (매일 HH:MM 또는 일정 간격)"""
+
+    def __init__(self, job_id: int, func: Callable, args: tuple, kwargs: dict, tags: Tuple[str, ...],
+                 at: Optional[str] = None, interval: Optional[timedelta] = None, name: str = ""):
+        self.job_id = job_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.tags = frozenset(tags)
+        self.at = at
+        self.interval = interval
+        self.name = name or getattr(func, "__name__", "job")
+        self.next_run: float = 0.0
+        self.last_run: Optional[float] = None
+        self.running = False
+        self.cancelled = False
+
+    def schedule_next(self, now: float):
+        if self.at:
+            self.next_run = next_time_of_day(self.at, now)
+        else:
+            self.next_run = now + self.interval.total_seconds()
+
+    def __repr__(self) -> str:
+        when = f"매일 {self.at}" if self.at else f"{self.interval} 간격"
+        return f"<ScheduledJob {self.name} ({when}) tags={sorted(self.tags)} next={datetime.fromtimestamp(self.next_run):%Y-%m-%d %H:%M}>"
+
+
+class JobScheduler:
+    def __init__(self, max_workers: Optional[int] = None, job_timeout: Optional[float] = None):
+        self.config = Config()
+        self.job_timeout = self.config.SCHEDULER_JOB_TIMEOUT_SECONDS if job_timeout is None else job_timeout
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or self.config.SCHEDULER_WORKERS, thread_name_prefix="scheduler-job"
+        )
+        self._jobs: Dict[int, ScheduledJob] = {}
+        self._heap: List[Tuple[float, int, ScheduledJob]] = []
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        # 실행 중인 작업 key(정기 작업은 job_id) → 시작 시각 / 이름
+        self._running_since: Dict[Hashable, float] = {}
+        self._running_names: Dict[Hashable, str] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    # ----------------- 등록 / 취소 -----------------
+    def every_day_at(self, at: str, func: Callable, *args, tags=(), name: str = "", **kwargs) -> ScheduledJob:
+        """매일 at(HH:MM, 로컬 시각)에 func 실행"""
+        parse_time_of_day(at)
+        return self._add(ScheduledJob(next(self._ids), func, args, kwargs, tuple(tags), at=at, name=name))
+
+    def every(self, interval: timedelta, func: Callable, *args, tags=(), name: str = "", **kwargs) -> ScheduledJob:
+        """지금부터 interval마다 func 실행 (첫 실행은 interval 뒤)"""
+        if interval.total_seconds() <= 0:
+            raise ValueError(f"실행 간격은 0보다 커야 합니다: {interval}")
+        return self._add(ScheduledJob(next(self._ids), func, args, kwargs, tuple(tags), interval=interval, name=name))
+
+    def _add(self, job: ScheduledJob) -> ScheduledJob:
+        job.schedule_next(time.time())
+        with self._cond:
+            self._jobs[job.job_id] = job
+            heapq.heappush(self._heap, (job.next_run, job.job_id, job))
+            # 새 작업이 가장 먼저 실행될 수 있으므로 대기 중인 스케줄러를 깨움
+            self._cond.notify()
+        return job
+
+    def cancel(self, job: ScheduledJob):
+        with self._cond:
+            job.cancelled = True
+            self._jobs.pop(job.job_id, None)
+            self._cond.notify()
+
+    def cancel_tagged(self, *tags: str) -> int:
+        """tags를 모두 가진 작업 취소, 취소한 개수 반환"""
+        wanted = set(tags)
+        with self._cond:
+            matched = [job for job in self._jobs.values() if wanted <= job.tags]
+            for job in matched:
+                job.cancelled = True
+                self._jobs.pop(job.job_id, None)
+            if matched:
+                self._cond.notify()
+        return len(matched)
+
+    @property
+    def jobs(self) -> List[ScheduledJob]:
+        with self._cond:
+            return sorted(self._jobs.values(), key=lambda j: j.next_run)
+
+    # ----------------- 실행 -----------------
+    def submit(self, func: Callable, *args, name: str = "", key: Optional[Hashable] = None, **kwargs) -> Optional[Future]:
+        """일회성 작업을 작업 스레드 풀에서 실행 (수동 보고서 생성, 회사별 알림 생성 등)
+
+        정기 작업과 같이 실행 시간을 SCHEDULER_JOB_TIMEOUT_SECONDS로 감시하고,
+        key가 같은 작업이 아직 실행 중이면 실행하지 않고 None 반환 (중복 실행 방지)
+        """
+        name = name or getattr(func, "__name__", "job")
+        with self._cond:
+            if key is not None and key in self._running_since:
+                get_tracer().metrics.inc("finance_agent_scheduler_skipped_total", name=name, reason="overlap")
+                print(f"[JobScheduler] 이전 실행이 끝나지 않아 건너뜁니다: {name} {key}")
+                return None
+            if key is None:
+                key = ("submit", next(self._ids))
+            self._start(key, name, time.time())
+        try:
+            return self.executor.submit(self._run_submitted, key, name, func, args, kwargs)
+        except RuntimeError:
+            # stop() 뒤에 들어온 작업
+            self._finish(key)
+            raise
+
+    def _start(self, key: Hashable, name: str, now: float):
+        """실행 중으로 등록 (self._cond 안에서 호출), 시간 초과 시각에 맞춰 깨어나도록 스케줄러를 깨움"""
+        self._running_since[key] = now
+        self._running_names[key] = name
+        self._cond.notify()
+
+    def _finish(self, key: Hashable):
+        with self._cond:
+            self._running_since.pop(key, None)
+            self._running_names.pop(key, None)
+
+    def _execute(self, name: str, func: Callable, args: tuple, kwargs: dict):
+        with get_tracer().span(f"job.{name}", kind="job"):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                print(f"[JobScheduler] 작업 실패 ({name}): {e}")
+                raise
+
+    def _run_submitted(self, key: Hashable, name: str, func: Callable, args: tuple, kwargs: dict):
+        try:
+            return self._execute(name, func, args, kwargs)
+        finally:
+            self._finish(key)
+
+    def _run_job(self, job: ScheduledJob):
+        try:
+            self._execute(job.name, job.func, job.args, job.kwargs)
+        except Exception:
+            pass
+        finally:
+            with self._cond:
+                job.running = False
+            self._finish(job.job_id)
+
+    def _dispatch_due(self, now: float):
+        """실행 시각이 된 작업을 풀에 넘기고 다음 실행 시각으로 다시 넣음 (self._cond 안에서 호출)"""
+        while self._heap and self._heap[0][0] <= now:
+            _, _, job = heapq.heappop(self._heap)
+            if job.cancelled:
+                continue
+            if job.running:
+                get_tracer().metrics.inc("finance_agent_scheduler_skipped_total", name=job.name, reason="overlap")
+                print(f"[JobScheduler] 이전 실행이 끝나지 않아 건너뜁니다: {job.name} {sorted(job.tags)}")
+            else:
+                job.running = True
+                job.last_run = now
+                self._start(job.job_id, job.name, now)
+                self.executor.submit(self._run_job, job)
+            job.schedule_next(now)
+            heapq.heappush(self._heap, (job.next_run, job.job_id, job))
+
+    def _check_timeouts(self, now: float):
+        if not self.job_timeout:
+            return
+        for key, started in list(self._running_since.items()):
+            if now - started > self.job_timeout:
+                name = self._running_names.get(key, str(key))
+                get_tracer().metrics.inc("finance_agent_scheduler_timeouts_total", name=name)
+                print(f"[JobScheduler] 작업 시간 초과 ({now - started:.1f}s > {self.job_timeout:g}s): {name}")
+                # 한 번만 기록 (작업이 끝나면 _finish에서 정리)
+                self._running_since[key] = float("inf")
+
+    def _next_wakeup(self, now: float) -> float:
+        wait = MAX_SLEEP_SECONDS
+        if self._heap:
+            wait = min(wait, self._heap[0][0] - now)
+        if self.job_timeout:
+            for started in self._running_since.values():
+                wait = min(wait, started + self.job_timeout - now)
+        return max(0.0, wait)
+
+    def run(self):
+        """다음 작업 시각까지 잠들며 작업을 실행 (stop() 전까지 반환하지 않음)
+
+        이미 다른 스레드에서 실행 중이면 바로 반환하므로 여러 번 호출해도 루프는 하나만 돕니다.
+        """
+        with self._cond:
+            if self._thread is not None and self._thread is not threading.current_thread():
+                return
+            self._thread = threading.current_thread()
+            self._stopped = False
+        try:
+            with self._cond:
+                while not self._stopped:
+                    now = time.time()
+                    self._dispatch_due(now)
+                    self._check_timeouts(now)
+                    self._cond.wait(timeout=self._next_wakeup(now))
+        finally:
+            with self._cond:
+                self._thread = None
+
+    def start(self) -> "JobScheduler":
+        """백그라운드 daemon 스레드에서 run() 시작 (이미 실행 중이면 무시)"""
+        with self._cond:
+            if self._thread is not None:
+                return self
+        threading.Thread(target=self.run, name="job-scheduler", daemon=True).start()
+        return self
+
+    def stop(self, wait: bool = False):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
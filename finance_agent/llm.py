@@ -1,35 +1,139 @@
 
+
+import os
+import json
 import uuid
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Callable, Dict, Optional
 from config.config import Config
-from langchain.schema import BaseOutputParser
-from langchain_naver import ChatClovaX
+from finance_agent.tracing import get_tracer
+from finance_agent.replay import get_cassette
+
+if TYPE_CHECKING:
+    from langchain.schema import BaseOutputParser
+
+# 프로세스 전체 누적 토큰 사용량 (노드별 LLM 인스턴스 합산)
+_usage_lock = threading.Lock()
+_usage_totals = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+# 모델/temperature별 공용 ChatClovaX 클라이언트 (노드마다 LLM()을 만들어도 HTTP 클라이언트는 프로세스당 1개)
+_clients: Dict[tuple, object] = {}
+_clients_lock = threading.Lock()
+# ChatClovaX 대신 사용할 클라이언트 생성 함수 (오프라인 벤치마크용, set_client_factory)
+_client_factory: Optional[Callable[[str, float], object]] = None
+
+
+def get_token_usage() -> Dict[str, int]:
+    """누적 호출 수 / 프롬프트 / 응답 토큰 수"""
+    with _usage_lock:
+        return dict(_usage_totals)
+
+
+def set_client_factory(factory: Optional[Callable[[str, float], object]]):
+    """LLM 클라이언트 생성 함수 교체, 이전 값을 반환
+
+    factory(model_name, temperature)는 invoke(prompt)가 content/usage_metadata를 가진 응답을 돌려주는 객체를 반환.
+    None이면 ChatClovaX. 이미 클라이언트를 만든 LLM 인스턴스에는 적용되지 않습니다.
+    """
+    global _client_factory
+    with _clients_lock:
+        previous, _client_factory = _client_factory, factory
+        _clients.clear()
+    return previous
+
 
 class LLM:
     def __init__(self, model_name="HCX-005", temperature=0.1):
         self.config = Config()
         self.model_name = model_name
         self.temperature = temperature
-        self.llm = self._init_llm()
+        self._client = None
+        self.last_usage: Dict = {}
+
+    @property
+    def llm(self):
+        """ChatClovaX 클라이언트 (langchain_naver import와 생성은 첫 호출 때)"""
+        if self._client is None:
+            self._client = self._init_llm()
+        return self._client
 
     def _init_llm(self):
+        if _client_factory is not None:
+            return _client_factory(self.model_name, self.temperature)
+        from langchain_naver import ChatClovaX
+
         self._clova_host = self.config.CLOVA_HOST
         self._hyperclova_host = "https://" + self.config.CLOVA_HOST
         self._model_endpoint = "/v3/chat-completions/HCX-005"
-        return ChatClovaX(
-            model=self.model_name,
-            temperature=self.temperature,
-            api_key=self.config.CLOVA_API_KEY,
-            default_headers={
-                "X-NCP-CLOVASTUDIO-REQUEST-ID": str(uuid.uuid4())
-            }
-        )
-
-    def run(self, prompt: str, parser: BaseOutputParser = None) -> str:
-        response = self.llm.invoke(prompt)
+        key = (self.model_name, self.temperature)
+        with _clients_lock:
+            if key not in _clients:
+                _clients[key] = ChatClovaX(
+                    model=self.model_name,
+                    temperature=self.temperature,
+                    api_key=self.config.CLOVA_API_KEY,
+                    default_headers={
+                        "X-NCP-CLOVASTUDIO-REQUEST-ID": str(uuid.uuid4())
+                    }
+                )
+            return _clients[key]
+
+    def run(self, prompt: str, parser: "BaseOutputParser" = None, tag: str = "") -> str:
+        with get_tracer().span(f"llm.{tag or 'run'}", kind="llm", model=self.model_name) as span:
+            response = get_cassette().call(
+                "llm", f"llm.{tag or 'run'}",
+                {"model": self.model_name, "temperature": self.temperature, "prompt": prompt},
+                lambda: self.llm.invoke(prompt),
+                encode=self._encode_response,
+                decode=lambda data: SimpleNamespace(**data),
+            )
+            self.last_usage = self._record_usage(response, tag)
+            span.set(prompt_tokens=self.last_usage["prompt_tokens"], completion_tokens=self.last_usage["completion_tokens"])
         if parser:
             return parser.parse(response.content)
         return response.content
 
+    def ping(self) -> str:
+        """짧은 요청 1번으로 ClovaX 연결(TLS)을 미리 맺음 (워밍업용)"""
+        return self.run("ping", tag="warmup")
+
+    @staticmethod
+    def _encode_response(response) -> Dict:
+        """cassette 저장용 (본문과 토큰 사용량만 보관)"""
+        return {
+            "content": response.content,
+            "usage_metadata": dict(getattr(response, "usage_metadata", None) or {}),
+            "response_metadata": {
+                "token_usage": (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+            },
+        }
+
+    def _record_usage(self, response, tag: str) -> Dict:
+        """응답 메타데이터에서 토큰 사용량을 꺼내 누적하고 LLM_USAGE_LOG_PATH에 기록 (span 속성으로도 남음)"""
+        usage = getattr(response, "usage_metadata", None) or {}
+        token_usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+        record = {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "tag": tag,
+            "model": self.model_name,
+            "prompt_tokens": int(usage.get("input_tokens") or token_usage.get("prompt_tokens") or 0),
+            "completion_tokens": int(usage.get("output_tokens") or token_usage.get("completion_tokens") or 0),
+        }
+        with _usage_lock:
+            _usage_totals["calls"] += 1
+            _usage_totals["prompt_tokens"] += record["prompt_tokens"]
+            _usage_totals["completion_tokens"] += record["completion_tokens"]
+
+        if self.config.LLM_USAGE_LOG_ENABLED:
+            path = self.config.LLM_USAGE_LOG_PATH
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with _usage_lock, open(path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            except OSError as e:
+                print(f"[LLM] 토큰 사용량 기록 실패: {e}")
+        return record
+
     def get_llm(self):
         return self.llm
-
@@ -0,0 +1,202 @@
+"""
+In-process analytic engine
+로컬 Parquet 사본 위에서 LLM이 생성한 SELECT를 DuckDB로 실행하는 엔진 (MySQL은 원본 저장소로 유지)
+
+- 사본의 날짜 범위(ParquetStore.coverage) 밖의 날짜를 참조하는 쿼리는 로컬에서 실행하지 않음
+- 결과 칼럼명은 MySQL이 돌려주는 이름으로 맞춤 (ma_VOL_20 → ma_vol_20, count_star() → COUNT(*))
+"""
+
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+import duckdb
+import pandas as pd
+import sqlglot
+from sqlglot import exp
+
+from config.config import Config
+from finance_agent.database import format_rows
+from finance_agent.parquet_store import COVERAGE_FILE, ParquetStore
+from finance_agent.schema import SNAPSHOT_TABLE, EVENTS_TABLE, TABLE_COLUMNS
+
+LOCAL_TABLES = {"krx_stockprice"}
+# LOCAL_TABLES_DIR에 <table>.parquet가 있으면 함께 노출하는 테이블
+# (updater가 일일 업데이트/백필 때 작성, scripts/run_daily_update.py --mode backfill)
+EXTRA_TABLES = (SNAPSHOT_TABLE, EVENTS_TABLE)
+
+# 소문자 칼럼명 → MySQL 스키마 칼럼명 (SELECT * 결과 키를 MySQL과 맞추는 데 사용)
+SCHEMA_COLUMNS = {name.lower(): name for columns in TABLE_COLUMNS.values() for name in columns}
+SCHEMA_COLUMNS.update({"company_name": "company_name", "market": "market"})
+
+_DATE_LITERAL = re.compile(r"['\"](\d{4}-\d{2}-\d{2})['\"]")
+_DATE_SHIFT = re.compile(
+    r"DATE_SUB\(\s*['\"](\d{4}-\d{2}-\d{2})['\"]\s*,\s*INTERVAL\s+'?(\d+)'?\s+(DAY|WEEK|MONTH|YEAR)\s*\)",
+    re.IGNORECASE,
+)
+_SHIFT_UNITS = {"DAY": "days", "WEEK": "weeks", "MONTH": "months", "YEAR": "years"}
+
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN)\s+`?(\w+)`?", re.IGNORECASE)
+_WRITE_KEYWORDS = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|DROP|ALTER|CREATE|TRUNCATE|REPLACE|GRANT|ATTACH|COPY|INSTALL|LOAD|PRAGMA|SET)\b",
+    re.IGNORECASE,
+)
+
+
+def translate_mysql(sql: str) -> str:
+    """LLM이 생성하는 범위의 MySQL 문법을 DuckDB 문법으로 변환"""
+    sql = sql.strip().rstrip(";")
+
+    # MySQL의 "문자열" 리터럴 → '문자열' (DuckDB에서 ""는 식별자)
+    sql = re.sub(r'"([^"]*)"', lambda m: "'" + m.group(1).replace("'", "''") + "'", sql)
+    # `식별자` → "식별자"
+    sql = re.sub(r"`([^`]*)`", r'"\1"', sql)
+
+    # DATE_SUB(x, INTERVAL n DAY) → (x - INTERVAL n DAY), DATE_ADD 동일
+    interval_arg = r"([^,()]+(?:\([^()]*\))?)\s*,\s*INTERVAL\s+'?(-?\d+)'?\s+(\w+)"
+    sql = re.sub(rf"DATE_SUB\(\s*{interval_arg}\s*\)", r"(CAST(\1 AS DATE) - INTERVAL \2 \3)", sql, flags=re.IGNORECASE)
+    sql = re.sub(rf"DATE_ADD\(\s*{interval_arg}\s*\)", r"(CAST(\1 AS DATE) + INTERVAL \2 \3)", sql, flags=re.IGNORECASE)
+
+    sql = re.sub(r"\bCURDATE\(\s*\)", "current_date", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bDATE_FORMAT\(", "strftime(", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bSTR_TO_DATE\(", "strptime(", sql, flags=re.IGNORECASE)
+
+    # LIMIT offset, count → LIMIT count OFFSET offset
+    sql = re.sub(r"\bLIMIT\s+(\d+)\s*,\s*(\d+)", r"LIMIT \2 OFFSET \1", sql, flags=re.IGNORECASE)
+    return sql
+
+
+def referenced_dates(sql: str) -> List[str]:
+    """쿼리가 참조하는 날짜 (날짜 리터럴 + DATE_SUB('YYYY-MM-DD', INTERVAL n 단위)로 당겨진 시작일)"""
+    dates = _DATE_LITERAL.findall(sql)
+    for date, n, unit in _DATE_SHIFT.findall(sql):
+        shifted = pd.Timestamp(date) - pd.DateOffset(**{_SHIFT_UNITS[unit.upper()]: int(n)})
+        dates.append(shifted.strftime("%Y-%m-%d"))
+    return dates
+
+
+def mysql_column_names(sql: str, columns: List[str]) -> List[str]:
+    """DuckDB 결과 칼럼명 → MySQL이 같은 쿼리에 돌려주는 칼럼명
+
+    별칭은 그대로, 칼럼 참조는 쿼리에 쓴 이름, 그 밖의 식은 MySQL 표기(COUNT(*), AVG(close)),
+    SELECT *로 펼쳐진 칼럼은 스키마 칼럼명(소문자)
+    """
+    try:
+        select = sqlglot.parse_one(sql, read="mysql")
+    except sqlglot.errors.ParseError:
+        select = None
+    while isinstance(select, exp.Union):
+        select = select.left
+    projections = select.expressions if isinstance(select, exp.Select) else []
+    has_star = any(isinstance(p, exp.Star) or (isinstance(p, exp.Column) and isinstance(p.this, exp.Star))
+                   for p in projections)
+    if not projections or has_star or len(projections) != len(columns):
+        return [SCHEMA_COLUMNS.get(col.lower(), col) for col in columns]
+
+    names = []
+    for projection in projections:
+        if isinstance(projection, exp.Alias):
+            names.append(projection.alias)
+        elif isinstance(projection, exp.Column):
+            names.append(projection.name)
+        else:
+            names.append(projection.sql(dialect="mysql"))
+    return names
+
+
+class LocalQueryEngine:
+    """Parquet 사본(year/month 파티션)을 krx_stockprice 뷰로 노출하는 DuckDB 엔진"""
+
+    def __init__(self, parquet_dir: Optional[str] = None, tables_dir: Optional[str] = None):
+        self.config = Config()
+        self.parquet_dir = parquet_dir or self.config.PARQUET_DIR
+        self.tables_dir = tables_dir or self.config.LOCAL_TABLES_DIR
+        self.tables = set(LOCAL_TABLES)
+        self._coverage: Optional[Tuple[str, str]] = None
+        self._coverage_mtime: Optional[float] = None
+        self.con = duckdb.connect(database=":memory:")
+        self.con.execute(f"SET threads TO {self.config.LOCAL_ENGINE_THREADS}")
+        self._create_views()
+
+    def _create_views(self):
+        parquet_glob = os.path.join(self.parquet_dir, "*", "*", "*.parquet").replace("'", "''")
+        self.con.execute(f"""
+            CREATE OR REPLACE VIEW krx_stockprice_raw AS
+            SELECT * EXCLUDE (year, month) REPLACE (CAST(date AS DATE) AS date),
+                CASE WHEN ticker LIKE '%.KS' THEN 'KOSPI'
+                     WHEN ticker LIKE '%.KQ' THEN 'KOSDAQ'
+                     ELSE 'KONEX' END AS market
+            FROM read_parquet('{parquet_glob}', hive_partitioning = true)
+        """)
+        # MySQL 테이블과 같이 company_name 칼럼 제공
+        tickers_csv = "./data/krx_tickers.csv"
+        if os.path.exists(tickers_csv):
+            self.con.execute(f"""
+                CREATE OR REPLACE VIEW krx_stockprice AS
+                SELECT p.*, t."회사명" AS company_name
+                FROM krx_stockprice_raw p
+                LEFT JOIN read_csv_auto('{tickers_csv}', header = true) t USING (ticker)
+            """)
+        else:
+            self.con.execute("CREATE OR REPLACE VIEW krx_stockprice AS SELECT * FROM krx_stockprice_raw")
+
+        for table in EXTRA_TABLES:
+            path = os.path.join(self.tables_dir, f"{table}.parquet") if self.tables_dir else ""
+            if path and os.path.exists(path):
+                self.con.execute(f"""
+                    CREATE OR REPLACE VIEW {table} AS
+                    SELECT * REPLACE (CAST(date AS DATE) AS date) FROM read_parquet('{path.replace("'", "''")}')
+                """)
+                self.tables.add(table)
+
+    def is_available(self) -> bool:
+        """로컬 사본에 데이터가 있는지 확인"""
+        return os.path.isdir(self.parquet_dir) and any(
+            f.endswith(".parquet") for _, _, files in os.walk(self.parquet_dir) for f in files
+        )
+
+    def coverage(self) -> Optional[Tuple[str, str]]:
+        """사본의 (최소 날짜, 최대 날짜), 일일 업데이트/백필이 범위를 넓히면 다음 조회부터 반영"""
+        try:
+            mtime = os.path.getmtime(os.path.join(self.parquet_dir, COVERAGE_FILE))
+        except OSError:
+            mtime = None
+        if self._coverage is None or mtime != self._coverage_mtime:
+            self._coverage = ParquetStore(self.parquet_dir).coverage()
+            self._coverage_mtime = mtime
+        return self._coverage
+
+    def covers(self, query: str) -> bool:
+        """쿼리가 참조하는 날짜가 모두 사본의 날짜 범위 안인지 확인"""
+        coverage = self.coverage()
+        if coverage is None:
+            return False
+        start, end = coverage
+        return all(start <= date <= end for date in referenced_dates(query))
+
+    def can_execute(self, query: str) -> bool:
+        """로컬에서 실행 가능한 읽기 전용 쿼리인지 확인 (로컬에 있는 테이블만 참조하고 사본 날짜 범위 안인 SELECT)"""
+        q = query.strip().upper()
+        if not (q.startswith("SELECT") or q.startswith("WITH")):
+            return False
+        if _WRITE_KEYWORDS.search(query):
+            return False
+        tables = {t.lower() for t in _TABLE_REF.findall(query)}
+        cte_names = {c.lower() for c in re.findall(r"\b(\w+)\s+AS\s*\(", query, re.IGNORECASE)}
+        if not (bool(tables) and (tables - cte_names) <= self.tables):
+            return False
+        # MySQL로 보낼 수 없으면 범위 밖이라도 로컬에서 실행
+        return self.covers(query) or not self.config.LOCAL_ENGINE_MYSQL_FALLBACK
+
+    def execute(self, query: str) -> List[Dict]:
+        # 커서는 스레드별 독립 연결이므로 동시 요청에서도 안전
+        cursor = self.con.cursor()
+        try:
+            cursor.execute(translate_mysql(query))
+            columns = mysql_column_names(query, [d[0] for d in cursor.description])
+            return format_rows(dict(zip(columns, row)) for row in cursor.fetchall())
+        finally:
+            cursor.close()
+
+    def close(self):
+        self.con.close()
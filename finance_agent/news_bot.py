@@ -1,29 +1,56 @@
 # finance_agent/news_bot.py (이 코드로 파일 전체를 교체하세요)
 
-import schedule
 import time
 import threading
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 
+from config.config import Config
+from finance_agent.digest_store import DigestStore
+from finance_agent.job_scheduler import JobScheduler
 from finance_agent.llm import LLM
-from finance_agent.news_db_manager import NewsDatabaseManager
-from finance_agent.prompts import news_summary_prompt, weekly_report_prompt
+from finance_agent.parsers import extract_json_from_response
+from finance_agent.prompts import daily_digest_prompt, weekly_report_prompt
+from finance_agent.resources import get_news_db
+from finance_agent.subscription_store import KINDS, create_subscription_store
+from finance_agent.tracing import get_tracer
 
 class NewsBot:
     def __init__(self):
+        self.config = Config()
         self.llm = LLM()
-        self.news_db = NewsDatabaseManager()
-        self.scheduler = schedule.Scheduler()
+        self.scheduler = JobScheduler()
         self.conversation_state = {}
 
+        # 구독은 DB에 저장하고, 주기적으로 실행 시각이 된 구독만 읽어 회사별로 묶어 처리
+        # → 같은 회사를 구독하는 세션이 많아도 뉴스 조회/본문 수집/LLM 요약은 1번, 재시작해도 구독 유지
+        self.subscriptions = create_subscription_store()
+        self.scheduler.every(timedelta(seconds=self.config.NEWS_DISPATCH_INTERVAL_SECONDS), self._dispatch_due,
+                             tags=('news_dispatch',), name="news_dispatch")
+        # 회사별 하루 1건 다이제스트 (시각이 다른 구독/대화 중 조회/주간 보고서가 재사용)
+        self.digests = DigestStore(self.subscriptions.engine)
+        # company_name → [lock, 사용 중인 요청 수], 사용하는 요청이 없어지면 제거
+        self._digest_locks: Dict[str, List] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def news_db(self):
+        """뉴스 DB는 첫 조회 때 생성 (스케줄 대화만 할 때는 selenium/pandas를 불러오지 않음)"""
+        return get_news_db()
+
     def _get_session_state(self, session_id: str):
         if session_id not in self.conversation_state:
             self.conversation_state[session_id] = {
-                "schedules": [],
                 "current_task": None
             }
         return self.conversation_state[session_id]
 
+    def forget_session(self, session_id: str):
+        """세션이 만료/제거되면 대화 상태 정리 (등록된 스케줄은 구독 저장소에 남음)"""
+        self.conversation_state.pop(session_id, None)
+
     def start_conversation(self, session_id):
         session_state = self._get_session_state(session_id)
         session_state["current_task"] = {"step": "awaiting_company_name"}
@@ -31,7 +58,7 @@ class NewsBot:
 
     def start_cancellation(self, session_id: str):
         session_state = self._get_session_state(session_id)
-        schedules = session_state.get("schedules", [])
+        schedules = self.list_schedules(session_id)
         if not schedules:
             session_state["current_task"] = None
             return "현재 등록된 스케줄이 없습니다."
@@ -49,8 +76,7 @@ class NewsBot:
             return f"어떤 스케줄을 취소하시겠습니까? 번호를 입력해주세요.\n{options}"
 
     def show_schedules(self, session_id: str) -> str:
-        session_state = self._get_session_state(session_id)
-        schedules_list = session_state.get("schedules", [])
+        schedules_list = self.list_schedules(session_id)
         if not schedules_list:
             return "현재 등록된 스케줄이 없습니다."
         report_list = ["현재 등록된 알림 목록입니다:"]
@@ -63,7 +89,7 @@ class NewsBot:
     def trigger_weekly_report(self, session_id: str):
         """테스트를 위해 주간 보고서를 즉시 실행합니다."""
         session_state = self._get_session_state(session_id)
-        schedules = session_state.get("schedules", [])
+        schedules = self.list_schedules(session_id)
         
         if not schedules:
             return "먼저 뉴스 스케줄링을 등록해야 테스트할 수 있습니다."
@@ -89,7 +115,7 @@ class NewsBot:
         # ... (awaiting_company_name, awaiting_schedule_time 로직은 동일) ...
         if step == "awaiting_company_name":
             task["company_name"] = user_input.strip()
-            summary, news_found = self._fetch_and_summarize_latest_news(task["company_name"])
+            summary, news_found = self._company_digest(task["company_name"])
             if not news_found:
                 session_state["current_task"] = None
                 return summary
@@ -104,9 +130,11 @@ class NewsBot:
             if len(schedule_time_str) == 2: schedule_time_str += ":00"
             elif len(schedule_time_str) == 4: schedule_time_str = f"{schedule_time_str[:2]}:{schedule_time_str[2:]}"
             else: return "시간 형식이 올바르지 않습니다. '09:00', '14:30' 와 같이 입력해주세요."
+            try:
+                self.add_schedule(session_id, task["company_name"], schedule_time_str)
+            except ValueError:
+                return "시간 형식이 올바르지 않습니다. '09:00', '14:30' 와 같이 입력해주세요."
             task["schedule_time"] = schedule_time_str
-            session_state["schedules"].append({"company_name": task["company_name"], "schedule_time": task["schedule_time"]})
-            self._schedule_jobs(session_id, task["company_name"], task["schedule_time"])
             session_state["current_task"] = None
             return f"알겠습니다. 매일 {task['schedule_time']}에 {task['company_name']} 뉴스를 보내드릴게요."
 
@@ -114,7 +142,7 @@ class NewsBot:
         elif step == "awaiting_cancellation_choice":
             try:
                 choice_idx = int(user_input) - 1
-                schedules = session_state["schedules"]
+                schedules = self.list_schedules(session_id)
                 if 0 <= choice_idx < len(schedules):
                     company_to_cancel = schedules[choice_idx]["company_name"]
                     task["step"] = "awaiting_cancellation_confirmation"
@@ -125,8 +153,7 @@ class NewsBot:
         elif step == "awaiting_cancellation_confirmation":
             company_to_cancel = task.get("company_to_cancel")
             if user_input.lower() in ['네', '예', '응', '맞아']:
-                self.scheduler.clear(company_to_cancel)
-                session_state["schedules"] = [s for s in session_state["schedules"] if s["company_name"] != company_to_cancel]
+                self.cancel_schedule(session_id, company_to_cancel)
                 session_state["current_task"] = None
                 return f"'{company_to_cancel}' 뉴스의 정기 알림이 취소되었습니다."
             else:
@@ -137,7 +164,7 @@ class NewsBot:
         elif step == "awaiting_report_test_choice":
             try:
                 choice_idx = int(user_input) - 1
-                schedules = session_state["schedules"]
+                schedules = self.list_schedules(session_id)
                 if 0 <= choice_idx < len(schedules):
                     company_to_test = schedules[choice_idx]["company_name"]
                     self._send_weekly_report(session_id, company_name=company_to_test)
@@ -150,54 +177,237 @@ class NewsBot:
         
         return "알 수 없는 작업 단계입니다. 다시 시도해주세요."
 
-    # ... 이하 _fetch_and_summarize_latest_news, _schedule_jobs, _send_daily_summary, 
-    # _generate_and_print_daily_summary, _send_weekly_report, 
-    # _generate_and_print_weekly_report, run_scheduler 함수들은 이전과 동일합니다 ...
-    def _fetch_and_summarize_latest_news(self, company_name: str):
-        today_str = datetime.now().strftime("%Y-%m-%d")
-        news_list = self.news_db.search_news(keywords=[company_name], date=today_str, limit=1)
-        if not news_list:
-            return "관련 뉴스를 찾지 못했습니다.", False
-        latest_news = news_list[0]
-        title, url = latest_news.get("title", "제목 없음"), latest_news.get("link", "")
-        content = latest_news.get("content") or self.news_db._fetch_news_content(url)
-        if not content:
-            return f"'{title}' 뉴스의 본문 내용을 가져올 수 없어 요약에 실패했습니다.", False
-        prompt_text = news_summary_prompt.format(title=title, content=content, url=url)
-        summary = self.llm.run(prompt_text)
-        return f"{summary}\n출처: {url}", True
-
-    def _schedule_jobs(self, session_id: str, company_name: str, schedule_time: str):
-        self.scheduler.every().day.at(schedule_time).do(self._send_daily_summary, session_id=session_id, company_name=company_name).tag(session_id, company_name, 'daily')
-        self.scheduler.every(7).days.do(self._send_weekly_report, session_id=session_id, company_name=company_name).tag(session_id, company_name, 'weekly')
+    # ----------------- 스케줄 등록/취소 (대화 흐름과 API 공용) -----------------
+    def list_schedules(self, session_id: str) -> List[Dict]:
+        schedules = []
+        for row in self.subscriptions.list(session_id):
+            entry = {"company_name": row["company_name"], "schedule_time": row["schedule_time"]}
+            for kind in KINDS:
+                if row[f"last_{kind}_status"]:
+                    entry[f"last_{kind}"] = self._delivery(row, kind)
+            schedules.append(entry)
+        return schedules
+
+    def add_schedule(self, session_id: str, company_name: str, schedule_time: str) -> Dict:
+        """매일 schedule_time(HH:MM)에 뉴스 요약, 7일마다 주간 보고서 (시간 형식이 잘못되면 ValueError)"""
+        datetime.strptime(schedule_time, "%H:%M")
+        # 같은 회사를 다시 등록하면 시간만 바꿈
+        entry = self.subscriptions.upsert(session_id, company_name, schedule_time)
         print(f"[{session_id}-{company_name}] 다음 작업 스케줄링됨: Daily @ {schedule_time}")
-    
+        return entry
+
+    def cancel_schedule(self, session_id: str, company_name: str) -> bool:
+        """이 세션의 company_name 알림만 취소 (다른 세션의 같은 회사 알림은 유지)"""
+        return self.subscriptions.remove(session_id=session_id, company_name=company_name) > 0
+
+    def last_delivery(self, session_id: str, company_name: str, kind: str = "daily") -> Optional[Dict]:
+        row = self.subscriptions.get(session_id, company_name)
+        if not row or not row[f"last_{kind}_status"]:
+            return None
+        return self._delivery(row, kind)
+
+    def latest_weekly_report(self, company_name: str) -> Optional[Dict]:
+        """가장 최근에 생성된 company_name 주간 보고서 (없으면 None)"""
+        stored = self.digests.latest_weekly_report(company_name)
+        if not stored:
+            return None
+        return {
+            "report_date": stored["report_date"],
+            "created_at": datetime.fromtimestamp(stored["created_at"]).isoformat(timespec="seconds"),
+            "report": stored["report"],
+        }
+
+    @staticmethod
+    def _delivery(row: Dict, kind: str) -> Dict:
+        return {
+            "status": row[f"last_{kind}_status"],
+            "delivered_at": datetime.fromtimestamp(row[f"last_{kind}_at"]).isoformat(timespec="seconds"),
+        }
+
+    # ----------------- 실행 시각이 된 구독 처리 -----------------
+    def _dispatch_due(self):
+        """실행 시각이 된 구독을 batch 단위로 읽어 회사별로 묶고, 회사마다 1번만 생성해 구독자 모두에게 전달
+
+        메모리에는 이번에 실행할 구독의 session_id만 올라오고 전체 구독은 읽지 않음
+        """
+        now = time.time()
+        for kind in KINDS:
+            due: Dict[str, List[str]] = defaultdict(list)
+            missed: Dict[str, List[str]] = defaultdict(list)
+            while True:
+                rows = self.subscriptions.due(kind, now)
+                for row in self.subscriptions.claim(kind, rows, now):
+                    target = missed if self.subscriptions.is_missed(kind, row, now) else due
+                    target[row["company_name"]].append(row["session_id"])
+                if len(rows) < self.config.NEWS_DISPATCH_BATCH_SIZE:
+                    break
+            for company_name, session_ids in missed.items():
+                self.subscriptions.record(kind, company_name, session_ids, "missed", now)
+            if missed:
+                print(f"[NewsBot] 중단 중 놓친 {kind} 알림 {sum(map(len, missed.values()))}건을 건너뜁니다.")
+            # 회사별 생성은 작업 스레드 풀에서 병렬로 실행
+            # 같은 (종류, 회사)의 이전 생성이 아직 실행 중이면 이번 구독자는 건너뜀으로 기록 (작업이 쌓이지 않도록)
+            if kind == "daily":
+                generate, name = self._generate_and_print_daily_summary, "daily_summary"
+            else:
+                generate, name = self._generate_and_print_weekly_report, "weekly_report"
+            for company_name, session_ids in due.items():
+                if self.scheduler.submit(generate, company_name, session_ids, name=name, key=(kind, company_name)) is None:
+                    self._deliver(session_ids, company_name, kind, "skipped")
+
+    def _deliver(self, session_ids: List[str], company_name: str, kind: str, status: str):
+        """같은 결과를 구독 세션마다 전달 상태로 기록"""
+        self.subscriptions.record(kind, company_name, session_ids, status)
+        get_tracer().metrics.inc("finance_agent_news_deliveries_total", len(session_ids), kind=kind, status=status)
+
+    # ----------------- 뉴스 요약 / 보고서 생성 -----------------
+    def _summarize_articles(self, company_name: str, digest_date: str, news_list: List[Dict],
+                            previous: Optional[Dict] = None) -> Dict:
+        """새 기사 본문만 모아 LLM 1번으로 기사별 요약 + 핵심 사실을 만들고 그날 다이제스트로 저장
+
+        previous(그날 이미 저장된 다이제스트)에 있는 기사는 요약을 그대로 재사용
+        """
+        known = {a["link"]: a for a in previous["articles"]} if previous else {}
+        articles = []
+        for news in news_list:
+            url = news.get("link", "")
+            if url in known:
+                continue
+            content = news.get("content") or self.news_db._fetch_news_content(url)
+            if content:
+                articles.append({"title": news.get("title", "제목 없음"), "link": url,
+                                 "content": content[:self.config.NEWS_DIGEST_ARTICLE_CHARS]})
+        if not articles:
+            return previous or {}
+        prompt_text = daily_digest_prompt.format(
+            company_name=company_name,
+            date=digest_date,
+            articles="\n\n".join(
+                f"[기사 {i}] {a['title']}\n{a['content']}" for i, a in enumerate(articles, start=1)
+            ),
+        )
+        response = self.llm.run(prompt_text, tag="daily_digest")
+        try:
+            parsed = extract_json_from_response(response)
+        except ValueError:
+            parsed = {}
+        summaries = {item.get("index"): item.get("summary", "") for item in parsed.get("articles", []) if isinstance(item, dict)}
+        if not summaries:
+            # JSON 형식이 아니면 응답 전체를 첫 기사 요약으로 사용
+            summaries = {1: str(response).strip()}
+        get_tracer().metrics.inc("finance_agent_news_digests_total", kind="daily")
+        summarized = {
+            a["link"]: {"title": a["title"], "link": a["link"], "summary": summaries.get(i, "")}
+            for i, a in enumerate(articles, start=1)
+        }
+        key_facts = [str(fact) for fact in parsed.get("key_facts", [])]
+        if previous:
+            key_facts += [fact for fact in previous["key_facts"] if fact not in key_facts]
+        merged = {**known, **summarized}
+        links = [n.get("link", "") for n in news_list]
+        return self.digests.put(company_name, digest_date, [merged[l] for l in links if l in merged], key_facts[:5])
+
+    @staticmethod
+    def _render_digest(digest: Dict) -> str:
+        lines = []
+        for article in digest["articles"]:
+            lines.append(f"📌 {article['title']}")
+            if article["summary"]:
+                lines.append(article["summary"])
+            lines.append(f"출처: {article['link']}")
+        if digest["key_facts"]:
+            lines.append("\n핵심 사실:")
+            lines.extend(f"- {fact}" for fact in digest["key_facts"])
+        return "\n".join(lines)
+
+    @contextmanager
+    def _digest_lock(self, company_name: str):
+        """회사별 다이제스트 lock (기다리는 요청이 없으면 제거해 조회한 회사 수만큼 lock이 쌓이지 않도록)"""
+        with self._lock:
+            entry = self._digest_locks.setdefault(company_name, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._digest_locks[company_name]
+
+    def _company_digest(self, company_name: str) -> Tuple[str, bool]:
+        """회사별 오늘 뉴스 다이제스트 (같은 회사를 동시에 요청하면 한 번만 계산하고 나머지는 결과를 기다림)
+
+        저장된 오늘 다이제스트가 NEWS_DIGEST_CACHE_SECONDS 안에 만들어졌으면 그대로 쓰고,
+        지났으면 기사 목록만 다시 조회해 바뀐 경우에만 다시 요약
+        """
+        today_str = datetime.now().strftime("%Y-%m-%d")
+        with self._digest_lock(company_name):
+            stored = self.digests.get(company_name, today_str)
+            if stored and time.time() - stored["created_at"] < self.config.NEWS_DIGEST_CACHE_SECONDS:
+                return self._render_digest(stored), True
+            news_list = self.news_db.search_news(keywords=[company_name], date=today_str,
+                                                 limit=self.config.NEWS_DIGEST_ARTICLES)
+            if not news_list:
+                return "관련 뉴스를 찾지 못했습니다.", False
+            if stored and [a["link"] for a in stored["articles"]] == [n.get("link", "") for n in news_list]:
+                self.digests.touch(company_name, today_str)
+                return self._render_digest(stored), True
+            digest = self._summarize_articles(company_name, today_str, news_list, previous=stored)
+            if not digest:
+                return f"'{news_list[0].get('title', '제목 없음')}' 뉴스의 본문 내용을 가져올 수 없어 요약에 실패했습니다.", False
+            return self._render_digest(digest), True
+
     def _send_daily_summary(self, session_id: str, company_name: str):
-        threading.Thread(target=self._generate_and_print_daily_summary, args=(session_id, company_name)).start()
+        self.scheduler.submit(self._generate_and_print_daily_summary, company_name, [session_id], name="daily_summary")
 
-    def _generate_and_print_daily_summary(self, session_id: str, company_name: str):
-        print(f"\n\n🤖 [자동 알림] {company_name}의 오늘의 뉴스 요약입니다.")
-        summary, found = self._fetch_and_summarize_latest_news(company_name)
-        print(summary if found else "현재 시간 기준으로 새로운 뉴스가 없습니다.")
+    def _generate_and_print_daily_summary(self, company_name: str, session_ids: List[str]):
+        print(f"\n\n🤖 [자동 알림] {company_name}의 오늘의 뉴스 요약입니다. (구독 {len(session_ids)}명)")
+        try:
+            summary, found = self._company_digest(company_name)
+            message, status = (summary, "delivered") if found else ("현재 시간 기준으로 새로운 뉴스가 없습니다.", "no_news")
+        except Exception as e:
+            message, status = f"뉴스 요약 생성에 실패했습니다: {e}", "failed"
+        print(message)
         print("\n🧑: ", end="")
+        self._deliver(session_ids, company_name, "daily", status)
 
     def _send_weekly_report(self, session_id: str, company_name: str):
-        threading.Thread(target=self._generate_and_print_weekly_report, args=(session_id, company_name)).start()
-
-    def _generate_and_print_weekly_report(self, session_id: str, company_name: str):
-        print(f"\n\n- - - - -\n🤖 [주간 보고서] 지난 7일간 {company_name}의 뉴스 동향입니다.")
-        start_date = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        news_list = self.news_db.search_news(keywords=[company_name], start_date=start_date, end_date=end_date, limit=5)
-        if not news_list:
-            print("지난 7일간 요약할 뉴스가 없습니다.")
-        else:
-            news_for_report = [f"- 제목: {news['title']}\n- 내용: {news.get('content', '')[:200]}..." for news in news_list]
-            prompt = weekly_report_prompt.format(company_name=company_name, news_articles="\n".join(news_for_report))
-            report = self.llm.run(prompt)
-            print(report)
+        self.scheduler.submit(self._generate_and_print_weekly_report, company_name, [session_id], name="weekly_report")
+
+    def _build_weekly_report(self, company_name: str) -> Tuple[str, bool]:
+        """기사를 다시 조회하지 않고 최근 7일 다이제스트로 보고서 작성 (LLM 1번)"""
+        digests = self.digests.recent(company_name, days=7)
+        if not digests:
+            # 아직 쌓인 다이제스트가 없으면 오늘 것만이라도 만들어 사용
+            self._company_digest(company_name)
+            digests = self.digests.recent(company_name, days=7)
+        if not digests:
+            return "지난 7일간 요약할 뉴스가 없습니다.", False
+        days = []
+        for digest in digests:
+            lines = [f"[{digest['digest_date']}]"]
+            lines.extend(f"- {a['title']}: {a['summary']}" if a["summary"] else f"- {a['title']}"
+                         for a in digest["articles"])
+            lines.extend(f"- 핵심 사실: {fact}" for fact in digest["key_facts"])
+            days.append("\n".join(lines))
+        prompt = weekly_report_prompt.format(company_name=company_name, news_articles="\n\n".join(days))
+        get_tracer().metrics.inc("finance_agent_news_digests_total", kind="weekly")
+        return self.llm.run(prompt, tag="weekly_report"), True
+
+    def _generate_and_print_weekly_report(self, company_name: str, session_ids: List[str]):
+        print(f"\n\n- - - - -\n🤖 [주간 보고서] 지난 7일간 {company_name}의 뉴스 동향입니다. (구독 {len(session_ids)}명)")
+        try:
+            report, found = self._build_weekly_report(company_name)
+            status = "delivered" if found else "no_news"
+            if found:
+                self.digests.put_weekly_report(company_name, report)
+        except Exception as e:
+            report, status = f"주간 보고서 생성에 실패했습니다: {e}", "failed"
+        print(report)
         print("\n- - - - -\n\n🧑: ", end="")
+        self._deliver(session_ids, company_name, "weekly", status)
 
     def run_scheduler(self):
-        while True:
-            self.scheduler.run_pending()
+        """다음 알림 시각까지 잠들며 작업 실행 (이미 다른 스레드에서 실행 중이면 바로 반환)"""
+        self.scheduler.run()
@@ -5,16 +5,25 @@ from collections import Counter
 
 import pymysql
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 from sqlalchemy import create_engine, text
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
-
 from config.config import Config
+from finance_agent.database import create_mysql_engine, pooled_cursor, format_rows
+from finance_agent.html_parsing import parse_article_html, parse_many
+from finance_agent.http_client import fetch
+from finance_agent.tracing import get_tracer
+from finance_agent.replay import get_cassette
+
+
+KEYWORD_STOPWORDS = {'그리고','하지만','그래서','때문에','있다','하다','되다','않다','수','것','들','등'}
+
+
+def extract_top_keywords(titles, top_n: int = 5) -> List[str]:
+    """뉴스 제목 목록에서 빈도 상위 키워드"""
+    text = ' '.join(titles)
+    words = re.sub(r'[^가-힣a-zA-Z0-9\s]', '', text).split()
+    counter = Counter([w for w in words if w not in KEYWORD_STOPWORDS and len(w) > 1])
+    return [w for w, _ in counter.most_common(top_n)]
 
 
 class NewsDatabaseManager:
@@ -22,57 +31,64 @@ class NewsDatabaseManager:
     
     def __init__(self):
         self.config = Config()
-        self.connection = None
         self.engine = None
+        # 풀만 만들고 실제 접속은 첫 조회 때 (replay 모드에서는 접속하지 않음)
         self.connect()
     
     # ----------------- 연결 -----------------
     def connect(self):
+        if self.config.NEWS_DB_URL:
+            # SQLAlchemy URL을 직접 지정한 경우 (로컬 대체 DB 등) 조회는 engine으로만 수행
+            self.engine = create_engine(self.config.NEWS_DB_URL)
+            return
         try:
-            self.connection = pymysql.connect(
-                host=self.config.MYSQL_HOST,
-                port=self.config.MYSQL_PORT,
-                user=self.config.MYSQL_USER,
-                password=self.config.MYSQL_PASSWORD,
-                database=self.config.MYSQL_DATABASE2,
-                charset="utf8mb4",
-            )
-            self.engine = create_engine(
-                f"mysql+pymysql://{self.config.MYSQL_USER}:{self.config.MYSQL_PASSWORD}"
-                f"@{self.config.MYSQL_HOST}:{self.config.MYSQL_PORT}/{self.config.MYSQL_DATABASE2}"
-            )
+            # execute_query(pymysql cursor)와 pd.read_sql이 같은 커넥션 풀을 공유
+            self.engine = create_mysql_engine(self.config.MYSQL_DATABASE2)
         except Exception as e:
             print(f"[NewsDatabaseManager] DB 연결 실패: {e}")
             raise e
 
     # ----------------- 공통 SELECT -----------------
     def execute_query(self, query: str, params: Optional[List] = None) -> List[Dict]:
-        if not self.connection:
+        with get_tracer().span("news_db.execute_query", kind="sql", backend="mysql") as span:
+            rows = get_cassette().call(
+                "sql", "news_db.execute_query", {"query": query, "params": params},
+                lambda: self._execute_query(query, params),
+            )
+            span.set(rows=len(rows))
+            return rows
+
+    def _execute_query(self, query: str, params: Optional[List] = None) -> List[Dict]:
+        if self.engine is None:
             self.connect()
-        cursor = self.connection.cursor(pymysql.cursors.DictCursor)
         try:
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-            rows = cursor.fetchall()
-            formatted = []
-            for row in rows:
-                out = {}
-                for k, v in row.items():
-                    if hasattr(v, "strftime"):
-                        out[k] = v.strftime("%Y-%m-%d")
-                    elif hasattr(v, "__float__"):
-                        out[k] = float(v)
-                    else:
-                        out[k] = v
-                formatted.append(out)
-            return formatted
+            if self.config.NEWS_DB_URL:
+                # pymysql DictCursor는 MySQL 커넥션에서만 동작하므로 다른 DB는 SQLAlchemy 결과를 dict로 변환
+                # (params는 해당 드라이버의 paramstyle을 따름)
+                with self.engine.connect() as conn:
+                    result = conn.exec_driver_sql(query, tuple(params) if params else ())
+                    return format_rows(dict(row) for row in result.mappings())
+            with pooled_cursor(self.engine) as cursor:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                return format_rows(cursor.fetchall())
         except Exception as e:
             print(f"[NewsDatabaseManager] SQL 실행 오류: {e}")
             raise e
-        finally:
-            cursor.close()
+
+    def _read_sql(self, query, params: Optional[Dict] = None) -> pd.DataFrame:
+        """pd.read_sql (cassette 기록/재생 대상)"""
+        with get_tracer().span("news_db.read_sql", kind="sql", backend="mysql") as span:
+            df = get_cassette().call(
+                "sql", "news_db.read_sql", {"query": str(query), "params": params},
+                lambda: pd.read_sql(query, self.engine, params=params),
+                encode=lambda frame: {"columns": list(frame.columns), "records": frame.to_dict(orient="records")},
+                decode=lambda data: pd.DataFrame(data["records"], columns=data["columns"]),
+            )
+            span.set(rows=len(df))
+            return df
 
     # ----------------- 뉴스 검색 (DB 우선, 없으면 크롤링) -----------------
     def search_news(self, keywords: Optional[Union[str, List[str]]] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, date: Optional[str] = None, limit: int = 5) -> List[Dict]:
@@ -112,7 +128,7 @@ class NewsDatabaseManager:
         """)
         
         try:
-            df = pd.read_sql(query, self.engine, params=params)
+            df = self._read_sql(query, params)
         except Exception as e:
             print(f"[NewsDatabaseManager] DB 조회 실패: {e}")
             df = pd.DataFrame()
@@ -130,6 +146,14 @@ class NewsDatabaseManager:
     # ----------------- 크롤링 & 본문 -----------------
     
     def _crawl_naver_news(self, company: str, extra_keywords: list, date: str = None, limit: int = 3):
+        """네이버 뉴스 검색 결과 크롤링 (브라우저 세션은 기록할 수 없으므로 결과 기사 목록을 cassette에 기록)"""
+        return get_cassette().call(
+            "http", "http.crawl_naver_news",
+            {"company": company, "extra_keywords": extra_keywords, "date": date, "limit": limit},
+            lambda: self._crawl_naver_news_live(company, extra_keywords, date, limit),
+        )
+
+    def _crawl_naver_news_live(self, company: str, extra_keywords: list, date: str = None, limit: int = 3):
         keyword_query = " ".join([company] + (extra_keywords or [])) if company else ""
 
         if date:
@@ -146,6 +170,11 @@ class NewsDatabaseManager:
             )
         else:
             url = f"https://search.naver.com/search.naver?where=news&query={keyword_query}&sort=0"
+        # selenium은 실시간 크롤링에서만 사용하므로 이때 import (에이전트 시작 시간 단축)
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.common.by import By
+
         options = Options()
         options.add_argument("--headless")
         options.add_argument("--disable-gpu")
@@ -154,8 +183,9 @@ class NewsDatabaseManager:
                               "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
 
         driver = webdriver.Chrome(options=options)
-        driver.get(url)
-        time.sleep(3)
+        with get_tracer().span("http.selenium", kind="http", url=url[:200]):
+            driver.get(url)
+            time.sleep(3)
 
         # 🚨 수정된 부분: 'headline1' 클래스를 가진 <span>의 부모 <a> 태그를 찾는 XPath
         elements = driver.find_elements(By.XPATH, '//span[contains(@class, "sds-comps-text-type-headline1")]/parent::a')
@@ -196,36 +226,21 @@ class NewsDatabaseManager:
         driver.quit()
         return articles
 
+    def _fetch_news_html(self, url: str) -> bytes:
+        """기사 페이지 원본 HTML (요청 실패/200이 아니면 빈 bytes)"""
+        try:
+            res = fetch(url, timeout=5)
+            return res.content if res.status_code == 200 else b""
+        except Exception:
+            return b""
+
     def _fetch_news_content(self, url: str) -> str:
         """
-        뉴스 기사 URL에서 본문 크롤링. BS4로 주요 본문 영역 추출.
+        뉴스 기사 URL에서 본문 크롤링. 주요 본문 영역 추출 (finance_agent/html_parsing.py).
         """
-        try:
-            res = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=5)
-            if res.status_code != 200:
-                return ""
-            soup = BeautifulSoup(res.text, "html.parser")
-            
-            # 네이버 뉴스 기사 본문 영역을 직접 지정
-            content_div = soup.select_one("#dic_area")
-            if content_div:
-                # 불필요한 이미지 캡션이나 기자 정보 제거
-                for junk in content_div.find_all(class_=['byline', 'img_center_box', 'caption']):
-                    junk.decompose()
-                return content_div.get_text(" ", strip=True)
-            
-            # 다른 언론사 웹사이트를 위한 fallback
-            for selector in ["#articleBody", ".article-body", ".news-article", "div.content", ".news_body"]:
-                div = soup.select_one(selector)
-                if div:
-                    return div.get_text(" ", strip=True)
-            
-            # 최종 fallback: 모든 <p> 태그 중 내용이 충분한 문장 합침
-            paragraphs = soup.select("p")
-            text = " ".join(p.get_text(" ", strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 30)
-            return text.strip()
-        except Exception:
-            return ""
+        html = self._fetch_news_html(url)
+        return parse_article_html(html) if html else ""
+
     def fetch_content_from_url(self, url: str) -> str:
         """
         외부에서 URL을 받아 뉴스 기사 본문을 반환하는 공용 메서드
@@ -234,8 +249,10 @@ class NewsDatabaseManager:
 
     def _crawl_and_summarize_news(self, company: str, extra_keywords: list, date: str = None, limit: int = 3) -> list:
         articles = self._crawl_naver_news(company, extra_keywords, date, limit)
-        for article in articles:
-            article["content"] = self._fetch_news_content(article["link"])
+        # 본문은 모두 받은 뒤 한 번에 파싱 (기사가 많으면 프로세스 풀에서)
+        pages = [self._fetch_news_html(article["link"]) for article in articles]
+        for article, content in zip(articles, parse_many("article", pages)):
+            article["content"] = content
         return articles
 
 
@@ -247,7 +264,7 @@ class NewsDatabaseManager:
             LIMIT {limit}
         """
         try:
-            df = pd.read_sql(query, con=self.engine)
+            df = self._read_sql(query)
             if df.empty:
                 print("[DatabaseManager] 최근 뉴스 조회 결과가 없습니다.")
             return df
@@ -258,11 +275,7 @@ class NewsDatabaseManager:
 
     def extract_top_keywords(self, titles: pd.Series, top_n=5):
         try:
-            text = ' '.join(titles)
-            words = re.sub(r'[^가-힣a-zA-Z0-9\s]', '', text).split()
-            stopwords = {'그리고','하지만','그래서','때문에','있다','하다','되다','않다','수','것','들','등'}
-            counter = Counter([w for w in words if w not in stopwords and len(w) > 1])
-            return [w for w, _ in counter.most_common(top_n)]
+            return extract_top_keywords(titles, top_n)
         except Exception as e:
             print(f"[DatabaseManager] 키워드 추출 실패: {e}")
             return []
@@ -276,23 +289,22 @@ class NewsDatabaseManager:
             for kw in ["INSERT", "UPDATE", "DELETE", "DROP", "ALTER", "CREATE", "TRUNCATE"]:
                 if kw in q:
                     return False
-            if self.connection:
-                cur = self.connection.cursor()
+            if self.engine is not None and not self.config.NEWS_DB_URL:
                 try:
-                    cur.execute(f"EXPLAIN {query}")
-                    cur.fetchall()
+                    with pooled_cursor(self.engine, pymysql.cursors.Cursor) as cur:
+                        cur.execute(f"EXPLAIN {query}")
+                        cur.fetchall()
                     return True
                 except:
                     return False
-                finally:
-                    cur.close()
             return True
         except:
             return False
 
     def close_connection(self):
-        if self.connection:
-            self.connection.close()
+        if self.engine is not None:
+            self.engine.dispose()
+            self.engine = None
 
     def __del__(self):
         self.close_connection()
\ No newline at end of file
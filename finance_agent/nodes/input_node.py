@@ -5,6 +5,7 @@ from typing import Dict, List, Sequence
 from langchain_core.messages import BaseMessage
 from finance_agent.prompts import clarification_prompt 
 from finance_agent.llm import LLM
+from finance_agent.prompt_builder import compact_history
 
 def format_chat_history(chat_history: Sequence[BaseMessage]) -> str:
     """대화 기록을 LLM 프롬프트에 맞는 문자열 형식으로 변환합니다."""
@@ -16,7 +17,7 @@ def format_chat_history(chat_history: Sequence[BaseMessage]) -> str:
 
 class InputNode:
     def __init__(self):
-        pass
+        self.llm = LLM()
     
     def process(self, state: Dict) -> Dict:
         # ✨ state에서 user_query와 chat_history를 모두 가져옵니다.
@@ -37,15 +38,13 @@ class InputNode:
     
     # ✨ _check_query_clarity가 chat_history를 받도록 수정
     def _check_query_clarity(self, query: str, chat_history: Sequence[BaseMessage]) -> Dict:
-        llm = LLM()
-        
-        # ✨ 프롬프트에 chat_history도 포맷팅하여 전달
-        formatted_history = format_chat_history(chat_history)
+        # 대화 기록은 토큰 예산(PROMPT_HISTORY_TOKEN_BUDGET) 안에서 최근 대화 위주로 압축
+        formatted_history = compact_history(chat_history) or "(없음)"
         prompt = clarification_prompt.format(
             user_query=query, 
             chat_history=formatted_history
         )
-        response = llm.run(prompt)
+        response = self.llm.run(prompt, tag="clarification")
 
         response_json = self._parse_json(response)
         
@@ -4,24 +4,25 @@ import re
 import requests
 from bs4 import BeautifulSoup
 from finance_agent.prompts import news_summary_prompt
-from finance_agent.news_db_manager import NewsDatabaseManager
 from finance_agent.llm import LLM
+from finance_agent.http_client import fetch
+from finance_agent.resources import get_news_db
 import traceback
 
 class NewsHandler:
     def __init__(self):
-        self.news_db = NewsDatabaseManager()
+        self.news_db = get_news_db()
         self.llm = LLM()
 
     def _summarize(self, title: str, content: str, url: str) -> str:
         prompt_text = news_summary_prompt.format(title=title or "", content=content or "", url=url or "")
-        return self.llm.run(prompt_text)
+        return self.llm.run(prompt_text, tag="news_summary")
 
     def _url_to_item(self, url: str) -> Dict | None:
         if not (url and url.startswith("http")):
             return None
         try:
-            res = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=7)
+            res = fetch(url, timeout=7)
             if res.status_code != 200:
                 return None
             soup = BeautifulSoup(res.text, 'html.parser')
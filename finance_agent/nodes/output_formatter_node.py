@@ -1,7 +1,7 @@
-import pandas as pd
 import pymysql
 from typing import Dict, List
 from config.config import Config
+from finance_agent.resources import get_company_df
 
 COLUMN_NAME_MAPPING = {
     "ticker": "회사명",
@@ -23,11 +23,23 @@ COLUMN_NAME_MAPPING = {
     "signal_bollinger_lower": "볼린저 하단 돌파",
     "golden_cross": "골든크로스",
     "dead_cross": "데드크로스",
+    "market": "시장",
+    "event_type": "이벤트",
+    "volume_rank": "거래량 순위",
+    "gain_rank": "상승률 순위",
+    "loss_rank": "하락률 순위",
+    "price_rank": "가격 순위",
+    "market_volume_rank": "시장 내 거래량 순위",
+    "market_gain_rank": "시장 내 상승률 순위",
+    "market_loss_rank": "시장 내 하락률 순위",
+    "market_price_rank": "시장 내 가격 순위",
 }
 
 class OutputFormatterNode:    
     def __init__(self):
-        self.company_df = pd.read_csv("./data/krx_tickers.csv")
+        self.company_df = get_company_df()
+        name_col = "company_name" if "company_name" in self.company_df.columns else "회사명"
+        self.ticker_to_name = dict(zip(self.company_df["ticker"], self.company_df[name_col]))
     
     def process(self, state: Dict) -> Dict:
         user_query = state["user_query"]
@@ -50,9 +62,7 @@ class OutputFormatterNode:
         
         columns = list(results[0].keys())
 
-        ticker_to_name = {}
-        if "ticker" in columns:
-            ticker_to_name = {row["ticker"]: row["company_name"] for _, row in self.company_df.iterrows()}
+        ticker_to_name = self.ticker_to_name
 
         output_lines = []
         for i, row in enumerate(results, start=1):
@@ -78,6 +88,10 @@ class OutputFormatterNode:
                 elif "pct" in col or "ratio" in col:
                     line_parts.append(f"{label}: {val:.2f}" if val is not None else f"{label}: -")
 
+                # 순위
+                elif col.endswith("_rank"):
+                    line_parts.append(f"{label}: {val:,.0f}위" if val is not None else f"{label}: -")
+
                 elif "count" in col:
                     line_parts.append(f"{label}: {val:,.0f}개" if val is not None else f"{label}: -")
 
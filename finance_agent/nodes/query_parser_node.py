@@ -1,15 +1,16 @@
-import pandas as pd
 from typing import Dict, Optional
 import re, json
 from finance_agent.llm import LLM
 from finance_agent.prompts import query_parser_prompt as prompt
+from finance_agent.resources import get_company_df
 from finance_agent.utils import is_url, is_today_related, extract_date, extract_keywords
 import datetime
 
 class QueryParserNode:
     def __init__(self):
         self.llm = LLM()
-        self.company_df = pd.read_csv("./data/krx_tickers.csv")
+        self.company_df = get_company_df()
+        self.name_col = "company_name" if "company_name" in self.company_df.columns else "회사명"
 
     def get_day_label(self, date: datetime.datetime) -> str:
         # 0=월 ... 6=일
@@ -34,7 +35,7 @@ class QueryParserNode:
     
     def lookup_ticker(self, company_name: str) -> Optional[str]:
         company_name = (company_name or "").strip()
-        row = self.company_df[self.company_df['company_name'] == company_name]
+        row = self.company_df[self.company_df[self.name_col] == company_name]
         return row['ticker'].values[0] if not row.empty else None
 
     def process(self, state: Dict) -> Dict:
@@ -110,7 +111,7 @@ class QueryParserNode:
 
         # 5) 그 외 — LLM 기반 파싱
         try:
-            response = self.llm.run(prompt.format(user_query=user_query))
+            response = self.llm.run(prompt.format(user_query=user_query), tag="query_parser")
             parsed = self._parse_json(response)
 
             date_str = parsed.get("date")
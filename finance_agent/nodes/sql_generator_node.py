@@ -4,15 +4,22 @@
 from typing import Dict
 from langchain_core.prompts import ChatPromptTemplate
 import re
-from finance_agent.database import DatabaseManager
+from config.config import Config
 from finance_agent.llm import LLM
-from finance_agent.prompts import sql_generation_prompt as prompt
+from finance_agent.prompt_builder import PromptBuilder
+from finance_agent.query_log import append_query_log
+from finance_agent.resources import get_database_manager
+from finance_agent.schema import rewrite_market_filter
+from finance_agent.sql_repair import SqlRepairer
 
 
 class SqlGeneratorNode:    
     def __init__(self):
+        self.config = Config()
         self.llm = LLM()
-        self.db_manager = DatabaseManager()
+        self.db_manager = get_database_manager()
+        self.sql_repairer = SqlRepairer()
+        self.prompt_builder = PromptBuilder()
     
     def process(self, state: Dict) -> Dict:
         user_query = state["user_query"]
@@ -30,36 +37,54 @@ class SqlGeneratorNode:
         latest_date = self._get_latest_available_date()
         
         try:
-            prompt_text = prompt.format(
+            # 질문 의도에 맞는 칼럼/규칙과 유사 예시만 포함
+            prompt_text = self.prompt_builder.build_sql_generation(
                 user_query=user_query,
                 latest_date=latest_date,
+                ticker=ticker,
                 ticker_hint=ticker_hint,
                 market_hint=market_hint
             )
-            llm_response = self.llm.run(prompt_text)
+            llm_response = self.llm.run(prompt_text, tag="sql_generation")
             sql_query = self._parse_sql(llm_response)
 
             # print(f"[SQL Generation] LLM response: {llm_response}")  # 디버깅용
 
-            # 약간의 하드코딩..
-            if ticker_hint:
-                if not self._ticker_hint_exists(sql_query, ticker_hint):
-                    # 한글 ticker가 있다면 교체
-                    sql_query = self._replace_korean_ticker(sql_query, ticker_hint) 
-                # 여전히 ticker 조건이 없다면 삽입
-                if not self._ticker_hint_exists(sql_query, ticker_hint):
-                    sql_query = self._ensure_ticker_filter(sql_query, ticker_hint)
+            # 스키마/종목 레지스트리 기준 결정적 수정 (칼럼명 오타, 회사명 ticker, ticker 조건 누락 등)
+            sql_query, fixes = self.sql_repairer.repair(sql_query, ticker=ticker or None)
+            if fixes:
+                print(f"[SQL Generation] 로컬 수정: {fixes}")
+
+            # market stored 칼럼이 있으면 LIKE 대신 인덱스 조회
+            if self.config.USE_MARKET_COLUMN:
+                sql_query = rewrite_market_filter(sql_query)
             
             state["sql_query"] = sql_query
             state["sql_attempts"] = 1
 
             try:
-                results = self.db_manager.execute_query(sql_query)
+                results = self.db_manager.execute_generated_query(sql_query)
                 state["query_results"] = results
                 state["sql_error"] = ""
             except Exception as e:
                 state["query_results"] = []
                 state["sql_error"] = str(e)
+                append_query_log(sql_query, user_query, "generate", state["sql_error"])
+
+                # 기계적으로 고칠 수 있는 오류는 LLM(Refiner) 없이 한 번 더 실행
+                fixed_query = self.sql_repairer.repair_error(sql_query, str(e), ticker=ticker or None)
+                if fixed_query:
+                    print(f"[SQL Generation] 오류 로컬 수정 후 재실행: {fixed_query}")
+                    sql_query = fixed_query
+                    state["sql_query"] = sql_query
+                    try:
+                        state["query_results"] = self.db_manager.execute_generated_query(sql_query)
+                        state["sql_error"] = ""
+                    except Exception as retry_error:
+                        state["sql_error"] = str(retry_error)
+                    append_query_log(sql_query, user_query, "repair", state["sql_error"])
+            else:
+                append_query_log(sql_query, user_query, "generate", state["sql_error"])
 
         except Exception as e:
             state["sql_query"] = ""
@@ -77,40 +102,6 @@ class SqlGeneratorNode:
 
     def _get_latest_available_date(self) -> str:
         try:
-            dates = self.db_manager.get_available_dates(1)
-            return dates[0] if dates else "2025-07-09"
+            return self.db_manager.get_latest_date() or "2025-07-09"
         except Exception:
             return "2025-07-09"
-        
-    def _ticker_hint_exists(self, sql_query: str, ticker_hint: str) -> bool:
-        """
-        ticker 조건이 SQL 쿼리에 이미 존재하는지 확인
-        """
-        normalized_sql = re.sub(r"\s+", " ", sql_query).lower()
-        normalized_hint = ticker_hint.lower()
-        return normalized_hint in normalized_sql
-
-    def _replace_korean_ticker(self, sql_query: str, ticker_hint: str) -> str:
-        # 패턴: ticker = '현대사료' → ticker = '016790.KQ'
-        sql_query = re.sub(r"ticker\s*=\s*['\"][가-힣]+['\"]", ticker_hint, sql_query)
-        return sql_query
-    
-    def _ensure_ticker_filter(self, sql_query: str, ticker_hint: str) -> str:
-        if ticker_hint and ticker_hint not in sql_query:
-            # ticker LIKE 가 있는 경우 AND로 ticker = ... 추가
-            if "ticker LIKE" in sql_query:
-                sql_query = re.sub(
-                    r"(WHERE\s+.*?ticker\s+LIKE\s+'[^']+')",
-                    rf"\1 AND {ticker_hint}",
-                    sql_query,
-                    flags=re.IGNORECASE | re.DOTALL
-                )
-            else:
-                # ticker 조건 자체가 없으면 그냥 WHERE 뒤에 추가
-                sql_query = re.sub(
-                    r"(WHERE\s+)",
-                    rf"\1{ticker_hint} AND ",
-                    sql_query,
-                    flags=re.IGNORECASE
-                )
-        return sql_query
\ No newline at end of file
@@ -4,18 +4,24 @@ Refines SQL queries when they fail (max 3 attempts)
 """
 
 from typing import Dict
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 import re
-from finance_agent.database import DatabaseManager
+from config.config import Config
 from finance_agent.llm import LLM
-from finance_agent.prompts import sql_refinement_prompt as prompt
+from finance_agent.prompt_builder import PromptBuilder
+from finance_agent.query_log import append_query_log
+from finance_agent.resources import get_database_manager
+from finance_agent.schema import rewrite_market_filter
+from finance_agent.sql_repair import SqlRepairer
 
 
 class SqlRefinerNode:
     def __init__(self):
+        self.config = Config()
         self.llm = LLM()
-        self.db_manager = DatabaseManager()
+        self.db_manager = get_database_manager()
+        self.sql_repairer = SqlRepairer()
+        self.prompt_builder = PromptBuilder()
     
     def process(self, state: Dict) -> Dict:
         if state["sql_attempts"] >= 3:
@@ -26,28 +32,40 @@ class SqlRefinerNode:
         original_query = state["sql_query"]
         error_message = state["sql_error"]
         user_query = state["user_query"]
+        ticker = state.get("parsed_query", {}).get("ticker") or None
            
         try:
-            latest_date = self._get_latest_available_date()
-            response = self.llm.run(prompt.format(
-                user_query=user_query,
-                original_query=original_query,
-                error=error_message,
-                latest_date=latest_date
-            ))
-            
-            refined_query = self._parse_sql(response)
+            # 결정적으로 고칠 수 있는 오류면 LLM 호출 생략 (이전에 본 오류→수정 쌍은 메모에서 재사용)
+            refined_query = self.sql_repairer.repair_error(original_query, error_message, ticker=ticker)
+            if refined_query:
+                print(f"[SQL Refiner] 로컬 수정: {refined_query}")
+            else:
+                latest_date = self._get_latest_available_date()
+                response = self.llm.run(self.prompt_builder.build_sql_refinement(
+                    user_query=user_query,
+                    original_query=original_query,
+                    error=error_message,
+                    latest_date=latest_date,
+                    ticker=ticker or ""
+                ), tag="sql_refinement")
+                refined_query = self._parse_sql(response)
+                refined_query, _ = self.sql_repairer.repair(refined_query, ticker=ticker)
+
+            if self.config.USE_MARKET_COLUMN:
+                refined_query = rewrite_market_filter(refined_query)
             state["sql_query"] = refined_query
             state["sql_attempts"] += 1
             
             # Execute refined query
             try:
-                results = self.db_manager.execute_query(refined_query)
+                results = self.db_manager.execute_generated_query(refined_query)
                 state["query_results"] = results
                 state["sql_error"] = ""
             except Exception as e:
                 state["sql_error"] = str(e)
                 state["query_results"] = []
+
+            append_query_log(refined_query, user_query, "refine", state["sql_error"])
                 
         except Exception as e:
             state["sql_error"] = f"SQL 수정 오류: {str(e)}"
@@ -63,7 +81,6 @@ class SqlRefinerNode:
     
     def _get_latest_available_date(self) -> str:
         try:
-            dates = self.db_manager.get_available_dates(1)
-            return dates[0] if dates else "2025-07-09"
+            return self.db_manager.get_latest_date() or "2025-07-09"
         except Exception:
             return "2025-07-09"
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+Parquet mirror of krx_stockprice
+updater가 계산한 주가 프레임을 year/month 파티션의 로컬 Parquet 데이터셋으로 보관하는 저장소
+
+- 칼럼명은 MySQL 스키마와 같은 소문자로 저장 (ma_VOL_20 → ma_vol_20)
+- 사본이 담고 있는 날짜 범위는 루트의 _coverage.json에 기록 (로컬 엔진이 범위 밖 질문을 MySQL로 보내는 데 사용)
+"""
+
+import os
+import json
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from config.config import Config
+
+# 사본이 담고 있는 날짜 범위 {"min_date", "max_date"} (밑줄로 시작해 pyarrow dataset/DuckDB glob에서 제외됨)
+COVERAGE_FILE = "_coverage.json"
+
+
+def write_table_file(df: pd.DataFrame, path: str, **kwargs):
+    """임시 파일에 쓰고 rename (읽는 쪽이 쓰다 만 파일을 보지 않도록)"""
+    tmp_path = path + ".tmp"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path, compression="zstd", **kwargs)
+    os.replace(tmp_path, path)
+
+
+def replace_date_range(path: str, df: pd.DataFrame, start_date, end_date):
+    """단일 Parquet 파일(LOCAL_TABLES_DIR/<table>.parquet)에서 [start_date, end_date] 행을 df로 교체
+    (DB의 스냅샷/이벤트 테이블처럼 재계산된 기간은 통째로 바꿔 더 이상 해당하지 않는 행이 남지 않도록)"""
+    df = df.assign(date=pd.to_datetime(df["date"]))
+    if os.path.exists(path):
+        existing = pq.read_table(path).to_pandas()
+        dates = pd.to_datetime(existing["date"])
+        keep = existing[(dates < pd.Timestamp(start_date)) | (dates > pd.Timestamp(end_date))]
+        df = pd.concat([keep.assign(date=pd.to_datetime(keep["date"])), df], ignore_index=True)
+    write_table_file(df.sort_values("date", kind="stable"), path)
+
+
+class ParquetStore:
+    """year=YYYY/month=MM 파티션, (ticker, date) 정렬 row group으로 저장되는 krx_stockprice 로컬 사본"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.config = Config()
+        self.root = root or self.config.PARQUET_DIR
+        os.makedirs(self.root, exist_ok=True)
+
+    # ----------------- 쓰기 -----------------
+    def _partition_dir(self, year: int, month: int) -> str:
+        return os.path.join(self.root, f"year={year}", f"month={month:02d}")
+
+    def _write_file(self, df: pd.DataFrame, directory: str, prefix: str) -> str:
+        """(ticker, date) 순 정렬 후 파일 1개로 저장"""
+        os.makedirs(directory, exist_ok=True)
+        df = df.rename(columns=str.lower).sort_values(["ticker", "date"], kind="stable")
+
+        name = f"{prefix}-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet"
+        path = os.path.join(directory, name)
+        write_table_file(df, path, row_group_size=self.config.PARQUET_ROW_GROUP_SIZE)
+        return path
+
+    def write(self, df: pd.DataFrame) -> List[str]:
+        """주가 프레임을 월 파티션별 파일로 저장하고 생성된 파일 경로를 반환"""
+        if df.empty:
+            return []
+
+        df = df.copy()
+        df["date"] = pd.to_datetime(df["date"])
+        # 파일마다 category 사전이 달라지지 않도록 문자열로 저장
+        df["ticker"] = df["ticker"].astype(str)
+
+        paths = []
+        for (year, month), part in df.groupby([df["date"].dt.year, df["date"].dt.month]):
+            paths.append(self._write_file(part, self._partition_dir(year, month), "part"))
+        self._extend_coverage(df["date"].min(), df["date"].max())
+        return paths
+
+    # ----------------- 날짜 범위 -----------------
+    def _coverage_path(self) -> str:
+        return os.path.join(self.root, COVERAGE_FILE)
+
+    def _save_coverage(self, min_date: str, max_date: str):
+        path = self._coverage_path()
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"min_date": min_date, "max_date": max_date}, f)
+        os.replace(path + ".tmp", path)
+
+    def _extend_coverage(self, start, end):
+        start, end = pd.Timestamp(start).strftime("%Y-%m-%d"), pd.Timestamp(end).strftime("%Y-%m-%d")
+        current = self.coverage()
+        if current:
+            start, end = min(start, current[0]), max(end, current[1])
+        self._save_coverage(start, end)
+
+    def coverage(self) -> Optional[Tuple[str, str]]:
+        """사본이 담고 있는 (최소 날짜, 최대 날짜), 데이터가 없으면 None
+        기록이 없는 이전 버전 사본은 date 칼럼을 한 번 읽어 계산하고 기록해 둠"""
+        try:
+            with open(self._coverage_path(), encoding="utf-8") as f:
+                saved = json.load(f)
+            return saved["min_date"], saved["max_date"]
+        except (OSError, ValueError, KeyError):
+            pass
+        if not self._partition_dirs():
+            return None
+        dates = pd.to_datetime(self._dataset().to_table(columns=["date"]).column("date").to_pandas())
+        if dates.empty:
+            return None
+        start, end = dates.min().strftime("%Y-%m-%d"), dates.max().strftime("%Y-%m-%d")
+        self._save_coverage(start, end)
+        return start, end
+
+    # ----------------- 컴팩션 -----------------
+    def _partition_files(self, directory: str) -> List[str]:
+        return sorted(
+            os.path.join(directory, f)
+            for f in os.listdir(directory)
+            if f.endswith(".parquet")
+        )
+
+    def _partition_dirs(self) -> List[str]:
+        dirs = []
+        for year_dir in sorted(os.listdir(self.root)):
+            year_path = os.path.join(self.root, year_dir)
+            if not (year_dir.startswith("year=") and os.path.isdir(year_path)):
+                continue
+            for month_dir in sorted(os.listdir(year_path)):
+                month_path = os.path.join(year_path, month_dir)
+                if month_dir.startswith("month=") and os.path.isdir(month_path):
+                    dirs.append(month_path)
+        return dirs
+
+    def compact(self, min_files: Optional[int] = None) -> int:
+        """
+        작은 일별 파일이 min_files개 이상 쌓인 파티션을 하나의 파일로 병합.
+        같은 (ticker, date)는 나중에 쓰인 값을 유지합니다. 병합된 파티션 수를 반환.
+        """
+        min_files = min_files or self.config.PARQUET_COMPACT_MIN_FILES
+        compacted = 0
+        for directory in self._partition_dirs():
+            files = self._partition_files(directory)
+            if len(files) < min_files:
+                continue
+
+            # 파일명에 쓰기 시각이 들어 있으므로 정렬 순서 = 쓰기 순서
+            # 칼럼명을 소문자로 바꾸기 전(ma_VOL_20)에 쓰인 파일도 같은 칼럼으로 합침
+            df = pd.concat([pq.read_table(f).to_pandas().rename(columns=str.lower) for f in files], ignore_index=True)
+            df = df.drop_duplicates(subset=["ticker", "date"], keep="last")
+            self._write_file(df, directory, "compacted")
+            for f in files:
+                os.remove(f)
+            compacted += 1
+        return compacted
+
+    # ----------------- 읽기 -----------------
+    def _dataset(self) -> ds.Dataset:
+        return ds.dataset(self.root, format="parquet", partitioning="hive")
+
+    def read(
+        self,
+        columns: Optional[List[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        tickers: Optional[List[str]] = None,
+        filter: Optional[ds.Expression] = None,
+    ) -> pd.DataFrame:
+        """
+        컬럼/조건 pushdown 읽기.
+        날짜 조건은 year/month 파티션 pruning에도 사용되고, ticker 조건은 정렬된 row group 통계로 걸러집니다.
+        filter에는 임의의 pyarrow.dataset 표현식을 추가로 넘길 수 있습니다.
+        """
+        expr = None
+
+        def _and(e):
+            nonlocal expr
+            expr = e if expr is None else expr & e
+
+        year, month = ds.field("year"), ds.field("month")
+        if start_date:
+            start = pd.Timestamp(start_date)
+            _and((year > start.year) | ((year == start.year) & (month >= start.month)))
+            _and(ds.field("date") >= start.to_pydatetime())
+        if end_date:
+            end = pd.Timestamp(end_date)
+            _and((year < end.year) | ((year == end.year) & (month <= end.month)))
+            _and(ds.field("date") <= end.to_pydatetime())
+        if tickers:
+            _and(ds.field("ticker").isin(list(tickers)))
+        if filter is not None:
+            _and(filter)
+
+        if not os.listdir(self.root):
+            return pd.DataFrame(columns=columns or [])
+
+        table = self._dataset().to_table(columns=columns, filter=expr)
+        df = table.to_pandas()
+
+        # 컴팩션 전에는 겹치는 기간의 파일에 같은 행이 있을 수 있음
+        if {"ticker", "date"}.issubset(df.columns):
+            df = df.drop_duplicates(subset=["ticker", "date"], keep="last")
+        return df.reset_index(drop=True)
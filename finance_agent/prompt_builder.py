@@ -0,0 +1,236 @@
+"""
+Prompt builder
+SQL 생성/수정 프롬프트를 질문 의도에 맞게 조립 (관련 칼럼만, 유사 예시 2~3개, 토큰 예산 내 대화 기록)
+"""
+
+import re
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+from config.config import Config
+from finance_agent.prompts import (
+    sql_generation_prompt,
+    sql_refinement_prompt,
+    SQL_HINT_RULE,
+    SQL_BASE_RULES,
+    SQL_CONDITIONAL_RULES,
+)
+from finance_agent.schema import (
+    STOCKPRICE_TABLE,
+    SNAPSHOT_TABLE,
+    EVENTS_TABLE,
+    TABLE_COLUMNS,
+)
+
+# 질문 키워드 → krx_stockprice 관련 칼럼
+COLUMN_KEYWORDS = {
+    "시가": ["open"],
+    "종가": ["close", "adj_close"],
+    "고가": ["high"],
+    "저가": ["low"],
+    "가격": ["adj_close", "close"],
+    "주가": ["adj_close", "close"],
+    "비싼": ["adj_close"],
+    "거래량": ["volume", "volume_change_pct", "ma_vol_20", "volume_ratio_20"],
+    "거래": ["volume"],
+    "등락": ["price_change_pct"],
+    "상승": ["price_change_pct"],
+    "하락": ["price_change_pct"],
+    "오른": ["price_change_pct"],
+    "올랐": ["price_change_pct"],
+    "내린": ["price_change_pct"],
+    "떨어": ["price_change_pct"],
+    "이동평균": ["ma_5", "ma_20", "ma_60"],
+    "이평": ["ma_5", "ma_20", "ma_60"],
+    "rsi": ["rsi_14"],
+    "과매수": ["rsi_14"],
+    "과매도": ["rsi_14"],
+    "볼린저": ["bollinger_mid", "bollinger_upper", "bollinger_lower", "signal_bollinger_upper", "signal_bollinger_lower"],
+    "골든": ["golden_cross", "ma_diff", "prev_diff"],
+    "데드": ["dead_cross", "ma_diff", "prev_diff"],
+    "크로스": ["golden_cross", "dead_cross"],
+}
+BASE_COLUMNS = ["date", "ticker", "adj_close"]
+
+# 순위 질문 → krx_daily_snapshot, 이벤트 질문 → krx_daily_events
+RANK_KEYWORDS = ["많은", "많이", "가장", "순위", "상위", "하위", "top", "비싼", "싼", "높은", "낮은"]
+EVENT_KEYWORDS = ["골든", "데드", "크로스", "볼린저", "과매수", "과매도", "rsi"]
+
+_IDENTIFIER = re.compile(r"[a-z_][a-z0-9_]*")
+_HANGUL = re.compile(r"[가-힣]")
+
+
+# ----------------- 토큰 추정 / 대화 기록 -----------------
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 쓰는 보수적 추정 (한글 1자 ≈ 1토큰, 그 외 약 4자 ≈ 1토큰)"""
+    if not text:
+        return 0
+    hangul = len(_HANGUL.findall(text))
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+def compact_history(chat_history: Sequence, max_tokens: Optional[int] = None, max_message_chars: Optional[int] = None) -> str:
+    """
+    최근 대화부터 토큰 예산 안에서 포함하고, 긴 메시지(결과 표 등)는 앞부분만 남깁니다.
+    예산을 넘는 오래된 대화는 생략 표시만 남깁니다.
+    세션 저장소가 접어 둔 요약(맨 앞 SystemMessage)은 항상 첫 줄에 포함합니다.
+    """
+    config = Config()
+    max_tokens = config.PROMPT_HISTORY_TOKEN_BUDGET if max_tokens is None else max_tokens
+    max_message_chars = max_message_chars or config.PROMPT_HISTORY_MESSAGE_CHARS
+
+    lines: List[str] = []
+    used = 0
+    messages = list(chat_history or [])
+    summary = ""
+    if messages and getattr(messages[0], "type", "") == "system":
+        summary = "이전 대화 요약: " + " / ".join(str(messages[0].content).splitlines())
+        used = estimate_tokens(summary)
+        messages = messages[1:]
+    for i, msg in enumerate(reversed(messages)):
+        role = "사용자" if getattr(msg, "type", "") == "human" else "어시스턴트"
+        content = " ".join(str(getattr(msg, "content", msg)).split())
+        if len(content) > max_message_chars:
+            content = content[:max_message_chars] + "…"
+        line = f"{role}: {content}"
+        cost = estimate_tokens(line)
+        if used + cost > max_tokens:
+            omitted = len(messages) - i
+            lines.append(f"(이전 대화 {omitted}건 생략)")
+            break
+        lines.append(line)
+        used += cost
+    if summary:
+        lines.append(summary)
+    return "\n".join(reversed(lines))
+
+
+# ----------------- 예시 저장소 -----------------
+def _bigrams(text: str) -> set:
+    text = re.sub(r"[\d\s\-./?!,]", "", text.lower())
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class ExampleBank:
+    """질문-SQL 예시 모음에서 문자 bigram 유사도로 가까운 예시를 찾습니다."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or Config().SQL_EXAMPLES_PATH
+        self.examples = self._load(self.path)
+        self._grams = [_bigrams(ex["question"]) for ex in self.examples]
+
+    @staticmethod
+    def _load(path: str) -> List[Dict]:
+        if not os.path.exists(path):
+            print(f"[ExampleBank] 예시 파일 없음: {path}")
+            return []
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def top_k(self, question: str, k: int = 3, ticker_hint: str = "", market_hint: str = "") -> List[Dict]:
+        grams = _bigrams(question)
+        scored = []
+        for ex, ex_grams in zip(self.examples, self._grams):
+            union = len(grams | ex_grams) or 1
+            score = len(grams & ex_grams) / union
+            # 힌트 유무가 같은 예시(종목 조회 vs 전체 시장 조회)를 우선
+            score += 0.1 if bool(ex.get("ticker_hint")) == bool(ticker_hint) else 0.0
+            score += 0.05 if bool(ex.get("market_hint")) == bool(market_hint) else 0.0
+            scored.append((score, ex))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [ex for _, ex in scored[:k]]
+
+
+@lru_cache(maxsize=4)
+def _get_example_bank(path: str) -> ExampleBank:
+    return ExampleBank(path)
+
+
+# ----------------- 프롬프트 조립 -----------------
+class PromptBuilder:
+    """SQL 생성/수정 프롬프트 조립기"""
+
+    def __init__(self, example_bank: Optional[ExampleBank] = None):
+        self.config = Config()
+        self.example_bank = example_bank or _get_example_bank(self.config.SQL_EXAMPLES_PATH)
+
+    def select_schema(self, text: str, ticker: str = "") -> Dict[str, List[str]]:
+        """질문(및 오류 쿼리)에 관련된 테이블 → 칼럼 목록"""
+        lowered = text.lower()
+        columns = list(BASE_COLUMNS)
+        matched = False
+        for keyword, cols in COLUMN_KEYWORDS.items():
+            if keyword in lowered:
+                matched = True
+                columns += [c for c in cols if c not in columns]
+        # 오류 쿼리 등에 칼럼명이 직접 나온 경우
+        for name in _IDENTIFIER.findall(lowered):
+            if name in TABLE_COLUMNS[STOCKPRICE_TABLE] and name not in columns:
+                matched = True
+                columns.append(name)
+        if not matched:
+            columns = list(TABLE_COLUMNS[STOCKPRICE_TABLE])  # 의도를 모르면 전체 칼럼
+
+        schema = {STOCKPRICE_TABLE: columns}
+        if (not ticker and any(k in lowered for k in RANK_KEYWORDS)) or SNAPSHOT_TABLE in lowered:
+            schema[SNAPSHOT_TABLE] = list(TABLE_COLUMNS[SNAPSHOT_TABLE])
+        if any(k in lowered for k in EVENT_KEYWORDS) or EVENTS_TABLE in lowered:
+            schema[EVENTS_TABLE] = list(TABLE_COLUMNS[EVENTS_TABLE])
+        return schema
+
+    def render_columns(self, schema: Dict[str, List[str]]) -> str:
+        blocks = []
+        for table, columns in schema.items():
+            descriptions = TABLE_COLUMNS[table]
+            lines = [f"<{table} 칼럼>"] + [f"- {col}: {descriptions[col]}" for col in columns]
+            blocks.append("\n".join(lines))
+        return "\n\n".join(blocks)
+
+    def render_rules(self, schema: Dict[str, List[str]], text: str, market_hint: str = "", with_hint_rule: bool = False) -> str:
+        """기본 규칙 + 선택된 테이블/칼럼/시장 조건에 해당하는 규칙만 번호를 붙여 출력"""
+        lowered = text.lower()
+        rules = ([SQL_HINT_RULE] if with_hint_rule else []) + list(SQL_BASE_RULES)
+        for key, rule in SQL_CONDITIONAL_RULES.items():
+            if key in schema or key in schema.get(STOCKPRICE_TABLE, []):
+                rules.append(rule)
+            elif key == "market" and (market_hint or "kospi" in lowered or "kosdaq" in lowered):
+                rules.append(rule)
+        return "\n".join(f"{i}. {rule}" for i, rule in enumerate(rules, 1))
+
+    def render_examples(self, user_query: str, ticker_hint: str = "", market_hint: str = "") -> str:
+        examples = self.example_bank.top_k(user_query, self.config.PROMPT_EXAMPLE_COUNT, ticker_hint, market_hint)
+        blocks = []
+        for ex in examples:
+            ex_ticker_hint = ex.get("ticker_hint") or '""'
+            ex_market_hint = ex.get("market_hint") or '""'
+            blocks.append(
+                f"사용자 질문: {ex['question']}\n"
+                f"종목 검색 힌트: {ex_ticker_hint}\n"
+                f"시장 검색 힌트: {ex_market_hint}\n"
+                f"출력:\n```sql\n{ex['sql']}\n```"
+            )
+        return "\n".join(blocks)
+
+    def build_sql_generation(self, user_query: str, latest_date: str, ticker: str = "", ticker_hint: str = "", market_hint: str = "") -> str:
+        schema = self.select_schema(user_query, ticker)
+        return sql_generation_prompt.format(
+            rules=self.render_rules(schema, user_query, market_hint, with_hint_rule=True).replace("{latest_date}", latest_date),
+            columns=self.render_columns(schema),
+            examples=self.render_examples(user_query, ticker_hint, market_hint),
+            user_query=user_query,
+            ticker_hint=ticker_hint,
+            market_hint=market_hint,
+        )
+
+    def build_sql_refinement(self, user_query: str, original_query: str, error: str, latest_date: str, ticker: str = "") -> str:
+        text = f"{user_query}\n{original_query}"
+        schema = self.select_schema(text, ticker)
+        return sql_refinement_prompt.format(
+            rules=self.render_rules(schema, text).replace("{latest_date}", latest_date),
+            columns=self.render_columns(schema),
+            user_query=user_query,
+            original_query=original_query,
+            error=error,
+        )
@@ -51,8 +51,11 @@ output:
     "clarification_question": ""
 }}
 ```
-그럼 아래 사용자 질문에 대해 json 형식(```json ```)으로 답변해주세요
+그럼 아래 사용자 질문에 대해 json 형식(```json ```)으로 답변해주세요. 이전 대화에서 이미 주어진 정보는 모호하지 않은 것으로 간주합니다.
 ==============
+[이전 대화]
+{chat_history}
+
 사용자 질문: {user_query}
 output:
 """
@@ -109,8 +112,33 @@ output:
 """
 
 
+# SQL 생성/수정 규칙 (prompt_builder가 질문에 해당하는 규칙만 골라 번호를 붙임)
+SQL_HINT_RULE = "종목 검색 힌트가 주어졌을 경우, **반드시** 이 힌트를 그대로 사용해야 하며, 절대 ticker 검색에 한글 회사명을 사용해서는 안 됩니다."
+SQL_BASE_RULES = [
+    "날짜는 항상 YYYY-MM-DD 포맷. 날짜가 없으면 최신 날짜 {latest_date} 사용. \"한달\", \"일주일\"과 같은 표현은 범위로 간주하여 계산.",
+    "특정 주식 시장에 대한 정보가 없으면 전체 시장에서 검색",
+    "특정 종목에 대한 정보를 요청할 경우: ticker = '종목 코드'를 where 조건으로 사용 (예: WHERE ticker = '005930.KS')",
+    "SELECT * 사용하지 말 것. 관련 있는 칼럼만을 선택",
+    "모든 컬럼/테이블명은 아래 설명된 이름만 사용",
+]
+# 키: 테이블명, krx_stockprice 칼럼명 또는 "market"
+SQL_CONDITIONAL_RULES = {
+    "adj_close": "가장 비싼: ORDER BY adj_close DESC",
+    "price_change_pct": "상승: price_change_pct > 0, 하락: price_change_pct < 0",
+    "market": "market 이 KOSPI인 경우 ticker LIKE '%.KS', KOSDAQ인 경우 ticker LIKE '%.KQ'로 필터링",
+    "krx_daily_snapshot": (
+        "특정 날짜의 순위 질문(거래량 많은, 많이 오른/상승률 높은, 많이 내린/하락률 높은, 가장 비싼)은 "
+        "krx_daily_snapshot의 순위 칼럼으로 조회 (예: WHERE date = '...' AND volume_rank <= 10 ORDER BY volume_rank). "
+        "시장 조건이 있으면 market = 'KOSPI' 또는 market = 'KOSDAQ'와 market_*_rank 칼럼 사용"
+    ),
+    "krx_daily_events": (
+        "특정 날짜/기간의 골든크로스, 데드크로스, 볼린저 밴드 돌파, RSI 과매수(70 이상)/과매도(30 이하) 종목 질문은 "
+        "krx_daily_events의 event_type으로 조회"
+    ),
+}
+
 sql_generation_prompt = """
-질문에 대한 힌트를 **반드시** 반영하여 질문을 krx_stockprice 테이블에 대한 MYSQL 쿼리로 변환해주세요.
+질문에 대한 힌트를 **반드시** 반영하여 질문을 MYSQL 쿼리로 변환해주세요.
 
 <주어질 정보>
 - 사용자 질문
@@ -118,66 +146,12 @@ sql_generation_prompt = """
 - 시장 검색 힌트: ticker LIKE '%.KS' 또는 ticker LIKE '%.KQ' 형태로 주어지며, 시장 검색 힌트가 없으면 빈 문자열("")로 주어집니다.
 
 <SQL 쿼리 작성 규칙>
-1. 날짜는 항상 YYYY-MM-DD 포맷. 날짜가 없으면 최신 날짜 {latest_date} 사용. "한달", "일주일"과 같은 표현은 범위로 간주하여 계산.
-2. 종목 검색 힌트가 주어졌을 경우, **반드시** 이 힌트를 그대로 사용해야 하며, 절대 ticker 검색에 한글 회사명을 사용해서는 안 됩니다. 
-3. 가장 비싼: ORDER BY adj_close DESC
-4. 상승: price_change_pct > 0
-5. 하락: price_change_pct < 0
-6. SELECT * 사용하지 말 것. 관련 있는 칼럼만을 선택
-7. 모든 컬럼/테이블명은 아래 설명된 이름만 사용
-8. market 이 KOSPI인 경우 ticker LIKE '%.KS', KOSDAQ인 경우 ticker LIKE '%.KQ'로 필터링
-
-<krx_stockprice 칼럼>
-- date: 거래 일자 (YYYY-MM-DD)
-- adj_close: 당일 수정 종가
-- close: 당일 종가
-- high: 당일 최고가
-- low: 당일 최저가
-- open: 당일 시가
-- volume: 당일 거래량 (주식 수)
-- ticker: 종목 코드 (예: 005930.KS, 016790.KQ)
-- price_change_pct: 전일 대비 등락률 (%)
-- volume_change_pct: 전일 대비 거래량 변화율 (%)
-- ma_5, ma_20, ma_60: 5일, 20일, 60일 단순 이동평균선
-- ma_vol_20: 20일 거래량 평균
-- volume_ratio_20: 현재 거래량 / 20일 평균 거래량
-- rsi_14: 14일 기준 RSI
-- signal_bollinger_upper: 종가가 상단 밴드 초과시 True
-- signal_bollinger_lower: 종가가 하단 밴드 이하시 True
-- golden_cross: 골든크로스 발생시 True
-- dead_cross: 데드크로스 발생시 True
+{rules}
+
+{columns}
 
 <예시>
-사용자 질문: 2024-10-29에서 KOSPI에서 거래량 많은 종목 10개는? 
-종목 검색 힌트: ""
-시장 검색 힌트: ticker LIKE '%.KS'
-출력:
-```sql
-SELECT ticker
-FROM krx_stockprice, volume -- 거래량도 같이 출력
-WHERE date = '2024-10-29' AND ticker LIKE '%.KS'
-ORDER BY volume DESC
-LIMIT 10
-```
-사용자 질문: 현대사료의 2025-05-13 시가는?
-종목 검색 힌트: ticker = '016790.KS'
-시장 검색 힌트: ""
-출력:
-```sql
-SELECT ticker, open 
-FROM krx_stockprice
-WHERE ticker = '016790.KS' and date = '2025-05-13';
-```
-사용자 질문: 2025-01-13에 RSI가 70 이상인 과매수 종목을 알려줘
-종목 검색 힌트: ""
-시장 검색 힌트: ""
-출력:
-```sql
-SELECT ticker, rsi_14 -- RSI 값도 같이 출력
-FROM krx_stockprice
-WHERE date = '2025-01-13' AND rsi_14 >= 70
-ORDER BY rsi_14 DESC;
-```
+{examples}
 
 이제 다음 사용자 질문을 SQL 쿼리로 변환해주세요.
 ================
@@ -196,35 +170,10 @@ SQL 쿼리만을 출력해야합니다. 또한 SQL 쿼리 출력은 ```sql로 
 오류 메시지: {error}
 
 <SQL 쿼리 작성 규칙>
-1. 날짜는 항상 YYYY-MM-DD 포맷. 날짜가 없으면 최신 날짜 {latest_date} 사용
-2. 특정 주식 시장에 대한 정보가 없으면 전체 시장에서 검색
-3. 특정 종목에 대한 정보를 요청할 경우: ticker = '주어진 티커'를 where 조건으로 사용하여 해당 종목에 대한 정보만 검색 (예: WHERE ticker = '005930.KS')
-4. 가장 비싼: ORDER BY adj_close DESC
-5. 상승: price_change_pct > 0
-6. 하락: price_change_pct < 0
-7. SELECT * 사용하지 말 것. 관련 있는 칼럼만을 선택
-8. 모든 컬럼/테이블명은 위에 설명된 이름만 사용
-9. market 이 KOSPI인 경우 ticker LIKE '%.KS', KOSDAQ인 경우 ticker LIKE '%.KQ'로 필터링
-
-<krx_stockprice 칼럼 설명>
-- date: 거래 일자 (YYYY-MM-DD)
-- adj_close: 당일 수정 종가
-- close: 당일 종가
-- high: 당일 최고가
-- low: 당일 최저가
-- open: 당일 시가
-- volume: 당일 거래량 (주식 수)
-- ticker: 종목 코드 (예: 005930.KS)
-- price_change_pct: 전일 대비 등락률 (%)
-- volume_change_pct: 전일 대비 거래량 변화율 (%)
-- ma_5, ma_20, ma_60: 5일, 20일, 60일 단순 이동평균선
-- ma_vol_20: 20일 거래량 평균
-- volume_ratio_20: 현재 거래량 / 20일 평균 거래량
-- rsi_14: 14일 기준 RSI
-- signal_bollinger_upper: 종가가 상단 밴드 초과시 True
-- signal_bollinger_lower: 종가가 하단 밴드 이하시 True
-- golden_cross: 골든크로스 발생시 True
-- dead_cross: 데드크로스 발생시 True
+{rules}
+- 오류 쿼리가 krx_daily_snapshot 또는 krx_daily_events를 사용한 경우 해당 테이블을 유지
+
+{columns}
 
 수정된 SQL:
 """
@@ -262,8 +211,22 @@ news_summary_prompt = """
 기사 출처: {url}
 """
 
+daily_digest_prompt = """
+다음은 {company_name} 관련 {date} 뉴스 기사들입니다. 기사별 요약과 그날의 핵심 사실을 정리해 주세요.
+- 기사별 요약은 3줄 이내로, 핵심 이슈와 숫자 데이터를 유지합니다.
+- 핵심 사실은 나중에 주간 보고서에 쓰이므로 숫자/고유명사가 드러나는 한 문장씩, 최대 5개 작성합니다.
+- 불필요한 수식어나 사설은 제외합니다.
+
+{articles}
+
+아래 형식의 JSON으로만 답하세요 (index는 기사 번호):
+```json
+{{"articles": [{{"index": 1, "summary": "기사 요약"}}], "key_facts": ["핵심 사실"]}}
+```
+"""
+
 weekly_report_prompt = """
-당신은 금융 데이터 분석가입니다. 아래 제공된 특정 회사의 지난 일주일간 뉴스 기사들을 바탕으로, 회사의 주요 동향, 긍정적/부정적 이슈, 그리고 향후 전망을 간결하게 요약하는 주간 보고서를 작성해주세요.
+당신은 금융 데이터 분석가입니다. 아래 제공된 특정 회사의 지난 일주일간 일별 뉴스 요약을 바탕으로, 회사의 주요 동향, 긍정적/부정적 이슈, 그리고 향후 전망을 간결하게 요약하는 주간 보고서를 작성해주세요.
 
 보고서는 다음 형식에 맞춰 개조식으로 작성해주세요:
 - **주요 동향:**
@@ -274,9 +237,25 @@ weekly_report_prompt = """
 [회사명]
 {company_name}
 
-[지난 7일간 뉴스 기사 목록]
+[지난 7일간 일별 뉴스 요약]
 {news_articles}
 ---
 
 위 정보를 바탕으로 주간 보고서를 작성해주세요:
-"""
\ No newline at end of file
+"""
+
+history_summary_prompt = """
+다음은 사용자와 주식 정보 어시스턴트의 이전 대화 요약과, 요약에 새로 합칠 대화입니다.
+두 내용을 합쳐 이후 질문을 이해하는 데 필요한 정보만 남긴 요약을 작성해 주세요.
+- 사용자가 관심을 보인 회사명, 종목, 날짜, 지표를 유지합니다.
+- 답변에 나온 숫자는 핵심 값만 남기고 표나 목록은 생략합니다.
+- 5줄 이내로 작성합니다.
+
+이전 요약:
+{summary}
+
+새로 합칠 대화:
+{conversation}
+
+요약:
+"""
@@ -0,0 +1,63 @@
+"""
+Generated SQL log
+LLM이 생성/수정한 SQL을 JSON lines로 남겨 인덱스 점검(EXPLAIN) 코퍼스로 사용
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config.config import Config
+
+_lock = threading.Lock()
+
+
+def append_query_log(sql: str, user_query: str = "", stage: str = "generate", error: str = "", path: Optional[str] = None):
+    """생성된 SQL 한 건 기록 (실패해도 에이전트 흐름에는 영향 없음)"""
+    config = Config()
+    if not config.SQL_QUERY_LOG_ENABLED or not sql:
+        return
+    path = path or config.SQL_QUERY_LOG_PATH
+    entry = {
+        "ts": datetime.now().isoformat(timespec="seconds"),
+        "stage": stage,
+        "user_query": user_query,
+        "sql": sql,
+        "error": error,
+    }
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with _lock, open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"[query_log] SQL 로그 기록 실패: {e}")
+
+
+def read_query_log(path: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+    """기록된 SQL 읽기 (같은 SQL은 한 번만, 최근 기록 우선)"""
+    path = path or Config().SQL_QUERY_LOG_PATH
+    if not os.path.exists(path):
+        return []
+
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+
+    seen, unique = set(), []
+    for entry in reversed(entries):
+        key = " ".join(entry.get("sql", "").split()).lower()
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(entry)
+        if limit and len(unique) >= limit:
+            break
+    return unique
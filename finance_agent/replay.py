@@ -0,0 +1,194 @@
+"""
+Record / replay
+LLM 호출, HTTP 요청, DB 조회의 요청/응답/소요 시간을 cassette(JSON lines)에 기록하고
+외부 접속 없이 그대로 재생합니다. (오프라인 프로파일링/부하 테스트용)
+
+REPLAY_MODE=off     : 기록/재생 없이 실제 호출 (기본값)
+REPLAY_MODE=record  : 실제로 호출하고 결과를 REPLAY_CASSETTE에 추가 기록
+REPLAY_MODE=replay  : 기록된 응답 반환 (기록된 소요 시간 x REPLAY_LATENCY_SCALE 만큼 대기)
+REPLAY_KINDS        : 기록/재생할 호출 종류 (llm, http, sql), 나머지는 실제 호출
+"""
+
+import os
+import copy
+import json
+import time
+import hashlib
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from config.config import Config
+from finance_agent.tracing import get_tracer
+
+REPLAY_MODES = ("off", "record", "replay")
+REPLAY_KIND_NAMES = ("llm", "http", "sql")
+
+
+class ReplayMissError(RuntimeError):
+    """replay 모드에서 요청에 해당하는 기록이 없음"""
+
+
+def request_key(kind: str, name: str, request: Dict) -> str:
+    payload = json.dumps([kind, name, request], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """요청 단위 기록/재생 저장소
+
+    같은 요청이 여러 번 기록되어 있으면 기록 순서대로 돌아가며 반환합니다.
+    일치하는 요청이 없으면(프롬프트에 오늘 날짜가 들어가는 경우 등) strict가 아닐 때
+    같은 이름(llm.sql_generation, db.execute_query ...)의 기록을 순서대로 대신 사용합니다.
+    """
+
+    def __init__(self, path: Optional[str] = None, mode: Optional[str] = None,
+                 latency_scale: Optional[float] = None, strict: Optional[bool] = None,
+                 kinds: Optional[List[str]] = None):
+        self.config = Config()
+        self.mode = (mode or self.config.REPLAY_MODE).lower()
+        if self.mode not in REPLAY_MODES:
+            raise ValueError(f"REPLAY_MODE는 {', '.join(REPLAY_MODES)} 중 하나여야 합니다: {self.mode}")
+        self.path = path or self.config.REPLAY_CASSETTE
+        self.latency_scale = self.config.REPLAY_LATENCY_SCALE if latency_scale is None else latency_scale
+        self.strict = self.config.REPLAY_STRICT if strict is None else strict
+        if kinds is None:
+            kinds = [k.strip() for k in self.config.REPLAY_KINDS.split(",") if k.strip()]
+        unknown = set(kinds) - set(REPLAY_KIND_NAMES)
+        if unknown:
+            raise ValueError(f"REPLAY_KINDS는 {', '.join(REPLAY_KIND_NAMES)} 중에서 지정해야 합니다: {', '.join(sorted(unknown))}")
+        self.kinds = frozenset(kinds)
+
+        self._lock = threading.Lock()
+        self._by_key: Dict[str, List[Dict]] = defaultdict(list)
+        self._by_name: Dict[str, List[Dict]] = defaultdict(list)
+        self._cursors: Dict[str, int] = defaultdict(int)
+        if self.mode == "replay":
+            self._load()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def replays(self, kind: str) -> bool:
+        """이 종류의 호출을 기록된 응답으로 대신하는지 (replay 모드이고 REPLAY_KINDS에 포함)"""
+        return self.replaying and kind in self.kinds
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"[Replay] cassette 파일이 없습니다: {self.path}")
+        count = 0
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                self._by_key[entry["key"]].append(entry)
+                self._by_name[f"{entry['kind']}:{entry['name']}"].append(entry)
+                count += 1
+        print(f"[Replay] cassette 로드: {self.path} ({count}건)")
+
+    # ----------------- 호출 -----------------
+    def call(self, kind: str, name: str, request: Dict, live: Callable[[], Any],
+             encode: Optional[Callable[[Any], Any]] = None, decode: Optional[Callable[[Any], Any]] = None,
+             error_type: Type[Exception] = RuntimeError) -> Any:
+        """live()를 그대로 실행하거나(off), 실행 후 기록하거나(record), 기록된 응답을 반환(replay)
+
+        encode/decode: 응답 객체 ↔ JSON 직렬화 가능한 값 변환 (없으면 그대로 저장)
+        error_type: 기록된 예외를 재생할 때 발생시킬 예외 타입 (메시지는 기록 당시와 동일)
+        """
+        if self.mode == "off" or kind not in self.kinds:
+            return live()
+        if self.replaying:
+            return self._replay(kind, name, request, decode, error_type)
+        return self._record(kind, name, request, live, encode)
+
+    def _record(self, kind: str, name: str, request: Dict, live: Callable[[], Any], encode):
+        entry = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "kind": kind,
+            "name": name,
+            "key": request_key(kind, name, request),
+            "request": request,
+        }
+        started = time.perf_counter()
+        try:
+            response = live()
+        except Exception as e:
+            entry["duration"] = round(time.perf_counter() - started, 6)
+            entry["error"] = {"type": type(e).__name__, "message": str(e)}
+            self._append(entry)
+            raise
+        entry["duration"] = round(time.perf_counter() - started, 6)
+        entry["response"] = encode(response) if encode else response
+        self._append(entry)
+        return response
+
+    def _append(self, entry: Dict):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        except OSError as e:
+            print(f"[Replay] cassette 기록 실패: {e}")
+
+    def _next(self, bucket: str, entries: List[Dict]) -> Dict:
+        with self._lock:
+            index = self._cursors[bucket]
+            self._cursors[bucket] = index + 1
+        return entries[index % len(entries)]
+
+    def _lookup(self, kind: str, name: str, request: Dict) -> Optional[Dict]:
+        key = request_key(kind, name, request)
+        if self._by_key.get(key):
+            return self._next(key, self._by_key[key])
+        by_name = self._by_name.get(f"{kind}:{name}")
+        if self.strict or not by_name:
+            return None
+        print(f"[Replay] 일치하는 기록이 없어 기록 순서로 대체합니다: {name}")
+        return self._next(f"{kind}:{name}", by_name)
+
+    def _replay(self, kind: str, name: str, request: Dict, decode, error_type: Type[Exception]):
+        entry = self._lookup(kind, name, request)
+        if entry is None:
+            raise ReplayMissError(f"[Replay] 기록되지 않은 요청입니다: {name} {json.dumps(request, ensure_ascii=False, default=str)[:200]}")
+
+        span = get_tracer().current_span()
+        if span is not None:
+            span.set(replayed=True)
+        delay = entry.get("duration", 0.0) * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+
+        if entry.get("error"):
+            raise error_type(entry["error"]["message"])
+        response = copy.deepcopy(entry.get("response"))
+        return decode(response) if decode else response
+
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Cassette:
+    """프로세스 공용 Cassette (REPLAY_MODE / REPLAY_CASSETTE 기준)"""
+    global _cassette
+    if _cassette is None:
+        with _cassette_lock:
+            if _cassette is None:
+                _cassette = Cassette()
+    return _cassette
+
+
+def set_cassette(cassette: Optional[Cassette]) -> Optional[Cassette]:
+    """공용 Cassette 교체 (스크립트에서 모드/경로를 바꿀 때), 이전 값을 반환"""
+    global _cassette
+    with _cassette_lock:
+        previous, _cassette = _cassette, cassette
+    return previous
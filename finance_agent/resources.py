@@ -0,0 +1,46 @@
+"""
+Shared resources
+프로세스 공용 구성 요소 (종목 목록, DB 커넥션 풀).
+노드/에이전트/NewsBot이 각자 만들지 않고 처음 만든 것을 함께 사용해,
+에이전트를 여러 개 만들거나 Streamlit 방문자가 늘어도 CSV 로드/커넥션 풀은 프로세스당 1개
+(LLM 클라이언트는 finance_agent/llm.py에서 모델/temperature별로 공유)
+"""
+
+import threading
+from typing import TYPE_CHECKING, Callable, Dict
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+TICKERS_CSV = "./data/krx_tickers.csv"
+
+_resources: Dict[str, object] = {}
+_resources_lock = threading.Lock()
+
+
+def _shared(key: str, factory: Callable[[], object]):
+    resource = _resources.get(key)
+    if resource is None:
+        with _resources_lock:
+            resource = _resources.get(key)
+            if resource is None:
+                resource = _resources[key] = factory()
+    return resource
+
+
+def get_company_df() -> "pd.DataFrame":
+    """종목 목록 (ticker, 회사명), 읽기 전용으로 사용"""
+    import pandas as pd
+    return _shared("company_df", lambda: pd.read_csv(TICKERS_CSV))
+
+
+def get_database_manager():
+    """주가 DB (SQL_EXECUTION_BACKEND 기준) 공용 DatabaseManager"""
+    from finance_agent.database import DatabaseManager
+    return _shared("database_manager", DatabaseManager)
+
+
+def get_news_db():
+    """뉴스 DB 공용 NewsDatabaseManager"""
+    from finance_agent.news_db_manager import NewsDatabaseManager
+    return _shared("news_db", NewsDatabaseManager)
@@ -0,0 +1,175 @@
+"""
+Table definitions
+주가 DB 테이블/칼럼 정의 (updater, SQL 생성/검증에서 공통 사용)
+"""
+
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # 타입 표기용 (pandas는 updater처럼 실제로 쓰는 모듈에서만 import)
+    import pandas as pd
+
+STOCKPRICE_TABLE = "krx_stockprice"
+SNAPSHOT_TABLE = "krx_daily_snapshot"
+EVENTS_TABLE = "krx_daily_events"
+
+MARKET_BY_SUFFIX = {".KS": "KOSPI", ".KQ": "KOSDAQ"}
+
+STOCKPRICE_COLUMNS = {
+    "date": "거래 일자 (YYYY-MM-DD)",
+    "adj_close": "당일 수정 종가",
+    "close": "당일 종가",
+    "high": "당일 최고가",
+    "low": "당일 최저가",
+    "open": "당일 시가",
+    "volume": "당일 거래량 (주식 수)",
+    "ticker": "종목 코드 (예: 005930.KS, 016790.KQ)",
+    "price_change_pct": "전일 대비 등락률 (%)",
+    "volume_change_pct": "전일 대비 거래량 변화율 (%)",
+    "ma_5": "5일 단순 이동평균선",
+    "ma_20": "20일 단순 이동평균선",
+    "ma_60": "60일 단순 이동평균선",
+    "ma_vol_20": "20일 거래량 평균",
+    "volume_ratio_20": "현재 거래량 / 20일 평균 거래량",
+    "rsi_14": "14일 기준 RSI",
+    "bollinger_mid": "20일 이동평균선",
+    "bollinger_upper": "볼린저 상단 밴드",
+    "bollinger_lower": "볼린저 하단 밴드",
+    "signal_bollinger_upper": "종가가 상단 밴드 초과시 True",
+    "signal_bollinger_lower": "종가가 하단 밴드 이하시 True",
+    "ma_diff": "ma_5 - ma_20",
+    "prev_diff": "전날의 ma_diff",
+    "golden_cross": "골든크로스 발생시 True",
+    "dead_cross": "데드크로스 발생시 True",
+}
+
+SNAPSHOT_COLUMNS = {
+    "date": "거래 일자 (YYYY-MM-DD)",
+    "ticker": "종목 코드",
+    "market": "시장 (KOSPI, KOSDAQ, KONEX)",
+    "adj_close": "당일 수정 종가",
+    "price_change_pct": "전일 대비 등락률 (%)",
+    "volume": "당일 거래량",
+    "rsi_14": "14일 기준 RSI",
+    "volume_rank": "전체 시장 거래량 순위 (1 = 최대)",
+    "gain_rank": "전체 시장 상승률 순위 (1 = 최대 상승)",
+    "loss_rank": "전체 시장 하락률 순위 (1 = 최대 하락)",
+    "price_rank": "전체 시장 수정 종가 순위 (1 = 가장 비싼)",
+    "market_volume_rank": "시장 내 거래량 순위",
+    "market_gain_rank": "시장 내 상승률 순위",
+    "market_loss_rank": "시장 내 하락률 순위",
+    "market_price_rank": "시장 내 수정 종가 순위",
+}
+
+EVENT_TYPES = {
+    "golden_cross": "골든크로스 발생",
+    "dead_cross": "데드크로스 발생",
+    "bollinger_upper": "종가가 볼린저 상단 밴드 초과",
+    "bollinger_lower": "종가가 볼린저 하단 밴드 미만",
+    "rsi_overbought": "RSI 70 이상 (과매수)",
+    "rsi_oversold": "RSI 30 이하 (과매도)",
+}
+
+EVENT_COLUMNS = {
+    "date": "거래 일자 (YYYY-MM-DD)",
+    "event_type": "이벤트 종류 (" + ", ".join(EVENT_TYPES) + ")",
+    "ticker": "종목 코드",
+    "market": "시장 (KOSPI, KOSDAQ, KONEX)",
+    "adj_close": "당일 수정 종가",
+    "price_change_pct": "전일 대비 등락률 (%)",
+    "rsi_14": "14일 기준 RSI",
+}
+
+TABLE_COLUMNS = {
+    STOCKPRICE_TABLE: STOCKPRICE_COLUMNS,
+    SNAPSHOT_TABLE: SNAPSHOT_COLUMNS,
+    EVENTS_TABLE: EVENT_COLUMNS,
+}
+
+STOCKPRICE_DDL = f"""
+CREATE TABLE IF NOT EXISTS {STOCKPRICE_TABLE} (
+    date DATE NOT NULL,
+    adj_close DOUBLE,
+    close DOUBLE,
+    high DOUBLE,
+    low DOUBLE,
+    open DOUBLE,
+    volume BIGINT,
+    ticker VARCHAR(16) NOT NULL,
+    price_change_pct DOUBLE,
+    volume_change_pct DOUBLE,
+    ma_5 DOUBLE,
+    ma_20 DOUBLE,
+    ma_60 DOUBLE,
+    ma_vol_20 DOUBLE,
+    volume_ratio_20 DOUBLE,
+    rsi_14 DOUBLE,
+    bollinger_mid DOUBLE,
+    bollinger_upper DOUBLE,
+    bollinger_lower DOUBLE,
+    signal_bollinger_upper BOOLEAN,
+    signal_bollinger_lower BOOLEAN,
+    ma_diff DOUBLE,
+    prev_diff DOUBLE,
+    golden_cross BOOLEAN,
+    dead_cross BOOLEAN,
+    UNIQUE KEY uq_ticker_date (ticker, date)
+)
+"""
+
+SNAPSHOT_DDL = f"""
+CREATE TABLE IF NOT EXISTS {SNAPSHOT_TABLE} (
+    date DATE NOT NULL,
+    ticker VARCHAR(16) NOT NULL,
+    market VARCHAR(8) NOT NULL,
+    adj_close DOUBLE,
+    price_change_pct DOUBLE,
+    volume BIGINT,
+    rsi_14 DOUBLE,
+    volume_rank INT,
+    gain_rank INT,
+    loss_rank INT,
+    price_rank INT,
+    market_volume_rank INT,
+    market_gain_rank INT,
+    market_loss_rank INT,
+    market_price_rank INT,
+    PRIMARY KEY (date, ticker),
+    KEY idx_volume_rank (date, volume_rank),
+    KEY idx_gain_rank (date, gain_rank),
+    KEY idx_loss_rank (date, loss_rank),
+    KEY idx_price_rank (date, price_rank),
+    KEY idx_market_volume_rank (date, market, market_volume_rank),
+    KEY idx_market_gain_rank (date, market, market_gain_rank),
+    KEY idx_market_loss_rank (date, market, market_loss_rank),
+    KEY idx_market_price_rank (date, market, market_price_rank)
+)
+"""
+
+EVENTS_DDL = f"""
+CREATE TABLE IF NOT EXISTS {EVENTS_TABLE} (
+    date DATE NOT NULL,
+    event_type VARCHAR(24) NOT NULL,
+    ticker VARCHAR(16) NOT NULL,
+    market VARCHAR(8) NOT NULL,
+    adj_close DOUBLE,
+    price_change_pct DOUBLE,
+    rsi_14 DOUBLE,
+    PRIMARY KEY (date, event_type, ticker),
+    KEY idx_ticker_date (ticker, date)
+)
+"""
+
+
+def ticker_market(tickers: "pd.Series") -> "pd.Series":
+    """종목 코드 접미사로 시장 구분 (.KS → KOSPI, .KQ → KOSDAQ, 그 외 KONEX)"""
+    suffix = tickers.astype(str).str[-3:]
+    return suffix.map(MARKET_BY_SUFFIX).fillna("KONEX")
+
+
+_MARKET_LIKE = re.compile(r"\b((?:\w+\.)?)ticker\s+LIKE\s+'%(\.K[SQ])'", re.IGNORECASE)
+
+
+def rewrite_market_filter(sql: str) -> str:
+    """ticker LIKE '%.KS' → market = 'KOSPI' (market stored 칼럼 인덱스를 타도록)"""
+    return _MARKET_LIKE.sub(lambda m: f"{m.group(1)}market = '{MARKET_BY_SUFFIX[m.group(2).upper()]}'", sql)
@@ -0,0 +1,185 @@
+"""
+Schema & index management
+krx_stockprice / News 테이블의 인덱스, 칼럼 타입 마이그레이션과 생성 쿼리 EXPLAIN 점검
+"""
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+
+from config.config import Config
+from finance_agent.query_log import read_query_log
+from finance_agent.schema import STOCKPRICE_TABLE
+
+NEWS_TABLE = "News"
+
+# 시장 구분 stored 칼럼: ticker LIKE '%.KS' 대신 market = 'KOSPI'로 인덱스 사용
+MARKET_COLUMN_DDL = (
+    "market VARCHAR(8) AS (CASE WHEN ticker LIKE '%.KS' THEN 'KOSPI' "
+    "WHEN ticker LIKE '%.KQ' THEN 'KOSDAQ' ELSE 'KONEX' END) STORED"
+)
+
+# 테이블별 필요한 인덱스: 이름 → 칼럼
+STOCKPRICE_INDEXES = {
+    "idx_date_ticker": ["date", "ticker"],
+    "idx_date_volume": ["date", "volume"],
+    "idx_date_change": ["date", "price_change_pct"],
+    "idx_market_date": ["market", "date"],
+}
+NEWS_INDEXES = {
+    "idx_date_id": ["date", "id"],
+}
+
+# 칼럼 → (목표 타입, INFORMATION_SCHEMA.DATA_TYPE 기준 이미 만족하는 타입들)
+STOCKPRICE_COLUMN_TYPES = {
+    "ticker": ("VARCHAR(16) NOT NULL", {"varchar", "char"}),
+    "date": ("DATE NOT NULL", {"date"}),
+    "volume": ("BIGINT", {"bigint", "int"}),
+    "signal_bollinger_upper": ("TINYINT(1)", {"tinyint"}),
+    "signal_bollinger_lower": ("TINYINT(1)", {"tinyint"}),
+    "golden_cross": ("TINYINT(1)", {"tinyint"}),
+    "dead_cross": ("TINYINT(1)", {"tinyint"}),
+}
+NEWS_COLUMN_TYPES = {
+    "date": ("CHAR(8) NOT NULL", {"char", "varchar"}),
+}
+
+
+class SchemaManager:
+    """인덱스/칼럼 타입 점검 및 마이그레이션"""
+
+    def __init__(self):
+        self.config = Config()
+        self.engines = {
+            self.config.MYSQL_DATABASE: self._create_engine(self.config.MYSQL_DATABASE),
+            self.config.MYSQL_DATABASE2: self._create_engine(self.config.MYSQL_DATABASE2),
+        }
+
+    def _create_engine(self, database: str):
+        return create_engine(
+            f"mysql+pymysql://{self.config.MYSQL_USER}:{self.config.MYSQL_PASSWORD}"
+            f"@{self.config.MYSQL_HOST}:{self.config.MYSQL_PORT}/{database}"
+        )
+
+    # ----------------- 조회 -----------------
+    def get_columns(self, database: str, table: str) -> Dict[str, str]:
+        query = text("""
+            SELECT COLUMN_NAME, DATA_TYPE
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = :schema AND TABLE_NAME = :table
+            ORDER BY ORDINAL_POSITION
+        """)
+        with self.engines[database].connect() as conn:
+            rows = conn.execute(query, {"schema": database, "table": table}).fetchall()
+        return {row.COLUMN_NAME: row.DATA_TYPE.lower() for row in rows}
+
+    def get_indexes(self, database: str, table: str) -> Dict[str, List[str]]:
+        query = text("""
+            SELECT INDEX_NAME, GROUP_CONCAT(COLUMN_NAME ORDER BY SEQ_IN_INDEX) AS cols
+            FROM INFORMATION_SCHEMA.STATISTICS
+            WHERE TABLE_SCHEMA = :schema AND TABLE_NAME = :table
+            GROUP BY INDEX_NAME
+        """)
+        with self.engines[database].connect() as conn:
+            rows = conn.execute(query, {"schema": database, "table": table}).fetchall()
+        return {row.INDEX_NAME: row.cols.split(",") for row in rows}
+
+    def inspect(self) -> str:
+        """현재 칼럼 타입/인덱스 보고서"""
+        lines = []
+        for database, table in [(self.config.MYSQL_DATABASE, STOCKPRICE_TABLE), (self.config.MYSQL_DATABASE2, NEWS_TABLE)]:
+            lines.append(f"[{database}.{table}]")
+            for name, data_type in self.get_columns(database, table).items():
+                lines.append(f"  - {name}: {data_type}")
+            lines.append("  인덱스:")
+            for name, cols in self.get_indexes(database, table).items():
+                lines.append(f"  - {name} ({', '.join(cols)})")
+        return "\n".join(lines)
+
+    # ----------------- 마이그레이션 -----------------
+    def _plan_table(self, database: str, table: str, column_types: Dict, indexes: Dict[str, List[str]], add_market: bool) -> List[str]:
+        columns = self.get_columns(database, table)
+        existing_indexes = self.get_indexes(database, table)
+        if not columns:
+            return []
+
+        clauses = []
+        ticker_is_text = "text" in columns.get("ticker", "")
+
+        # TEXT 칼럼에 걸린 prefix 유니크 키는 타입 변경 후 전체 칼럼 키로 다시 생성
+        if ticker_is_text and "uq_ticker_date" in existing_indexes:
+            clauses.append("DROP INDEX uq_ticker_date")
+
+        for column, (target, satisfied) in column_types.items():
+            if column in columns and columns[column] not in satisfied:
+                clauses.append(f"MODIFY `{column}` {target}")
+
+        if ticker_is_text and "uq_ticker_date" in existing_indexes:
+            clauses.append("ADD UNIQUE KEY uq_ticker_date (ticker, date)")
+
+        if add_market and "market" not in columns:
+            clauses.append(f"ADD COLUMN {MARKET_COLUMN_DDL}")
+
+        existing_column_sets = [cols for cols in existing_indexes.values()]
+        for name, cols in indexes.items():
+            if name in existing_indexes or any(existing[:len(cols)] == cols for existing in existing_column_sets):
+                continue
+            if any(c not in columns and not (c == "market" and add_market) for c in cols):
+                continue
+            clauses.append(f"ADD INDEX {name} ({', '.join(cols)})")
+
+        if not clauses:
+            return []
+        # 하나의 ALTER로 묶어 테이블 재작성을 한 번만 수행
+        return [f"ALTER TABLE `{table}` " + ", ".join(clauses)]
+
+    def plan(self) -> Dict[str, List[str]]:
+        """데이터베이스별 실행할 ALTER 문 목록"""
+        return {
+            self.config.MYSQL_DATABASE: self._plan_table(
+                self.config.MYSQL_DATABASE, STOCKPRICE_TABLE, STOCKPRICE_COLUMN_TYPES, STOCKPRICE_INDEXES, add_market=True
+            ),
+            self.config.MYSQL_DATABASE2: self._plan_table(
+                self.config.MYSQL_DATABASE2, NEWS_TABLE, NEWS_COLUMN_TYPES, NEWS_INDEXES, add_market=False
+            ),
+        }
+
+    def migrate(self, dry_run: bool = False) -> List[str]:
+        executed = []
+        for database, statements in self.plan().items():
+            for statement in statements:
+                print(f"[SchemaManager] {database}: {statement}")
+                if not dry_run:
+                    with self.engines[database].connect() as conn:
+                        conn.execute(text(statement))
+                        conn.commit()
+                executed.append(statement)
+        return executed
+
+    # ----------------- EXPLAIN 점검 -----------------
+    def explain(self, sql: str) -> List[Dict]:
+        with self.engines[self.config.MYSQL_DATABASE].connect() as conn:
+            result = conn.execute(text(f"EXPLAIN {sql}"))
+            return [dict(row._mapping) for row in result]
+
+    def find_full_scans(self, log_path: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        """기록된 생성 쿼리를 EXPLAIN하여 풀 스캔(type=ALL)이 남은 쿼리 목록 반환"""
+        report = []
+        for entry in read_query_log(log_path, limit):
+            sql = entry["sql"].strip().rstrip(";")
+            if not sql.upper().startswith(("SELECT", "WITH")):
+                continue
+            try:
+                plan = self.explain(sql)
+            except Exception as e:
+                report.append({"sql": sql, "user_query": entry.get("user_query", ""), "error": str(e)})
+                continue
+            scans = [row for row in plan if str(row.get("type", "")).upper() == "ALL"]
+            if scans:
+                report.append({
+                    "sql": sql,
+                    "user_query": entry.get("user_query", ""),
+                    "tables": [row.get("table") for row in scans],
+                    "rows": sum(int(row.get("rows") or 0) for row in scans),
+                })
+        return report
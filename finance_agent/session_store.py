@@ -0,0 +1,257 @@
+"""
+Session store
+세션별 대화 상태(ChatSession)를 보관하고 크기를 제한합니다.
+
+- 대화 기록이 SESSION_HISTORY_TOKEN_CAP을 넘으면 오래된 대화를 요약 1건(SystemMessage)으로 접고
+  최근 SESSION_HISTORY_KEEP_TOKENS만 유지 → 대화가 길어져도 턴당 프롬프트 크기/지연이 일정
+- SESSION_IDLE_TTL_SECONDS 동안 사용되지 않은 세션은 제거하고, 세션 수(SESSION_STORE_MAX_SESSIONS)나
+  대화 기록 메모리 추정치(SESSION_STORE_MEMORY_MB)가 상한을 넘으면 가장 오래 사용되지 않은 세션부터 제거 (LRU)
+"""
+
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from langchain_core.messages import SystemMessage
+
+from config.config import Config
+from finance_agent.prompt_builder import compact_history, estimate_tokens
+
+# 메모리 추정용 고정 비용 (langchain 메시지 객체 1개 ≈ 760B, tracemalloc 측정)
+SESSION_OVERHEAD_BYTES = 2048
+MESSAGE_OVERHEAD_BYTES = 800
+# extractive 요약에서 접히는 메시지 1건당 남기는 글자 수
+SUMMARY_LINE_CHARS = 80
+
+
+@dataclass
+class ChatSession:
+    """사용자 한 명의 대화 상태"""
+    session_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    active_mode: str = "finance"
+    chat_history: List = field(default_factory=list)
+    # 같은 세션의 요청은 순서대로 처리 (API에서 여러 요청이 동시에 들어올 때)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    last_active: float = field(default_factory=time.monotonic, repr=False, compare=False)
+
+    def approx_bytes(self) -> int:
+        return SESSION_OVERHEAD_BYTES + sum(
+            MESSAGE_OVERHEAD_BYTES + len(str(msg.content).encode("utf-8")) for msg in self.chat_history
+        )
+
+
+class HistoryCompactor:
+    """오래된 대화를 요약 1건으로 접어 대화 기록 토큰 수를 상한 안으로 유지"""
+
+    def __init__(self, summarizer: Optional[Callable[[str, List], str]] = None):
+        self.config = Config()
+        self.max_tokens = self.config.SESSION_HISTORY_TOKEN_CAP
+        self.keep_tokens = min(self.config.SESSION_HISTORY_KEEP_TOKENS, self.max_tokens)
+        self.summary_tokens = self.config.SESSION_SUMMARY_TOKEN_CAP
+        if summarizer is None:
+            summarizer = self._llm_summary if self.config.SESSION_SUMMARY_MODE == "llm" else self._extractive_summary
+        self.summarizer = summarizer
+        self._llm = None
+
+    @staticmethod
+    def message_tokens(msg) -> int:
+        return estimate_tokens(str(msg.content)) + 4
+
+    def compact(self, history: List) -> List:
+        """상한 이하면 그대로, 넘으면 [요약 SystemMessage] + 최근 대화 (질문/답변 쌍 단위) 반환"""
+        if sum(self.message_tokens(m) for m in history) <= self.max_tokens:
+            return history
+
+        has_summary = bool(history) and getattr(history[0], "type", "") == "system"
+        summary = str(history[0].content) if has_summary else ""
+        messages = history[1:] if has_summary else list(history)
+
+        kept, used = 0, 0
+        for msg in reversed(messages):
+            cost = self.message_tokens(msg)
+            if used + cost > self.keep_tokens:
+                break
+            used += cost
+            kept += 1
+        kept -= kept % 2
+        split = len(messages) - kept
+        folded, recent = messages[:split], messages[split:]
+        if not folded:
+            return history
+        return [SystemMessage(content=self.summarizer(summary, folded))] + recent
+
+    def _trim(self, lines: List[str]) -> str:
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > self.summary_tokens:
+            lines.pop(0)
+        return "\n".join(lines)
+
+    def _extractive_summary(self, summary: str, messages: List) -> str:
+        """LLM 호출 없이 접히는 메시지의 앞부분을 한 줄씩 이어 붙이고, 예산을 넘으면 오래된 줄부터 제거"""
+        lines = summary.splitlines() if summary else []
+        for msg in messages:
+            role = "사용자" if getattr(msg, "type", "") == "human" else "어시스턴트"
+            content = " ".join(str(msg.content).split())
+            if len(content) > SUMMARY_LINE_CHARS:
+                content = content[:SUMMARY_LINE_CHARS] + "…"
+            lines.append(f"{role}: {content}")
+        return self._trim(lines)
+
+    def _llm_summary(self, summary: str, messages: List) -> str:
+        from finance_agent.llm import LLM
+        from finance_agent.prompts import history_summary_prompt
+
+        if self._llm is None:
+            self._llm = LLM()
+        prompt = history_summary_prompt.format(
+            summary=summary or "(없음)",
+            conversation=compact_history(messages, max_tokens=self.max_tokens),
+        )
+        try:
+            text = self._llm.run(prompt, tag="history_summary")
+        except Exception as e:
+            print(f"[HistoryCompactor] 요약 실패, 앞부분만 남깁니다: {e}")
+            return self._extractive_summary(summary, messages)
+        return self._trim(str(text).strip().splitlines())
+
+
+class SessionStore:
+    """session_id → ChatSession (LRU + 유휴 만료 + 세션 수/메모리 상한, 여러 요청 스레드가 공유)
+
+    on_evict: 세션이 제거될 때 session_id로 호출 (NewsBot 대화 상태 정리 등)
+    loader: 이 프로세스에 없는 session_id로 요청이 오면 새 ChatSession을 받아 저장된 상태를 채움 (체크포인트 복원)
+    """
+
+    def __init__(self, max_sessions: Optional[int] = None, idle_ttl: Optional[float] = None,
+                 memory_mb: Optional[float] = None, on_evict: Optional[Callable[[str], None]] = None,
+                 loader: Optional[Callable[[ChatSession], None]] = None):
+        self.config = Config()
+        self.max_sessions = max_sessions or self.config.SESSION_STORE_MAX_SESSIONS
+        self.idle_ttl = self.config.SESSION_IDLE_TTL_SECONDS if idle_ttl is None else idle_ttl
+        self.memory_budget = int((memory_mb or self.config.SESSION_STORE_MEMORY_MB) * 1024 * 1024)
+        self.on_evict = on_evict
+        self.loader = loader
+        self.evicted = 0
+
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, session_id: Optional[str] = None) -> ChatSession:
+        """세션 조회, 없으면 생성 (session_id가 없으면 새 id 발급)"""
+        with self._lock:
+            evicted = self._expire()
+            session = self._sessions.get(session_id) if session_id else None
+            if session is not None:
+                self._sessions.move_to_end(session.session_id)
+                session.last_active = time.monotonic()
+        self._notify(evicted)
+        if session is not None:
+            return session
+
+        session = ChatSession(session_id=session_id) if session_id else ChatSession()
+        if session_id and self.loader:
+            # 복원(DB 조회)은 저장소 lock 밖에서 수행
+            try:
+                self.loader(session)
+            except Exception as e:
+                print(f"[SessionStore] 세션 복원 실패 ({session_id}): {e}")
+        with self._lock:
+            # 복원 중 다른 요청이 같은 세션을 먼저 만들었으면 그 세션을 사용
+            existing = self._sessions.get(session.session_id)
+            if existing is not None:
+                self._sessions.move_to_end(existing.session_id)
+                existing.last_active = time.monotonic()
+                return existing
+            self._sessions[session.session_id] = session
+            self._resize(session)
+            evicted = self._enforce_limits(keep=session.session_id)
+        self._notify(evicted)
+        return session
+
+    def update(self, session: ChatSession):
+        """대화 한 턴이 끝난 뒤 호출: 세션 크기를 다시 계산하고 메모리 상한을 적용"""
+        with self._lock:
+            if session.session_id not in self._sessions:
+                return
+            self._sessions.move_to_end(session.session_id)
+            session.last_active = time.monotonic()
+            self._resize(session)
+            evicted = self._enforce_limits(keep=session.session_id)
+        self._notify(evicted)
+
+    def find(self, session_id: str) -> Optional[ChatSession]:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def drop(self, session_id: str) -> bool:
+        with self._lock:
+            dropped = self._remove(session_id)
+        if dropped:
+            self._notify([session_id], evicted=False)
+        return dropped
+
+    def session_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._sessions)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    # ----------------- 내부 (self._lock 안에서 호출) -----------------
+    def _resize(self, session: ChatSession):
+        size = session.approx_bytes()
+        self._total_bytes += size - self._sizes.get(session.session_id, 0)
+        self._sizes[session.session_id] = size
+
+    def _remove(self, session_id: str) -> bool:
+        if self._sessions.pop(session_id, None) is None:
+            return False
+        self._total_bytes -= self._sizes.pop(session_id, 0)
+        return True
+
+    def _expire(self) -> List[str]:
+        """가장 오래 사용되지 않은 세션부터 만료 검사 (만료되지 않은 세션을 만나면 중단)"""
+        if not self.idle_ttl:
+            return []
+        deadline = time.monotonic() - self.idle_ttl
+        expired = []
+        for session_id, session in self._sessions.items():
+            if session.last_active > deadline:
+                break
+            expired.append(session_id)
+        for session_id in expired:
+            self._remove(session_id)
+        return expired
+
+    def _enforce_limits(self, keep: str) -> List[str]:
+        evicted = []
+        while len(self._sessions) > 1 and (
+            len(self._sessions) > self.max_sessions or self._total_bytes > self.memory_budget
+        ):
+            session_id = next(iter(self._sessions))
+            if session_id == keep:
+                break
+            self._remove(session_id)
+            evicted.append(session_id)
+        return evicted
+
+    def _notify(self, session_ids: List[str], evicted: bool = True):
+        if not session_ids:
+            return
+        if evicted:
+            self.evicted += len(session_ids)
+        if self.on_evict:
+            for session_id in session_ids:
+                try:
+                    self.on_evict(session_id)
+                except Exception as e:
+                    print(f"[SessionStore] 세션 정리 실패 ({session_id}): {e}")
@@ -0,0 +1,119 @@
+"""
+SQL cost guardrail
+LLM이 생성한 SQL을 실행 전에 AST로 검사하고 LIMIT / MAX_EXECUTION_TIME을 주입하는 가드
+"""
+
+from typing import Dict, List, Optional
+
+import sqlglot
+from sqlglot import exp
+
+from config.config import Config
+from finance_agent.schema import TABLE_COLUMNS
+
+# 읽기 전용 SELECT 이외의 문장/절
+_FORBIDDEN_NODES = tuple(
+    getattr(exp, name)
+    for name in ("Insert", "Update", "Delete", "Drop", "Create", "Alter", "AlterTable", "Command", "Merge", "Into")
+    if hasattr(exp, name)
+)
+
+
+class SqlGuardError(ValueError):
+    """가드 규칙 위반 (SQL Refiner가 수정할 수 있도록 사유를 메시지로 전달)"""
+
+
+class SqlGuard:
+    """SELECT 전용, 허용 테이블, 행 수/실행 시간 상한, EXPLAIN 예상 행 수 예산 검사"""
+
+    def __init__(self, db_manager=None, allowed_tables: Optional[List[str]] = None):
+        self.config = Config()
+        self.db_manager = db_manager
+        self.allowed_tables = {t.lower() for t in (allowed_tables or TABLE_COLUMNS)}
+
+    def parse(self, sql: str) -> exp.Expression:
+        """단일 SELECT 문으로 파싱 (구문 오류/다중 문장은 거부)"""
+        try:
+            statements = [s for s in sqlglot.parse(sql.strip().rstrip(";"), read="mysql") if s is not None]
+        except sqlglot.errors.ParseError as e:
+            raise SqlGuardError(f"SQL 구문 오류: {e}")
+        if len(statements) != 1:
+            raise SqlGuardError("하나의 SELECT 문만 실행할 수 있습니다.")
+        return statements[0]
+
+    def _check_read_only(self, tree: exp.Expression):
+        if not isinstance(tree, exp.Query):
+            raise SqlGuardError("SELECT 문만 실행할 수 있습니다.")
+        for node in tree.walk():
+            if isinstance(node, _FORBIDDEN_NODES):
+                raise SqlGuardError(f"허용되지 않은 구문입니다: {node.key.upper()}")
+            if isinstance(node, exp.Lock):
+                # 읽기 쿼리라도 행 잠금을 잡으면 업데이트 작업을 막으므로 거부
+                raise SqlGuardError("잠금 절(FOR UPDATE / FOR SHARE / LOCK IN SHARE MODE)은 사용할 수 없습니다.")
+
+    def _check_tables(self, tree: exp.Expression):
+        cte_names = {cte.alias_or_name.lower() for cte in tree.find_all(exp.CTE)}
+        for table in tree.find_all(exp.Table):
+            name = table.name.lower()
+            if not name or name in cte_names:
+                continue
+            if table.args.get("db") or name not in self.allowed_tables:
+                raise SqlGuardError(
+                    f"허용되지 않은 테이블입니다: {table.sql(dialect='mysql')} "
+                    f"(사용 가능: {', '.join(sorted(self.allowed_tables))})"
+                )
+
+    def _apply_limit(self, tree: exp.Expression) -> exp.Expression:
+        """LIMIT이 없거나 상한보다 크면 상한으로 교체"""
+        max_rows = self.config.SQL_MAX_ROWS
+        limit = tree.args.get("limit")
+        if limit is None:
+            return tree.limit(max_rows)
+        value = limit.args.get("expression")
+        if isinstance(value, exp.Literal) and value.is_int and int(value.this) > max_rows:
+            return tree.limit(max_rows)
+        return tree
+
+    def _render(self, tree: exp.Expression) -> str:
+        """MySQL 문법으로 출력하고 최상위 SELECT에 MAX_EXECUTION_TIME 힌트 주입"""
+        hint = f"SELECT /*+ MAX_EXECUTION_TIME({self.config.SQL_MAX_EXECUTION_TIME_MS}) */"
+        with_clause = tree.args.get("with")
+        if with_clause is not None:
+            body = tree.copy()
+            body.set("with", None)
+            return with_clause.sql(dialect="mysql") + " " + body.sql(dialect="mysql").replace("SELECT", hint, 1)
+        return tree.sql(dialect="mysql").replace("SELECT", hint, 1)
+
+    def _check_cost(self, sql: str):
+        """EXPLAIN 예상 검사 행 수가 예산을 넘으면 거부"""
+        if self.db_manager is None:
+            return
+        local_engine = getattr(self.db_manager, "local_engine", None)
+        if local_engine is not None and local_engine.can_execute(sql):
+            return  # 로컬 컬럼형 엔진에서 실행되는 쿼리는 원격 DB 부하 없음
+        try:
+            plan = self.db_manager.explain(sql)
+        except Exception:
+            return  # 실제 실행 오류는 실행 단계에서 Refiner로 전달됨
+        examined = sum(int(row.get("rows") or 0) for row in plan)
+        if examined > self.config.SQL_MAX_EXAMINED_ROWS:
+            raise SqlGuardError(
+                f"예상 검사 행 수가 너무 많습니다 ({examined:,}행 > {self.config.SQL_MAX_EXAMINED_ROWS:,}행). "
+                f"date 또는 ticker 조건으로 범위를 좁혀주세요."
+            )
+
+    def check(self, sql: str) -> str:
+        """검사를 통과하면 실행할 SQL(LIMIT/힌트 주입)을 반환, 위반 시 SqlGuardError"""
+        tree = self.parse(sql)
+        self._check_read_only(tree)
+        self._check_tables(tree)
+        guarded = self._render(self._apply_limit(tree))
+        self._check_cost(guarded)
+        return guarded
+
+    def is_valid(self, sql: str) -> bool:
+        try:
+            self.check(sql)
+            return True
+        except SqlGuardError:
+            return False
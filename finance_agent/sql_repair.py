@@ -0,0 +1,213 @@
+"""
+Local SQL validation & repair
+스키마와 종목 레지스트리를 기준으로 생성 SQL을 AST로 검사하고, 기계적으로 고칠 수 있는 오류는
+LLM 호출 없이 수정합니다. (SQL Refiner는 여기서 고치지 못한 오류에만 사용)
+"""
+
+import re
+import difflib
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import pandas as pd
+import sqlglot
+from sqlglot import exp
+
+from finance_agent.schema import TABLE_COLUMNS
+
+KNOWN_TABLES = set(TABLE_COLUMNS)
+KNOWN_COLUMNS = {col for columns in TABLE_COLUMNS.values() for col in columns} | {"company_name"}
+
+_UNKNOWN_COLUMN = re.compile(r"Unknown column '(?:\w+\.)?(\w+)'|column \"?(\w+)\"? not found", re.IGNORECASE)
+
+# 프로세스 전체에서 공유하는 (SQL, 오류) → 수정 메모 (Generator/Refiner가 서로의 수정 결과를 재사용)
+_MEMO_SIZE = 512
+_fix_memo: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def _normalize(sql: str) -> str:
+    return " ".join(sql.split()).lower()
+
+
+def _error_signature(error: str) -> str:
+    """오류 메시지에서 가변 부분(숫자)을 제거한 키"""
+    return re.sub(r"\d+", "#", error.strip())[:200]
+
+
+class SqlRepairer:
+    """스키마/종목 레지스트리 기반 결정적 SQL 수정기"""
+
+    def __init__(self, company_df: Optional[pd.DataFrame] = None):
+        if company_df is None:
+            from finance_agent.resources import get_company_df
+            company_df = get_company_df()
+        name_col = "company_name" if "company_name" in company_df.columns else "회사명"
+        self.name_to_ticker = dict(zip(company_df[name_col].astype(str).str.strip(), company_df["ticker"]))
+        # 이미 종목 코드인지는 레지스트리로 판단 (0037T0.KQ 처럼 영문이 섞인 코드 포함)
+        self.tickers = set(company_df["ticker"].astype(str).str.strip().str.upper())
+
+    # ----------------- 공개 API -----------------
+    def repair(self, sql: str, ticker: Optional[str] = None) -> Tuple[str, List[str]]:
+        """실행 전 정적 검사/수정. (수정된 SQL, 적용한 수정 목록) 반환"""
+        tree = self._parse(sql)
+        if tree is None:
+            return sql, []
+
+        fixes = []
+        fixes += self._fix_from_columns(tree)
+        fixes += self._fix_table_names(tree)
+        fixes += self._fix_column_names(tree)
+        fixes += self._fix_ticker_literals(tree)
+        if ticker:
+            fixes += self._ensure_ticker_filter(tree, ticker)
+
+        if not fixes:
+            return sql, []
+        return tree.sql(dialect="mysql"), fixes
+
+    def repair_error(self, sql: str, error: str, ticker: Optional[str] = None) -> Optional[str]:
+        """
+        실행 오류를 보고 기계적으로 고칠 수 있으면 수정된 SQL을 반환, 아니면 None.
+        같은 (SQL, 오류) 쌍은 메모에서 바로 돌려줍니다.
+        스키마에 없는 칼럼(예: prev_close)에 대한 'Unknown column' 오류는 추측하지 않고 None (SQL Refiner로 넘김)
+        """
+        key = (_normalize(sql), _error_signature(error))
+        with _memo_lock:
+            if key in _fix_memo:
+                _fix_memo.move_to_end(key)
+                return _fix_memo[key]
+
+        if self._has_unknown_column(error):
+            return None
+        fixed, fixes = self.repair(sql, ticker)
+        if not fixes or _normalize(fixed) == key[0]:
+            return None
+
+        with _memo_lock:
+            _fix_memo[key] = fixed
+            while len(_fix_memo) > _MEMO_SIZE:
+                _fix_memo.popitem(last=False)
+        return fixed
+
+    def ensure_ticker_filter(self, sql: str, ticker: str) -> str:
+        """WHERE에 ticker = '<ticker>' 조건이 없으면 AND로 추가 (기존 조건 구조는 유지)"""
+        tree = self._parse(sql)
+        if tree is None:
+            return sql
+        fixes = self._fix_ticker_literals(tree) + self._ensure_ticker_filter(tree, ticker)
+        return tree.sql(dialect="mysql") if fixes else sql
+
+    # ----------------- 내부 -----------------
+    def _parse(self, sql: str) -> Optional[exp.Expression]:
+        try:
+            statements = [s for s in sqlglot.parse(sql.strip().rstrip(";"), read="mysql") if s is not None]
+        except sqlglot.errors.ParseError:
+            return None
+        if len(statements) != 1 or not isinstance(statements[0], exp.Query):
+            return None
+        return statements[0]
+
+    def _resolve_column(self, name: str) -> Optional[str]:
+        """대소문자만 다른 스키마 칼럼명, 없으면 None
+
+        근사 일치는 쓰지 않음 (ma_120 → ma_20처럼 다른 질문의 답이 조용히 실행되므로).
+        모르는 칼럼은 그대로 두어 DB의 'Unknown column' 오류 → SQL Refiner가 처리
+        """
+        lower = name.lower()
+        return lower if lower in KNOWN_COLUMNS else None
+
+    def _has_unknown_column(self, error: str) -> bool:
+        """'Unknown column' 오류의 식별자가 대소문자만 다른 스키마 칼럼도 아니면 True"""
+        m = _UNKNOWN_COLUMN.search(error)
+        if not m:
+            return False
+        return (m.group(1) or m.group(2)).lower() not in KNOWN_COLUMNS
+
+    def _fix_from_columns(self, tree: exp.Expression) -> List[str]:
+        """FROM krx_stockprice, volume 처럼 칼럼명이 테이블 자리에 온 경우 SELECT 목록으로 이동"""
+        fixes = []
+        for select in tree.find_all(exp.Select):
+            for join in list(select.args.get("joins") or []):
+                table = join.this
+                if not isinstance(table, exp.Table) or join.args.get("on") or join.args.get("using"):
+                    continue
+                name = table.name.lower()
+                if name in KNOWN_TABLES or name not in KNOWN_COLUMNS:
+                    continue
+                join.pop()
+                existing = {e.alias_or_name.lower() for e in select.expressions}
+                if name not in existing:
+                    select.select(exp.column(name), append=True, copy=False)
+                fixes.append(f"FROM 절의 칼럼 {name}을 SELECT 목록으로 이동")
+        return fixes
+
+    def _fix_table_names(self, tree: exp.Expression) -> List[str]:
+        """스키마에 없는 테이블명을 근사 일치로 교정 (krx_stock_price → krx_stockprice)"""
+        cte_names = {cte.alias_or_name.lower() for cte in tree.find_all(exp.CTE)}
+        fixes = []
+        for table in tree.find_all(exp.Table):
+            name = table.name.lower()
+            if not name or name in KNOWN_TABLES or name in cte_names:
+                continue
+            match = difflib.get_close_matches(name, KNOWN_TABLES, n=1, cutoff=0.8)
+            if match:
+                fixes.append(f"테이블 {table.name} → {match[0]}")
+                table.set("this", exp.to_identifier(match[0]))
+        return fixes
+
+    def _fix_column_names(self, tree: exp.Expression) -> List[str]:
+        """대소문자만 다른 칼럼명을 스키마 칼럼명으로 교정 (ma_VOL_20 → ma_vol_20)"""
+        aliases = {a.alias.lower() for a in tree.find_all(exp.Alias)}
+        aliases |= {cte.alias_or_name.lower() for cte in tree.find_all(exp.CTE)}
+        aliases |= {t.alias_or_name.lower() for t in tree.find_all(exp.Table)}
+
+        fixes = []
+        for column in tree.find_all(exp.Column):
+            name = column.name
+            if not name or name in KNOWN_COLUMNS or name.lower() in aliases:
+                continue
+            resolved = self._resolve_column(name)
+            if resolved and resolved != name:
+                column.set("this", exp.to_identifier(resolved))
+                fixes.append(f"칼럼 {name} → {resolved}")
+        return fixes
+
+    def _lookup_ticker(self, value: str) -> Optional[str]:
+        """레지스트리의 회사명이면 종목 코드, 이미 종목 코드이거나 모르는 값이면 None"""
+        value = value.strip()
+        if value.upper() in self.tickers:
+            return None
+        return self.name_to_ticker.get(value)
+
+    def _fix_ticker_literals(self, tree: exp.Expression) -> List[str]:
+        """ticker = '삼성전자' 처럼 등록된 회사명이 들어간 조건을 종목 코드로 교체 (그 외 값은 그대로 둠)"""
+        fixes = []
+        for node in tree.find_all(exp.EQ, exp.In):
+            column = node.this
+            if not (isinstance(column, exp.Column) and column.name.lower() == "ticker"):
+                continue
+            literals = [node.expression] if isinstance(node, exp.EQ) else node.expressions
+            for literal in literals:
+                if not (isinstance(literal, exp.Literal) and literal.is_string):
+                    continue
+                code = self._lookup_ticker(literal.this)
+                if code:
+                    fixes.append(f"ticker '{literal.this}' → '{code}'")
+                    literal.replace(exp.Literal.string(code))
+        return fixes
+
+    def _ensure_ticker_filter(self, tree: exp.Expression, ticker: str) -> List[str]:
+        select = tree if isinstance(tree, exp.Select) else tree.find(exp.Select)
+        if select is None:
+            return []
+        for node in tree.find_all(exp.EQ):
+            column, value = node.this, node.expression
+            if (
+                isinstance(column, exp.Column) and column.name.lower() == "ticker"
+                and isinstance(value, exp.Literal) and value.this.upper() == ticker.upper()
+            ):
+                return []
+        select.where(exp.column("ticker").eq(exp.Literal.string(ticker)), append=True, copy=False)
+        return [f"ticker = '{ticker}' 조건 추가"]
@@ -0,0 +1,201 @@
+"""
+Subscription store
+NewsBot 정기 알림 구독(세션, 회사, 시각)을 SQL DB(SQLite 또는 MySQL)에 저장합니다.
+재시작해도 구독이 유지되고, 구독 수와 관계없이 메모리에는 지금 실행할 구독만 읽어 옵니다.
+
+- 기본 키 (session_id, company_name), 인덱스 (company_name, schedule_time) / next_daily_at / next_weekly_at
+- due(): 실행 시각이 지난 구독을 다음 실행 시각 순으로 batch 단위 조회
+- claim(): 다음 실행 시각을 먼저 옮기고 claim_token을 남겨서 여러 프로세스가 같은 구독을 두 번 보내지 않음
+- 중단 중 놓친 실행은 NEWS_CATCHUP_HOURS 이내면 재시작 후 1번만 보내고, 더 오래된 것은 'missed'로 기록하고 건너뜀
+- remove(): 세션/회사 단위 취소를 인덱스를 타는 DELETE 한 번으로 처리
+
+NEWS_SUBSCRIPTION_DB_URL: "sqlite:///data/news_subscriptions.db" (기본) / "mysql" (MYSQL_DATABASE 커넥션 풀) / SQLAlchemy URL
+"""
+
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from sqlalchemy import (
+    Column, Double, Index, MetaData, String, Table, and_, bindparam, delete, func, select, update,
+)
+
+from config.config import Config
+from finance_agent.job_scheduler import next_time_of_day
+
+WEEK_SECONDS = 7 * 24 * 3600
+KINDS = ("daily", "weekly")
+
+_metadata = MetaData()
+
+subscriptions_table = Table(
+    "news_subscriptions", _metadata,
+    Column("session_id", String(64), primary_key=True),
+    Column("company_name", String(128), primary_key=True),
+    Column("schedule_time", String(5), nullable=False),
+    # epoch 초: MySQL FLOAT(단정밀도)는 수십 초 단위로 반올림되어 클레임/전달 시각 비교가 어긋나므로 DOUBLE
+    Column("created_at", Double, nullable=False),
+    Column("next_daily_at", Double, nullable=False, index=True),
+    Column("next_weekly_at", Double, nullable=False, index=True),
+    Column("last_daily_at", Double),
+    Column("last_daily_status", String(16)),
+    Column("last_weekly_at", Double),
+    Column("last_weekly_status", String(16)),
+    Column("claim_token", String(32), index=True),
+    Index("ix_news_subscriptions_company", "company_name", "schedule_time"),
+)
+
+
+def _next_run(kind: str, row: Dict, now: float) -> float:
+    if kind == "daily":
+        return next_time_of_day(row["schedule_time"], now)
+    # 주간 보고서는 등록 시점부터 7일 간격 (오래 중단됐으면 지난 회차는 건너뜀)
+    next_at = row["next_weekly_at"]
+    while next_at <= now:
+        next_at += WEEK_SECONDS
+    return next_at
+
+
+class SubscriptionStore:
+    """SQLAlchemy 엔진 위의 뉴스 알림 구독 저장소 (여러 스레드/프로세스 공유 가능)"""
+
+    def __init__(self, engine, catchup_hours: Optional[float] = None):
+        self.config = Config()
+        self.engine = engine
+        hours = self.config.NEWS_CATCHUP_HOURS if catchup_hours is None else catchup_hours
+        self.catchup_seconds = hours * 3600
+        _metadata.create_all(engine)
+        from finance_agent.database import widen_float_columns
+        widen_float_columns(engine, subscriptions_table)
+
+    # ----------------- 등록 / 취소 -----------------
+    def upsert(self, session_id: str, company_name: str, schedule_time: str, now: Optional[float] = None) -> Dict:
+        """구독 등록 (같은 세션이 같은 회사를 다시 등록하면 시각만 바꾸고 주간 보고서 주기/전달 상태는 유지)"""
+        now = time.time() if now is None else now
+        next_daily_at = next_time_of_day(schedule_time, now)
+        with self.engine.begin() as conn:
+            existing = conn.execute(
+                select(subscriptions_table).where(self._key(session_id, company_name))
+            ).mappings().first()
+            if existing:
+                conn.execute(update(subscriptions_table).where(self._key(session_id, company_name)).values(
+                    schedule_time=schedule_time, next_daily_at=next_daily_at,
+                ))
+            else:
+                conn.execute(subscriptions_table.insert().values(
+                    session_id=session_id, company_name=company_name, schedule_time=schedule_time,
+                    created_at=now, next_daily_at=next_daily_at, next_weekly_at=now + WEEK_SECONDS,
+                ))
+        return {"company_name": company_name, "schedule_time": schedule_time}
+
+    def remove(self, session_id: Optional[str] = None, company_name: Optional[str] = None) -> int:
+        """세션의 특정 회사 / 세션 전체 / 회사 전체 구독 취소, 취소한 개수 반환"""
+        conditions = []
+        if session_id is not None:
+            conditions.append(subscriptions_table.c.session_id == session_id)
+        if company_name is not None:
+            conditions.append(subscriptions_table.c.company_name == company_name)
+        if not conditions:
+            raise ValueError("session_id나 company_name 중 하나는 지정해야 합니다.")
+        with self.engine.begin() as conn:
+            return conn.execute(delete(subscriptions_table).where(and_(*conditions))).rowcount
+
+    # ----------------- 조회 -----------------
+    def list(self, session_id: str) -> List[Dict]:
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(subscriptions_table)
+                .where(subscriptions_table.c.session_id == session_id)
+                .order_by(subscriptions_table.c.created_at)
+            ).mappings().all()
+        return [dict(row) for row in rows]
+
+    def get(self, session_id: str, company_name: str) -> Optional[Dict]:
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(subscriptions_table).where(self._key(session_id, company_name))
+            ).mappings().first()
+        return dict(row) if row else None
+
+    def count(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(select(func.count()).select_from(subscriptions_table)).scalar_one()
+
+    def due(self, kind: str, now: Optional[float] = None, limit: Optional[int] = None) -> List[Dict]:
+        """kind('daily'|'weekly') 실행 시각이 지난 구독을 실행 시각 순으로 최대 limit개"""
+        now = time.time() if now is None else now
+        column = subscriptions_table.c[f"next_{kind}_at"]
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(subscriptions_table)
+                .where(column <= now)
+                .order_by(column)
+                .limit(limit or self.config.NEWS_DISPATCH_BATCH_SIZE)
+            ).mappings().all()
+        return [dict(row) for row in rows]
+
+    # ----------------- 실행 기록 -----------------
+    def claim(self, kind: str, rows: List[Dict], now: Optional[float] = None) -> List[Dict]:
+        """다음 실행 시각을 옮겨 이번 실행을 가져감 (다른 프로세스가 먼저 가져간 구독은 제외하고 반환)"""
+        if not rows:
+            return []
+        now = time.time() if now is None else now
+        column = subscriptions_table.c[f"next_{kind}_at"]
+        token = uuid.uuid4().hex
+        # 조회 후 다른 프로세스가 먼저 옮긴 구독은 next_*_at이 달라져 갱신되지 않음
+        stmt = (
+            update(subscriptions_table)
+            .where(and_(
+                subscriptions_table.c.session_id == bindparam("b_session_id"),
+                subscriptions_table.c.company_name == bindparam("b_company_name"),
+                column == bindparam("b_previous"),
+            ))
+            .values({column.name: bindparam("b_next"), "claim_token": token})
+        )
+        params = [
+            {"b_session_id": row["session_id"], "b_company_name": row["company_name"],
+             "b_previous": row[f"next_{kind}_at"], "b_next": _next_run(kind, row, now)}
+            for row in rows
+        ]
+        with self.engine.begin() as conn:
+            conn.execute(stmt, params)
+            won = set(conn.execute(
+                select(subscriptions_table.c.session_id, subscriptions_table.c.company_name)
+                .where(subscriptions_table.c.claim_token == token)
+            ).all())
+        return [row for row in rows if (row["session_id"], row["company_name"]) in won]
+
+    def record(self, kind: str, company_name: str, session_ids: List[str], status: str,
+               now: Optional[float] = None):
+        """같은 회사 구독자들의 전달 상태를 한 번에 기록"""
+        now = time.time() if now is None else now
+        if not session_ids:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(subscriptions_table)
+                .where(and_(
+                    subscriptions_table.c.company_name == company_name,
+                    subscriptions_table.c.session_id.in_(session_ids),
+                ))
+                .values({f"last_{kind}_at": now, f"last_{kind}_status": status})
+            )
+
+    def is_missed(self, kind: str, row: Dict, now: Optional[float] = None) -> bool:
+        """예정 시각에서 NEWS_CATCHUP_HOURS 넘게 지난 실행인지 (중단 중 놓친 오래된 알림은 보내지 않음)"""
+        now = time.time() if now is None else now
+        return now - row[f"next_{kind}_at"] > self.catchup_seconds
+
+    @staticmethod
+    def _key(session_id: str, company_name: str):
+        return and_(
+            subscriptions_table.c.session_id == session_id,
+            subscriptions_table.c.company_name == company_name,
+        )
+
+
+def create_subscription_store(url: Optional[str] = None) -> SubscriptionStore:
+    """NEWS_SUBSCRIPTION_DB_URL 기준 구독 저장소"""
+    from finance_agent.database import create_sql_engine
+    url = Config.NEWS_SUBSCRIPTION_DB_URL if url is None else url
+    return SubscriptionStore(create_sql_engine(url))
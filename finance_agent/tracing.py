@@ -0,0 +1,262 @@
+"""
+Tracing & latency metrics
+그래프 노드 / LLM 호출 / SQL 실행 / HTTP 요청 단위 span을 기록하고
+JSON lines 파일과 Prometheus 텍스트 형식(counter, histogram)으로 내보냅니다.
+"""
+
+import os
+import json
+import time
+import uuid
+import threading
+import contextvars
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from config.config import Config
+
+# span 소요 시간 histogram 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("finance_agent_span", default=None)
+
+
+class Span:
+    """하나의 작업 구간 (같은 요청의 span은 trace_id를 공유)"""
+
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "start", "duration", "attributes", "error")
+
+    def __init__(self, name: str, kind: str, parent: Optional["Span"], attributes: Dict):
+        self.name = name
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self.duration = 0.0
+        self.attributes = dict(attributes)
+        self.error = ""
+
+    def set(self, **attributes):
+        self.attributes.update({k: v for k, v in attributes.items() if v is not None})
+
+    def to_dict(self) -> Dict:
+        return {
+            "ts": datetime.fromtimestamp(self.start).isoformat(timespec="milliseconds"),
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "duration_ms": round(self.duration * 1000, 2),
+            "error": self.error,
+            **self.attributes,
+        }
+
+
+def _label_key(labels: Dict) -> Tuple:
+    return tuple(sorted(labels.items()))
+
+
+class Metrics:
+    """Prometheus 형식 counter / histogram 저장소"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Tuple, float]] = defaultdict(lambda: defaultdict(float))
+        self._histograms: Dict[str, Dict[Tuple, Dict]] = defaultdict(dict)
+
+    def inc(self, metric: str, value: float = 1.0, **labels):
+        with self._lock:
+            self._counters[metric][_label_key(labels)] += value
+
+    def observe(self, metric: str, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            hist = self._histograms[metric].get(key)
+            if hist is None:
+                hist = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._histograms[metric][key] = hist
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist["buckets"][i] += 1
+            hist["sum"] += value
+            hist["count"] += 1
+
+    @staticmethod
+    def _format_labels(key: Tuple, extra: Optional[Tuple] = None) -> str:
+        items = list(key) + ([extra] if extra else [])
+        if not items:
+            return ""
+        return "{" + ",".join(f'{k}="{str(v)}"' for k, v in items) + "}"
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{self._format_labels(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, hist in series.items():
+                    for bound, count in zip(self.buckets, hist["buckets"]):
+                        lines.append(f"{name}_bucket{self._format_labels(key, ('le', f'{bound:g}'))} {count}")
+                    lines.append(f"{name}_bucket{self._format_labels(key, ('le', '+Inf'))} {hist['count']}")
+                    lines.append(f"{name}_sum{self._format_labels(key)} {hist['sum']:.6f}")
+                    lines.append(f"{name}_count{self._format_labels(key)} {hist['count']}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+class Tracer:
+    """span 기록기 (contextvars로 부모 span을 추적하므로 스레드/async 요청별로 분리됨)"""
+
+    def __init__(self, log_path: Optional[str] = None, enabled: Optional[bool] = None):
+        self.config = Config()
+        self.enabled = self.config.TRACING_ENABLED if enabled is None else enabled
+        self.log_path = log_path or self.config.TRACE_LOG_PATH
+        self.metrics = Metrics()
+        self._recent = deque(maxlen=self.config.TRACE_BUFFER_SIZE)
+        self._write_lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", **attributes):
+        if not self.enabled:
+            yield Span(name, kind, None, attributes)
+            return
+
+        span = Span(name, kind, _current_span.get(), attributes)
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"[:300]
+            raise
+        finally:
+            span.duration = time.perf_counter() - started
+            _current_span.reset(token)
+            self._finish(span)
+
+    def traced(self, name: str, kind: str = "internal"):
+        """함수 전체를 span으로 감싸는 데코레이터"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name, kind):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def _finish(self, span: Span):
+        status = "error" if span.error else "ok"
+        self.metrics.observe("finance_agent_span_duration_seconds", span.duration, kind=span.kind, name=span.name)
+        self.metrics.inc("finance_agent_spans_total", kind=span.kind, name=span.name, status=status)
+
+        attrs = span.attributes
+        if span.kind == "llm":
+            self.metrics.inc("finance_agent_llm_tokens_total", attrs.get("prompt_tokens", 0), name=span.name, type="prompt")
+            self.metrics.inc("finance_agent_llm_tokens_total", attrs.get("completion_tokens", 0), name=span.name, type="completion")
+        elif span.kind == "sql" and "rows" in attrs:
+            self.metrics.inc("finance_agent_sql_rows_total", attrs["rows"], name=span.name, backend=attrs.get("backend", ""))
+        elif span.kind == "http" and "bytes" in attrs:
+            self.metrics.inc("finance_agent_http_bytes_total", attrs["bytes"], name=span.name)
+        elif span.kind == "request" and attrs.get("sql_attempts", 0) > 1:
+            self.metrics.inc("finance_agent_sql_retries_total", attrs["sql_attempts"] - 1, intent=attrs.get("intent", ""))
+
+        record = span.to_dict()
+        self._recent.append(record)
+        self._export(record)
+
+    def _export(self, record: Dict):
+        if not self.log_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            with self._write_lock, open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        except OSError as e:
+            print(f"[Tracer] trace 기록 실패: {e}")
+
+    # ----------------- 조회 -----------------
+    def recent_spans(self, trace_id: Optional[str] = None) -> List[Dict]:
+        spans = list(self._recent)
+        if trace_id:
+            spans = [s for s in spans if s["trace_id"] == trace_id]
+        return spans
+
+    def latency_summary(self, kind: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """최근 span 기준 이름별 p50/p95/p99 (ms)"""
+        durations = defaultdict(list)
+        for record in self._recent:
+            if kind is None or record["kind"] == kind:
+                durations[record["name"]].append(record["duration_ms"])
+        return {name: percentiles(values) for name, values in durations.items()}
+
+    def render_prometheus(self) -> str:
+        return self.metrics.render()
+
+
+def percentiles(values: List[float], points=(50, 95, 99)) -> Dict[str, float]:
+    """nearest-rank 백분위수"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    result = {"count": len(ordered)}
+    for p in points:
+        index = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered))) - 1))
+        result[f"p{p}"] = ordered[index]
+    return result
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """프로세스 공용 Tracer"""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer()
+    return _tracer
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """/metrics 로 Prometheus 텍스트를 노출하는 백그라운드 HTTP 서버"""
+    tracer = get_tracer()
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = tracer.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"[Tracer] metrics 서버 시작: http://{host}:{port}/metrics")
+    return server
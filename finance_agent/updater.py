@@ -9,12 +9,175 @@ import yfinance as yf
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import logging
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 import mysql.connector
 from mysql.connector import Error
 import time
 import os
 from config.config import Config
+from finance_agent.parquet_store import ParquetStore, replace_date_range, write_table_file
+from finance_agent.schema import (
+    SNAPSHOT_TABLE, EVENTS_TABLE, SNAPSHOT_COLUMNS, EVENT_COLUMNS,
+    STOCKPRICE_TABLE, STOCKPRICE_COLUMNS, SNAPSHOT_DDL, EVENTS_DDL, STOCKPRICE_DDL, ticker_market,
+)
+
+
+YF_COLUMN_MAPPING = {
+    "Adj Close": "adj_close",
+    "Close": "close",
+    "High": "high",
+    "Low": "low",
+    "Open": "open",
+}
+PRICE_COLUMNS = list(YF_COLUMN_MAPPING.values())
+# 보정 가격은 정수가 아니므로 float32로 줄이지 않음
+ADJUSTED_PRICE_COLUMNS = {"adj_close"}
+
+
+def reshape_download(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    yf.download 결과((Price, Ticker) MultiIndex 컬럼의 wide 포맷)를 (date, ticker) long 포맷으로 변환.
+    pivot_table(groupby-mean) 없이 지표별 2차원 블록을 ticker 우선 순서로 펼치므로
+    결과는 (ticker, date) 순으로 정렬되어 있습니다.
+
+    dtype: adj_close float64 (배당/분할 보정으로 소수점이 생기므로 원본 정밀도 유지),
+    close/high/low/open float32 (KRX 원 단위 정수 가격은 float32로 정확히 표현됨),
+    volume Int64 (nullable — 거래량이 없는 날은 0이 아니라 NULL로 남겨 거래량 순위/평균이 왜곡되지 않도록),
+    ticker category, date datetime64
+    """
+    tickers = raw.columns.get_level_values(1).unique()
+    dates = pd.to_datetime(raw.index).normalize()
+    n_dates, n_tickers = len(dates), len(tickers)
+
+    def _flat(yf_col: str, dtype) -> np.ndarray:
+        # order="F": 종목별로 날짜가 연속되도록 펼침
+        return raw[yf_col].reindex(columns=tickers).to_numpy(dtype=dtype).ravel(order="F")
+
+    # 상장 전/거래정지 등 가격이 전혀 없는 행 제거 (기존 stack의 dropna 동작과 동일)
+    # 마스크를 먼저 만들고 컬럼별로 바로 걸러, 전체 크기 배열은 한 번에 하나만 유지
+    mask = np.zeros(n_dates * n_tickers, dtype=bool)
+    for yf_col in YF_COLUMN_MAPPING:
+        mask |= ~np.isnan(_flat(yf_col, np.float32))
+
+    data = {
+        "date": np.tile(dates.values, n_tickers)[mask],
+        "ticker": pd.Categorical.from_codes(
+            np.repeat(np.arange(n_tickers, dtype=np.int32), n_dates)[mask],
+            categories=tickers,
+        ),
+    }
+    for yf_col, col in YF_COLUMN_MAPPING.items():
+        dtype = np.float64 if col in ADJUSTED_PRICE_COLUMNS else np.float32
+        data[col] = _flat(yf_col, dtype)[mask]
+    volume = _flat("Volume", np.float64)[mask]
+    missing = np.isnan(volume)
+    data["volume"] = pd.arrays.IntegerArray(np.where(missing, 0, volume).astype(np.int64), missing)
+    df = pd.DataFrame(data)
+
+    return df[["date", "adj_close", "close", "high", "low", "open", "volume", "ticker"]].reset_index(drop=True)
+
+
+def compute_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """등락률, 이동평균, RSI, 볼린저 밴드, 골든/데드 크로스 계산 (long 포맷, ticker별)"""
+    if df.empty:
+        return df
+
+    # 날짜순 정렬 (정렬 결과는 새 프레임이므로 입력은 변경되지 않음)
+    df = df.sort_values(by=["ticker", "date"])
+    df["adj_close"] = pd.to_numeric(df["adj_close"], errors="coerce")
+    # 거래량은 nullable Int64이므로 지표는 NA → NaN인 float로 계산
+    volume = df["volume"].astype(np.float64)
+    
+    # 등락률 계산
+    df["price_change_pct"] = df.groupby("ticker", observed=True)["adj_close"].pct_change() * 100
+    df["volume_change_pct"] = volume.groupby(df["ticker"], observed=True).pct_change(fill_method=None) * 100
+    
+    # 이동평균선
+    df["ma_5"] = df.groupby("ticker", observed=True)["adj_close"].transform(lambda x: x.rolling(5).mean())
+    df["ma_20"] = df.groupby("ticker", observed=True)["adj_close"].transform(lambda x: x.rolling(20).mean())
+    df["ma_60"] = df.groupby("ticker", observed=True)["adj_close"].transform(lambda x: x.rolling(60).mean())
+    
+    # 거래량 평균
+    df["ma_VOL_20"] = volume.groupby(df["ticker"], observed=True).transform(lambda x: x.rolling(20).mean())
+    df["volume_Ratio_20"] = volume / (df["ma_VOL_20"] + 1e-6)
+    
+    # RSI 계산
+    def calc_rsi(series, period=14):
+        delta = series.diff()
+        gain = delta.clip(lower=0)
+        loss = -delta.clip(upper=0)
+        avg_gain = gain.rolling(period).mean()
+        avg_loss = loss.rolling(period).mean()
+        rs = avg_gain / (avg_loss + 1e-6)
+        return 100 - (100 / (1 + rs))
+    
+    df["rsi_14"] = df.groupby("ticker", observed=True)["adj_close"].transform(calc_rsi)
+    
+    # bollinger Bands
+    ma20 = df["ma_20"]
+    std20 = df.groupby("ticker", observed=True)["adj_close"].transform(lambda x: x.rolling(20).std())
+    df["bollinger_upper"] = ma20 + 2 * std20
+    df["bollinger_lower"] = ma20 - 2 * std20
+    df["bollinger_mid"] = ma20
+    
+    # 볼린저 밴드 시그널
+    df["signal_bollinger_upper"] = df["adj_close"] > df["bollinger_upper"]
+    df["signal_bollinger_lower"] = df["adj_close"] < df["bollinger_lower"]
+    
+    # 골든/데드 크로스: 20일 이동평균선에서 5일 이동평균선을 비교
+    df["ma_diff"] = df["ma_5"] - df["ma_20"]
+    df["prev_diff"] = df.groupby("ticker", observed=True)["ma_diff"].shift(1)
+    df["golden_cross"] = (df["prev_diff"] < 0) & (df["ma_diff"] > 0)
+    df["dead_cross"] = (df["prev_diff"] > 0) & (df["ma_diff"] < 0)
+    
+    # 무한값 처리
+    df = df.replace([np.inf, -np.inf], np.nan)
+    return df
+
+
+# 순위 이름: (기준 칼럼, 오름차순 여부)
+SNAPSHOT_RANKS = {
+    "volume": ("volume", False),
+    "gain": ("price_change_pct", False),
+    "loss": ("price_change_pct", True),
+    "price": ("adj_close", False),
+}
+
+
+def build_daily_snapshots(df: pd.DataFrame) -> tuple:
+    """
+    기술적 지표가 계산된 주가 프레임으로 일자별 순위 스냅샷과 이벤트 목록 생성.
+    리더보드/스크리닝 질문이 (date, rank) 인덱스 조회가 되도록 미리 계산해 둡니다.
+    """
+    base = df[["date", "ticker", "adj_close", "price_change_pct", "volume", "rsi_14"]].copy()
+    base["date"] = pd.to_datetime(base["date"]).dt.date
+    base["ticker"] = base["ticker"].astype(str)
+    base["market"] = ticker_market(base["ticker"])
+
+    by_date = base.groupby("date")
+    by_market = base.groupby(["date", "market"])
+    for name, (col, ascending) in SNAPSHOT_RANKS.items():
+        base[f"{name}_rank"] = by_date[col].rank(method="min", ascending=ascending).astype("Int64")
+        base[f"market_{name}_rank"] = by_market[col].rank(method="min", ascending=ascending).astype("Int64")
+
+    snapshot_df = base[list(SNAPSHOT_COLUMNS)].reset_index(drop=True)
+
+    conditions = {
+        "golden_cross": df["golden_cross"],
+        "dead_cross": df["dead_cross"],
+        "bollinger_upper": df["signal_bollinger_upper"],
+        "bollinger_lower": df["signal_bollinger_lower"],
+        "rsi_overbought": df["rsi_14"] >= 70,
+        "rsi_oversold": df["rsi_14"] <= 30,
+    }
+    events = []
+    for event_type, mask in conditions.items():
+        part = base.loc[mask.fillna(False).astype(bool).values].copy()
+        part["event_type"] = event_type
+        events.append(part[list(EVENT_COLUMNS)])
+    events_df = pd.concat(events, ignore_index=True)
+
+    return snapshot_df, events_df
 
 
 class DailyStockUpdater:
@@ -26,6 +189,7 @@ class DailyStockUpdater:
         self.engine = self._create_engine()
         self.connection = None
         self.tickers_df = None
+        self.parquet_store = ParquetStore() if self.config.PARQUET_MIRROR_ENABLED else None
         
     def _setup_logger(self) -> logging.Logger:
         """로거 설정"""
@@ -176,109 +340,278 @@ class DailyStockUpdater:
                 self.logger.warning("No data returned from yfinance.")
                 return None
 
-            # MultiIndex 컬럼을 단일 레벨로 변환
-            # 'Adj Close', 'Close', 'Volume' 등의 컬럼을 쉽게 접근하도록 만듭니다.
-            df.columns = df.columns.to_flat_index()
+            df_tidy = reshape_download(df)
+            del df
+
+            memory_mb = df_tidy.memory_usage(deep=True).sum() / 1024 ** 2
+            self.logger.info(f"주가 데이터 변환 완료: {len(df_tidy)}개 행, {memory_mb:.1f}MB")
+            if memory_mb > self.config.FETCH_MEMORY_BUDGET_MB:
+                self.logger.warning(
+                    f"주가 데이터 메모리 사용량이 예산을 초과했습니다: "
+                    f"{memory_mb:.1f}MB > {self.config.FETCH_MEMORY_BUDGET_MB}MB"
+                )
 
-            # 데이터 정리 (컬럼명 재정의)
-            df_tidy = df.stack(level=1).reset_index()
-            df_tidy.columns = ['date', 'ticker', 'value', 'column_type']
-            
-            # 피벗 테이블을 사용하여 각 지표를 별도의 컬럼으로 분리
-            df_tidy = df_tidy.pivot_table(index=['date', 'ticker'], columns='column_type', values='value').reset_index()
-            
-            # 컬럼명 소문자로 변경
-            df_tidy.columns = [c.lower().replace(" ", "_") for c in df_tidy.columns]
-            
-            # 필요한 컬럼만 선택
-            df_tidy = df_tidy[['date', 'adj_close', 'close', 'high', 'low', 'open', 'volume', 'ticker']]
-            
-            # 데이터 타입 변환
-            df_tidy['date'] = pd.to_datetime(df_tidy['date']).dt.date
-            
             return df_tidy
         except Exception as e:
             self.logger.error(f"종목 데이터 가져오기 실패: {e}")
             return None
     
     def compute_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        df["adj_close"] = pd.to_numeric(df["adj_close"], errors="coerce")
         """기술적 지표 계산 (기존 upload.py 코드 참조)"""
         if df.empty:
             return df
-        
         self.logger.info("기술적 지표 계산 시작")
-        
-        # 날짜순 정렬
-        df = df.sort_values(by=["ticker", "date"]).copy()
-        
-        # 등락률 계산
-        df["price_change_pct"] = df.groupby("ticker")["adj_close"].pct_change() * 100
-        df["volume_change_pct"] = df.groupby("ticker")["volume"].pct_change() * 100
-        
-        # 이동평균선
-        df["ma_5"] = df.groupby("ticker")["adj_close"].transform(lambda x: x.rolling(5).mean())
-        df["ma_20"] = df.groupby("ticker")["adj_close"].transform(lambda x: x.rolling(20).mean())
-        df["ma_60"] = df.groupby("ticker")["adj_close"].transform(lambda x: x.rolling(60).mean())
-        
-        # 거래량 평균
-        df["ma_VOL_20"] = df.groupby("ticker")["volume"].transform(lambda x: x.rolling(20).mean())
-        df["volume_Ratio_20"] = df["volume"] / (df["ma_VOL_20"] + 1e-6)
-        
-        # RSI 계산
-        def calc_rsi(series, period=14):
-            delta = series.diff()
-            gain = delta.clip(lower=0)
-            loss = -delta.clip(upper=0)
-            avg_gain = gain.rolling(period).mean()
-            avg_loss = loss.rolling(period).mean()
-            rs = avg_gain / (avg_loss + 1e-6)
-            return 100 - (100 / (1 + rs))
-        
-        df["rsi_14"] = df.groupby("ticker")["adj_close"].transform(calc_rsi)
-        
-        # bollinger Bands
-        ma20 = df["ma_20"]
-        std20 = df.groupby("ticker")["adj_close"].transform(lambda x: x.rolling(20).std())
-        df["bollinger_upper"] = ma20 + 2 * std20
-        df["bollinger_lower"] = ma20 - 2 * std20
-        df["bollinger_mid"] = ma20
-        
-        # 볼린저 밴드 시그널
-        df["signal_bollinger_upper"] = df["adj_close"] > df["bollinger_upper"]
-        df["signal_bollinger_lower"] = df["adj_close"] < df["bollinger_lower"]
-        
-        # 골든/데드 크로스: 20일 이동평균선에서 5일 이동평균선을 비교
-        df["ma_diff"] = df["ma_5"] - df["ma_20"]
-        df["prev_diff"] = df.groupby("ticker")["ma_diff"].shift(1)
-        df["golden_cross"] = (df["prev_diff"] < 0) & (df["ma_diff"] > 0)
-        df["dead_cross"] = (df["prev_diff"] > 0) & (df["ma_diff"] < 0)
-        
-        # 무한값 처리
-        df = df.replace([np.inf, -np.inf], np.nan)
-        
+        df = compute_technical_indicators(df)
         self.logger.info("기술적 지표 계산 완료")
         return df
     
-    def save_to_database(self, df: pd.DataFrame):
-        """데이터베이스에 저장"""
+    def _ensure_unique_key(self, table: str = STOCKPRICE_TABLE):
+        """(ticker, date) 유니크 키 확인 및 생성 (upsert의 전제 조건)
+
+        테이블이 없으면 키를 포함해 만들고, 키 없이 쌓인 중복 행이 있으면 (ticker, date)별로
+        마지막에 저장된 행만 남긴 뒤 키를 추가합니다.
+        """
+        query = text("""
+            SELECT INDEX_NAME, GROUP_CONCAT(COLUMN_NAME ORDER BY SEQ_IN_INDEX) AS cols
+            FROM INFORMATION_SCHEMA.STATISTICS
+            WHERE TABLE_SCHEMA = :schema AND TABLE_NAME = :table AND NON_UNIQUE = 0
+            GROUP BY INDEX_NAME
+        """)
+        with self.engine.connect() as conn:
+            if table == STOCKPRICE_TABLE:
+                conn.execute(text(STOCKPRICE_DDL))
+                conn.commit()
+            rows = conn.execute(query, {"schema": self.config.MYSQL_DATABASE, "table": table}).fetchall()
+            if any(set(row.cols.split(",")) == {"ticker", "date"} for row in rows):
+                return
+
+            # to_sql로 생성된 테이블은 ticker가 TEXT라서 prefix 길이가 필요함
+            ticker_type = conn.execute(text("""
+                SELECT DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_SCHEMA = :schema AND TABLE_NAME = :table AND COLUMN_NAME = 'ticker'
+            """), {"schema": self.config.MYSQL_DATABASE, "table": table}).scalar()
+            ticker_col = "ticker(16)" if ticker_type and "text" in ticker_type.lower() else "ticker"
+
+            duplicated = conn.execute(
+                text(f"SELECT 1 FROM `{table}` GROUP BY ticker, date HAVING COUNT(*) > 1 LIMIT 1")
+            ).first()
+            if duplicated is None:
+                self.logger.info(f"{table}에 (ticker, date) 유니크 키 생성")
+                conn.execute(text(f"ALTER TABLE `{table}` ADD UNIQUE KEY uq_ticker_date ({ticker_col}, date)"))
+                conn.commit()
+                return
+
+            # 중복 행이 있으면 키를 추가할 수 없으므로, 키가 있는 사본에 옮겨 담은 뒤 테이블을 교체
+            self.logger.warning(f"{table}에 (ticker, date) 중복 행이 있어 마지막 행만 남기고 정리합니다.")
+            columns = [row[0] for row in conn.execute(text("""
+                SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_SCHEMA = :schema AND TABLE_NAME = :table AND EXTRA NOT LIKE '%GENERATED%'
+                ORDER BY ORDINAL_POSITION
+            """), {"schema": self.config.MYSQL_DATABASE, "table": table})]
+            column_sql = ", ".join(f"`{c}`" for c in columns)
+            update_sql = ", ".join(f"`{c}` = VALUES(`{c}`)" for c in columns if c not in ("ticker", "date"))
+            conn.execute(text(f"DROP TABLE IF EXISTS `{table}_dedup`"))
+            conn.execute(text(f"CREATE TABLE `{table}_dedup` LIKE `{table}`"))
+            conn.execute(text(f"ALTER TABLE `{table}_dedup` ADD UNIQUE KEY uq_ticker_date ({ticker_col}, date)"))
+            # 키가 없는 InnoDB 테이블은 저장 순서(내부 row id)대로 읽히므로 같은 (ticker, date)는 나중 행이 덮어씀
+            conn.execute(text(
+                f"INSERT INTO `{table}_dedup` ({column_sql}) SELECT {column_sql} FROM `{table}` "
+                f"ON DUPLICATE KEY UPDATE {update_sql}"
+            ))
+            conn.execute(text(f"RENAME TABLE `{table}` TO `{table}_old`, `{table}_dedup` TO `{table}`"))
+            conn.execute(text(f"DROP TABLE `{table}_old`"))
+            conn.commit()
+
+    def _bulk_upsert(self, table: str, df: pd.DataFrame, key_columns: List[str], chunk_size: Optional[int] = None) -> int:
+        """
+        multi-row INSERT ... ON DUPLICATE KEY UPDATE로 청크 단위 저장.
+        청크마다 하나의 트랜잭션으로 커밋합니다.
+        """
+        chunk_size = chunk_size or self.config.DB_WRITE_CHUNK_SIZE
+        columns = list(df.columns)
+        column_sql = ", ".join(f"`{c}`" for c in columns)
+        placeholders = ", ".join(["%s"] * len(columns))
+        update_sql = ", ".join(f"`{c}` = VALUES(`{c}`)" for c in columns if c not in key_columns)
+        sql = (
+            f"INSERT INTO `{table}` ({column_sql}) VALUES ({placeholders}) "
+            f"ON DUPLICATE KEY UPDATE {update_sql}"
+        )
+
+        # NaN → NULL, numpy 타입 → 파이썬 기본 타입
+        rows = df.astype(object).where(pd.notna(df), None).values.tolist()
+
+        written = 0
+        conn = self.engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            try:
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start:start + chunk_size]
+                    try:
+                        # pymysql의 executemany는 INSERT ... VALUES를 multi-row 문으로 묶어 실행
+                        cursor.executemany(sql, chunk)
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
+                    written += len(chunk)
+                    self.logger.info(f"{table} 청크 저장: {written}/{len(rows)}")
+            finally:
+                cursor.close()
+        finally:
+            conn.close()
+        return written
+
+    def save_to_database(self, df: pd.DataFrame, chunk_size: Optional[int] = None):
+        """데이터베이스에 저장 ((ticker, date) 기준 upsert)"""
         try:
             if df.empty:
                 self.logger.warning("저장할 데이터가 없습니다.")
                 return
-            
-            # 날짜 컬럼 형식 변환
-            df['date'] = pd.to_datetime(df['date'])
-            
-            # 데이터베이스에 저장
-            df.to_sql("krx_stockprice", con=self.engine, if_exists="append", index=False)
-            
-            self.logger.info(f"데이터베이스 저장 완료: {len(df)}개 레코드")
-            
+
+            # 날짜 컬럼 형식 변환 (호출자의 프레임은 변경하지 않음)
+            df = df.assign(date=pd.to_datetime(df['date']).dt.date)
+
+            # 기간이 겹쳐도 중복 행이 생기지 않도록 유니크 키를 전제로 upsert
+            self._ensure_unique_key(STOCKPRICE_TABLE)
+            written = self._bulk_upsert(STOCKPRICE_TABLE, df, key_columns=["ticker", "date"], chunk_size=chunk_size)
+
+            self.logger.info(f"데이터베이스 저장 완료: {written}개 레코드")
+
         except Exception as e:
             self.logger.error(f"데이터베이스 저장 실패: {e}")
             raise e
     
+    def save_daily_snapshots(self, df: pd.DataFrame):
+        """일자별 순위 스냅샷(krx_daily_snapshot)과 이벤트 목록(krx_daily_events) 갱신"""
+        try:
+            if df.empty:
+                return
+
+            snapshot_df, events_df = build_daily_snapshots(df)
+
+            with self.engine.connect() as conn:
+                conn.execute(text(SNAPSHOT_DDL))
+                conn.execute(text(EVENTS_DDL))
+                # 재계산으로 더 이상 해당하지 않는 이벤트가 남지 않도록 기간 내 이벤트를 지우고 다시 적재
+                conn.execute(
+                    text(f"DELETE FROM {EVENTS_TABLE} WHERE date BETWEEN :start AND :end"),
+                    {"start": snapshot_df["date"].min(), "end": snapshot_df["date"].max()},
+                )
+                conn.commit()
+
+            self._bulk_upsert(SNAPSHOT_TABLE, snapshot_df, key_columns=["date", "ticker"])
+            if not events_df.empty:
+                self._bulk_upsert(EVENTS_TABLE, events_df, key_columns=["date", "event_type", "ticker"])
+
+            self.logger.info(f"스냅샷 저장 완료: 순위 {len(snapshot_df)}개, 이벤트 {len(events_df)}개 레코드")
+
+        except Exception as e:
+            self.logger.error(f"스냅샷 저장 실패: {e}")
+            raise e
+
+        self.save_local_tables(snapshot_df, events_df)
+
+    def save_local_tables(self, snapshot_df: pd.DataFrame, events_df: pd.DataFrame):
+        """로컬 엔진용 LOCAL_TABLES_DIR/<table>.parquet에서 이번 기간을 교체 (실패해도 DB 업데이트는 유지)"""
+        tables_dir = self.config.LOCAL_TABLES_DIR
+        if not tables_dir or snapshot_df.empty:
+            return
+        try:
+            os.makedirs(tables_dir, exist_ok=True)
+            start, end = snapshot_df["date"].min(), snapshot_df["date"].max()
+            for table, df in ((SNAPSHOT_TABLE, snapshot_df), (EVENTS_TABLE, events_df)):
+                replace_date_range(os.path.join(tables_dir, f"{table}.parquet"), df, start, end)
+            self.logger.info(f"로컬 스냅샷/이벤트 파일 갱신: {start} ~ {end}")
+        except Exception as e:
+            self.logger.warning(f"로컬 스냅샷/이벤트 파일 저장 실패: {e}")
+
+    def save_to_parquet(self, df: pd.DataFrame):
+        """로컬 Parquet 사본에 저장 (실패해도 DB 업데이트는 유지)"""
+        if self.parquet_store is None or df.empty:
+            return
+        try:
+            paths = self.parquet_store.write(df)
+            compacted = self.parquet_store.compact()
+            self.logger.info(f"Parquet 저장 완료: {len(paths)}개 파일, 컴팩션 {compacted}개 파티션")
+        except Exception as e:
+            self.logger.warning(f"Parquet 저장 실패: {e}")
+
+    def rebuild_from_parquet(self, start_date: Optional[str] = None, end_date: Optional[str] = None):
+        """Yahoo 재다운로드 없이 로컬 Parquet 사본으로 krx_stockprice를 bulk 재적재"""
+        try:
+            self.logger.info(f"=== Parquet 기반 재적재 시작 ({start_date or '처음'} ~ {end_date or '끝'}) ===")
+            store = self.parquet_store or ParquetStore()
+            stock_data = store.read(start_date=start_date, end_date=end_date)
+            stock_data = stock_data.drop(columns=["year", "month"], errors="ignore")
+
+            if stock_data.empty:
+                self.logger.warning("Parquet 사본에 데이터가 없습니다.")
+                return
+
+            self.save_to_database(stock_data)
+            self.logger.info("=== Parquet 기반 재적재 완료 ===")
+
+        except Exception as e:
+            self.logger.error(f"재적재 실패: {e}")
+            raise e
+
+    def _read_mysql_range(self, table: str, columns, start, end) -> pd.DataFrame:
+        column_sql = ", ".join(f"`{c}`" for c in columns)
+        query = text(f"SELECT {column_sql} FROM `{table}` WHERE date BETWEEN :start AND :end")
+        with self.engine.connect() as conn:
+            return pd.read_sql(query, conn, params={"start": start, "end": end})
+
+    def backfill_parquet(self, start_date: Optional[str] = None, end_date: Optional[str] = None):
+        """
+        MySQL에 이미 쌓인 기간을 로컬 사본으로 한 번 복사 (사본을 켜기 전 데이터는 로컬 엔진이 볼 수 없으므로)
+        krx_stockprice는 월 단위로 읽어 파티션에 쓰고, LOCAL_TABLES_DIR이 있으면 스냅샷/이벤트 파일도 작성.
+        같은 (ticker, date)는 MySQL 값으로 정리되도록 끝에 모든 파티션을 컴팩션합니다.
+        """
+        try:
+            with self.engine.connect() as conn:
+                low, high = conn.execute(text(f"SELECT MIN(date), MAX(date) FROM {STOCKPRICE_TABLE}")).first()
+            if low is None:
+                self.logger.warning("MySQL에 주가 데이터가 없습니다.")
+                return
+            start = max(pd.Timestamp(start_date), pd.Timestamp(low)) if start_date else pd.Timestamp(low)
+            end = min(pd.Timestamp(end_date), pd.Timestamp(high)) if end_date else pd.Timestamp(high)
+            self.logger.info(f"=== Parquet 백필 시작 ({start:%Y-%m-%d} ~ {end:%Y-%m-%d}) ===")
+
+            store = self.parquet_store or ParquetStore()
+            bool_columns = ["signal_bollinger_upper", "signal_bollinger_lower", "golden_cross", "dead_cross"]
+            written = 0
+            for month_start in pd.date_range(start.to_period("M").to_timestamp(), end, freq="MS"):
+                month_end = min(month_start + pd.offsets.MonthEnd(0), end)
+                df = self._read_mysql_range(STOCKPRICE_TABLE, STOCKPRICE_COLUMNS,
+                                            max(month_start, start).date(), month_end.date())
+                if df.empty:
+                    continue
+                # 일일 업데이트가 쓴 파일과 같은 타입으로 맞춤 (MySQL BOOLEAN은 TINYINT로 읽히고,
+                # 한 달 내내 NULL인 지표 칼럼은 object로 읽혀 파일마다 타입이 달라짐)
+                float_columns = [c for c in STOCKPRICE_COLUMNS if c not in ("date", "ticker", "volume", *bool_columns)]
+                df[float_columns] = df[float_columns].apply(pd.to_numeric, errors="coerce").astype(np.float64)
+                df["volume"] = pd.to_numeric(df["volume"], errors="coerce").astype("Int64")
+                df[bool_columns] = df[bool_columns].astype("boolean")
+                store.write(df)
+                written += len(df)
+                self.logger.info(f"Parquet 백필: {month_start:%Y-%m} {len(df)}개 레코드")
+            compacted = store.compact(min_files=1)
+            self.logger.info(f"Parquet 백필 완료: {written}개 레코드, 컴팩션 {compacted}개 파티션")
+
+            tables_dir = self.config.LOCAL_TABLES_DIR
+            if tables_dir:
+                os.makedirs(tables_dir, exist_ok=True)
+                for table, columns in ((SNAPSHOT_TABLE, SNAPSHOT_COLUMNS), (EVENTS_TABLE, EVENT_COLUMNS)):
+                    df = self._read_mysql_range(table, columns, start.date(), end.date())
+                    write_table_file(df.assign(date=pd.to_datetime(df["date"])),
+                                     os.path.join(tables_dir, f"{table}.parquet"))
+                    self.logger.info(f"로컬 {table} 파일 작성: {len(df)}개 레코드")
+
+        except Exception as e:
+            self.logger.error(f"Parquet 백필 실패: {e}")
+            raise e
+
     def get_update_date_range(self) -> tuple:
         """업데이트할 날짜 범위 계산"""
         latest_date = self.get_latest_date_in_db()
@@ -317,19 +650,30 @@ class DailyStockUpdater:
             
             self.logger.info(f"업데이트 날짜 범위: {start_date} ~ {end_date}")
             
-            # 3. 데이터 수집
-            stock_data = self.fetch_all_stocks_data(self.tickers_df['ticker'].tolist(), start_date, end_date)
+            # 3. 데이터 수집 (이동평균/RSI 계산을 위해 시작일 이전 구간도 함께 수집)
+            fetch_start = (
+                datetime.strptime(start_date, "%Y-%m-%d") - timedelta(days=self.config.INDICATOR_LOOKBACK_DAYS)
+            ).strftime("%Y-%m-%d")
+            stock_data = self.fetch_all_stocks_data(self.tickers_df['ticker'].tolist(), fetch_start, end_date)
 
             
-            if stock_data.empty:
+            if stock_data is None or stock_data.empty:
                 self.logger.warning("수집된 데이터가 없습니다.")
                 return
             
-            # 4. 기술적 지표 계산
+            # 4. 기술적 지표 계산 후 업데이트 구간만 남김
+            # (lookback 구간을 upsert하면 이미 저장된 지표가 NaN으로 덮어써짐)
             stock_data = self.compute_technical_indicators(stock_data)
+            stock_data = stock_data[stock_data["date"] >= pd.Timestamp(start_date)]
             
             # 5. 데이터베이스에 저장
             self.save_to_database(stock_data)
+
+            # 6. 일자별 순위 스냅샷/이벤트 테이블 갱신
+            self.save_daily_snapshots(stock_data)
+
+            # 7. 로컬 Parquet 사본 저장
+            self.save_to_parquet(stock_data)
             
             self.logger.info("=== 매일 주가 데이터 업데이트 완료 ===")
             
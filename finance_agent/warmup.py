@@ -0,0 +1,189 @@
+"""
+Warm-up
+배포 직후 첫 질문만 느린 원인(ClovaX TLS 연결, MySQL 접속, 종목 CSV 로드, 최신 거래일 조회,
+노드/그래프 생성과 정규식/프롬프트 준비, sqlglot 첫 파싱)을 백그라운드 스레드에서 미리 처리하고 준비 상태를 보고합니다.
+
+- 단계별 결과(ok / failed / skipped, 소요 시간)는 status()로 확인 (API: GET /readyz)
+- 실패한 단계가 있어도 끝까지 진행. 필수 단계(WARMUP_REQUIRED_STEPS)가 실패하면 준비되지 않음(/readyz 503)으로 보고하고
+  WARMUP_RETRY_SECONDS 간격으로 그 단계만 다시 시도, 필수가 아닌 단계의 실패는 degraded(200)로 보고 (첫 질문에서 다시 시도됨)
+- replay 모드에서 기록된 응답으로 대신하는 호출(DB/LLM)은 건너뜀
+"""
+
+import time
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.config import Config
+from finance_agent.replay import get_cassette
+from finance_agent.tracing import get_tracer
+
+# sqlglot/SqlRepairer 첫 파싱용 쿼리 (파서/토크나이저 초기화)
+SAMPLE_SQL = "SELECT date, close FROM krx_stockprice WHERE ticker = '005930.KS' ORDER BY date DESC LIMIT 1"
+
+
+class _Skipped(Exception):
+    pass
+
+
+class Warmup:
+    """FinanceAgent(와 공용 자원) 워밍업, start()로 백그라운드 실행"""
+
+    def __init__(self, finance_agent):
+        self.config = Config()
+        self.finance_agent = finance_agent
+        self.steps: Dict[str, Dict] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.required = set(self.config.WARMUP_REQUIRED_STEPS)
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    # ----------------- 단계 -----------------
+    def _plan(self) -> List[Tuple[str, Callable[[], Optional[str]]]]:
+        return [
+            ("company_df", self._load_company_df),
+            ("nodes", self._build_nodes),
+            ("graph", self._build_graph),
+            ("sql_parser", self._prime_sql_parser),
+            ("db_pool", self._open_pool),
+            ("latest_date", self._load_latest_date),
+            ("llm", self._ping_llm),
+        ]
+
+    def _load_company_df(self) -> str:
+        from finance_agent.resources import get_company_df
+        return f"{len(get_company_df())}개 종목"
+
+    def _build_nodes(self) -> str:
+        # 노드 생성 = 노드 모듈 import(정규식 컴파일, 프롬프트 템플릿) + 예시/종목 목록/DB 매니저/뉴스 DB 준비
+        agent = self.finance_agent
+        nodes = [agent.input_node, agent.query_parser_node, agent.sql_generator_node,
+                 agent.sql_refiner_node, agent.output_formatter_node, agent.news_node]
+        return f"{len(nodes)}개 노드"
+
+    def _build_graph(self) -> None:
+        self.finance_agent.graph
+
+    def _prime_sql_parser(self) -> None:
+        node = self.finance_agent.sql_generator_node
+        node.sql_repairer.repair(SAMPLE_SQL)
+        node.db_manager.sql_guard.parse(SAMPLE_SQL)
+
+    def _open_pool(self) -> str:
+        if get_cassette().replays("sql"):
+            raise _Skipped("replay 모드")
+        opened = self.finance_agent.sql_generator_node.db_manager.warm_pool(self.config.WARMUP_POOL_CONNECTIONS)
+        return f"커넥션 {opened}개"
+
+    def _load_latest_date(self) -> str:
+        latest_date = self.finance_agent.sql_generator_node.db_manager.get_latest_date()
+        if latest_date is None:
+            raise RuntimeError("최신 거래일을 조회하지 못했습니다.")
+        return latest_date
+
+    def _ping_llm(self) -> None:
+        if not self.config.WARMUP_LLM_PING:
+            raise _Skipped("WARMUP_LLM_PING=false")
+        if get_cassette().mode != "off":
+            # 기록/재생 중에는 cassette에 워밍업 호출을 남기지 않음
+            raise _Skipped(f"REPLAY_MODE={get_cassette().mode}")
+        self.finance_agent.sql_generator_node.llm.ping()
+
+    # ----------------- 실행 -----------------
+    def _run_step(self, name: str, func: Callable[[], Optional[str]]):
+        started = time.perf_counter()
+        with self._lock:
+            self.steps[name] = {"status": "running"}
+        with get_tracer().span(f"warmup.{name}", kind="warmup") as span:
+            try:
+                detail = func()
+                result = {"status": "ok"}
+            except _Skipped as e:
+                detail, result = str(e), {"status": "skipped"}
+            except Exception as e:
+                detail, result = str(e), {"status": "failed"}
+                print(f"[Warmup] {name} 실패: {e}")
+            span.set(status=result["status"])
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        if detail:
+            result["detail"] = detail
+        with self._lock:
+            self.steps[name] = result
+
+    def _unmet(self, steps: Dict[str, Dict]) -> List[str]:
+        """아직 성공(ok/skipped)하지 않은 필수 단계 (재시도 중인 running 포함)"""
+        return [name for name, step in steps.items()
+                if name in self.required and step["status"] not in ("ok", "skipped")]
+
+    def _snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {name: dict(step) for name, step in self.steps.items()}
+
+    def run(self, retry: bool = False) -> "Warmup":
+        """
+        모든 단계를 현재 스레드에서 실행 (끝나면 finished, 필수 단계가 모두 성공했으면 ready)
+        retry=True면 필수 단계가 모두 성공할 때까지 WARMUP_RETRY_SECONDS 간격으로 실패한 필수 단계를 다시 실행
+        """
+        plan = dict(self._plan())
+        self.started_at = time.time()
+        try:
+            for name, func in plan.items():
+                self._run_step(name, func)
+        finally:
+            self.finished_at = time.time()
+            self._done.set()
+        failed = [name for name, step in self.steps.items() if step["status"] == "failed"]
+        print(f"[Warmup] 완료 ({self.finished_at - self.started_at:.1f}s)" + (f", 실패: {failed}" if failed else ""))
+
+        interval = self.config.WARMUP_RETRY_SECONDS
+        while retry and interval > 0 and self._unmet(self._snapshot()):
+            time.sleep(interval)
+            for name in self._unmet(self._snapshot()):
+                self._run_step(name, plan[name])
+            self.finished_at = time.time()
+            if not self._unmet(self._snapshot()):
+                print(f"[Warmup] 필수 단계 재시도 성공 ({self.finished_at - self.started_at:.1f}s)")
+        return self
+
+    def start(self) -> "Warmup":
+        """백그라운드 daemon 스레드에서 run() 시작 (이미 시작했으면 무시)"""
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._thread = threading.Thread(target=self.run, kwargs={"retry": True}, name="warmup", daemon=True)
+        self._thread.start()
+        return self
+
+    # ----------------- 준비 상태 -----------------
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def ready(self) -> bool:
+        """모든 단계를 한 번 실행했고 실패한 필수 단계가 없음"""
+        return self.finished and not self._unmet(self._snapshot())
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def status(self) -> Dict:
+        steps = self._snapshot()
+        unmet = self._unmet(steps)
+        if not self.finished:
+            state = "warming_up" if self.started_at else "pending"
+        elif unmet:
+            state = "not_ready"
+        elif any(step["status"] == "failed" for step in steps.values()):
+            state = "degraded"
+        else:
+            state = "ready"
+        end = self.finished_at or time.time()
+        return {
+            "ready": self.finished and not unmet,
+            "status": state,
+            "required_steps": sorted(self.required),
+            "elapsed_seconds": round(end - self.started_at, 3) if self.started_at else 0.0,
+            "steps": steps,
+        }
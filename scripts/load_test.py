@@ -0,0 +1,369 @@
+"""
+동시 다중 세션 부하 테스트
+N개 세션이 think time을 두고 여러 의도(주가 조회, 스크리닝, 뉴스, 핫뉴스, URL 요약, 뉴스 스케줄링 대화)를
+섞어 보내며 처리량, 지연 시간 꼬리(p95/p99), 연결 수, 세션당 메모리를 측정합니다.
+
+대상:
+    - in-process (기본): 하나의 FinanceAgent + NewsBot을 모든 세션이 공유 (배포 1개와 동일)
+      --backend standin  : 로컬 대체 DB(benchmarks/standin.py) + mock LLM(benchmarks/mock_llm.py, --llm replay면 cassette 재생)
+      --backend cassette : LLM/HTTP/DB 모두 cassette 재생 (scripts/run_replay.py로 운영에서 기록한 파일)
+    - --target http://host:port : HTTP API (POST /chat {"message", "session_id"} → {"response", "session_id"})
+오류율이 --max-error-rate를 넘으면 exit 1로 종료합니다.
+
+사용법:
+    python scripts/load_test.py --sessions 20 --duration 60 --think-time 2
+    python scripts/load_test.py --sessions 50 --latency-scale 0.5 --mix price=4,screen=3,news=2,schedule=1
+    python scripts/load_test.py --target http://localhost:8000 --sessions 100 --duration 120
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+GOLDEN_QUESTIONS_PATH = os.path.join("benchmarks", "fixtures", "golden_questions.jsonl")
+GOLDEN_CASSETTE_PATH = os.path.join("benchmarks", "fixtures", "golden_cassette.jsonl")
+ERROR_MARKERS = ("처리 중 오류가 발생", "오류가 발생했습니다")
+
+# 시나리오 이름 → 골든 질문 category (schedule은 NewsBot 다단계 대화)
+SCENARIO_CATEGORIES = {
+    "price": "price_lookup",
+    "screen": "screen",
+    "news": "news",
+    "today_news": "today_news",
+    "hot_news": "hot_news",
+    "url": "url_summary",
+}
+DEFAULT_MIX = "price=4,screen=3,news=2,today_news=1,hot_news=1,url=1,schedule=1"
+SCHEDULE_CONVERSATIONS = [
+    ["뉴스 스케줄링", "삼성전자", "아니"],
+    ["뉴스 스케줄링", "SK하이닉스", "09:00", "스케줄 확인", "스케줄 취소", "네"],
+]
+
+
+def build_scenarios(base_url: str) -> Dict[str, List[List[str]]]:
+    """시나리오별 대화 목록 (대화 = 한 세션이 연속으로 보내는 메시지)"""
+    by_category = defaultdict(list)
+    with open(GOLDEN_QUESTIONS_PATH, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                by_category[item["category"]].append([item["question"].format(base_url=base_url)])
+    scenarios = {name: by_category[category] for name, category in SCENARIO_CATEGORIES.items() if by_category[category]}
+    scenarios["schedule"] = SCHEDULE_CONVERSATIONS
+    return scenarios
+
+
+def parse_mix(mix: str, scenarios: Dict) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in scenarios:
+            raise ValueError(f"알 수 없는 시나리오: {name} (사용 가능: {', '.join(scenarios)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+# ----------------- 프로세스 지표 -----------------
+def read_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def count_connections() -> Dict[str, int]:
+    """열린 소켓 / 파일 디스크립터 수 (Linux /proc 기준)"""
+    sockets = fds = 0
+    try:
+        for fd in os.listdir("/proc/self/fd"):
+            fds += 1
+            try:
+                if os.readlink(f"/proc/self/fd/{fd}").startswith("socket:"):
+                    sockets += 1
+            except OSError:
+                continue
+    except OSError:
+        pass
+    return {"sockets": sockets, "fds": fds}
+
+
+class Monitor:
+    """부하 중 RSS / 연결 수 / 동시 처리 중 요청 수의 최댓값 샘플링"""
+
+    def __init__(self, interval: float = 0.2, pool_stats: Optional[Callable[[], int]] = None):
+        self.interval = interval
+        self.pool_stats = pool_stats
+        self.peak = defaultdict(float)
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def enter(self):
+        with self._lock:
+            self.in_flight += 1
+            self.peak["in_flight"] = max(self.peak["in_flight"], self.in_flight)
+
+    def exit(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def sample(self):
+        values = {"rss_mb": read_rss_mb(), **count_connections()}
+        if self.pool_stats:
+            values["db_pool_checked_out"] = self.pool_stats()
+        for key, value in values.items():
+            self.peak[key] = max(self.peak[key], value)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+# ----------------- 세션 실행 -----------------
+def in_process_sender(router):
+    from finance_agent.chat_router import ChatSession
+
+    def make_session():
+        session = ChatSession()
+        return lambda message: router.handle(session, message) or "", session
+    return make_session
+
+
+def http_sender(target: str, timeout: float):
+    import requests
+    import uuid
+
+    def make_session():
+        http = requests.Session()
+        session_id = str(uuid.uuid4())
+
+        def send(message: str) -> str:
+            res = http.post(f"{target.rstrip('/')}/chat", json={"message": message, "session_id": session_id}, timeout=timeout)
+            res.raise_for_status()
+            return res.json().get("response") or ""
+        return send, None
+    return make_session
+
+
+def run_session(index: int, make_session, scenarios, weights, args, deadline: float, monitor: Monitor, records: List):
+    rng = random.Random(args.seed + index)
+    time.sleep(args.ramp_up * index / max(1, args.sessions))
+    send, session = make_session()
+    names, weight_values = list(weights), list(weights.values())
+
+    def think():
+        if args.think_time > 0:
+            time.sleep(min(rng.expovariate(1 / args.think_time), args.think_time * 5))
+
+    while time.time() < deadline:
+        scenario = rng.choices(names, weight_values)[0]
+        for message in rng.choice(scenarios[scenario]):
+            if time.time() >= deadline:
+                break
+            monitor.enter()
+            started = time.perf_counter()
+            error = ""
+            try:
+                response = send(message)
+                if any(marker in response for marker in ERROR_MARKERS):
+                    error = response[:120]
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"[:120]
+            finally:
+                monitor.exit()
+            records.append({
+                "session": index,
+                "scenario": scenario,
+                "latency_ms": (time.perf_counter() - started) * 1000,
+                "end": time.time(),
+                "error": error,
+            })
+            think()
+    return session
+
+
+def setup_in_process(args):
+    """in-process 대상 준비 (환경 변수 설정 → 대체 DB 생성 → FinanceAgent/NewsBot 생성)"""
+    mock = args.backend == "standin" and args.llm == "mock"
+    os.environ["REPLAY_MODE"] = "off" if mock else "replay"
+    os.environ["REPLAY_CASSETTE"] = args.cassette
+    os.environ["REPLAY_LATENCY_SCALE"] = str(args.latency_scale)
+    base_url = f"http://127.0.0.1:{args.http_port}"
+    if args.backend == "standin":
+        from benchmarks.standin import build_standin, standin_env, start_article_server
+        os.environ.update(standin_env(args.root))
+        os.environ["REPLAY_KINDS"] = "llm"
+        start_article_server(args.http_port)
+        build_standin(args.root, base_url, n_tickers=args.tickers)
+    else:
+        os.environ["REPLAY_KINDS"] = "llm,http,sql"
+    if mock:
+        from benchmarks.mock_llm import install_mock_llm, load_sql_answers
+        install_mock_llm(args.mock_latency * args.latency_scale, args.mock_jitter,
+                         answers=load_sql_answers(GOLDEN_QUESTIONS_PATH), seed=args.seed)
+
+    from finance_agent.chat_router import ChatRouter
+    router = ChatRouter()
+
+    def pool_checked_out() -> int:
+        engines = {id(db.engine): db.engine for db in (router.finance_agent.news_node.news_db, router.news_bot.news_db) if db.engine}
+        return sum(engine.pool.checkedout() for engine in engines.values() if hasattr(engine.pool, "checkedout"))
+    return router, base_url, pool_checked_out
+
+
+def report(records: List[Dict], elapsed: float, args, monitor: Monitor, baseline_rss: float, sessions: List) -> Dict:
+    from finance_agent.tracing import percentiles
+
+    ok = [r for r in records if not r["error"]]
+    summary = {
+        "sessions": args.sessions,
+        "duration_s": round(elapsed, 1),
+        "requests": len(records),
+        "errors": len(records) - len(ok),
+        "throughput_rps": round(len(ok) / elapsed, 3) if elapsed else 0.0,
+        "latency_ms": percentiles([round(r["latency_ms"], 1) for r in ok], points=(50, 90, 95, 99)),
+        "by_scenario": {},
+        "peak": {k: round(v, 1) for k, v in monitor.peak.items()},
+        "rss_baseline_mb": round(baseline_rss, 1),
+        "memory_per_session_kb": round((monitor.peak["rss_mb"] - baseline_rss) * 1024 / max(1, args.sessions), 1),
+    }
+    by_scenario = defaultdict(list)
+    for r in records:
+        by_scenario[r["scenario"]].append(r)
+    for name, items in sorted(by_scenario.items()):
+        latencies = [round(r["latency_ms"], 1) for r in items if not r["error"]]
+        summary["by_scenario"][name] = {
+            "requests": len(items),
+            "errors": sum(1 for r in items if r["error"]),
+            **percentiles(latencies, points=(50, 95, 99)),
+        }
+    histories = [len(s.chat_history) for s in sessions if s is not None]
+    if histories:
+        summary["chat_history_messages_per_session"] = round(sum(histories) / len(histories), 1)
+    return summary
+
+
+def print_report(summary: Dict):
+    lat = summary["latency_ms"]
+    print(f"\n=== 부하 테스트 결과 ({summary['sessions']}세션, {summary['duration_s']}s) ===")
+    print(f"요청 {summary['requests']}건, 오류 {summary['errors']}건, 처리량 {summary['throughput_rps']:.2f} req/s")
+    if lat:
+        print(f"지연 시간 p50={lat['p50']:.0f}ms p90={lat['p90']:.0f}ms p95={lat['p95']:.0f}ms p99={lat['p99']:.0f}ms")
+    print(f"\n{'scenario':<12}{'n':>6}{'err':>6}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for name, s in summary["by_scenario"].items():
+        if s.get("count"):
+            print(f"{name:<12}{s['requests']:>6}{s['errors']:>6}{s['p50']:>8.0f}ms{s['p95']:>8.0f}ms{s['p99']:>8.0f}ms")
+        else:
+            print(f"{name:<12}{s['requests']:>6}{s['errors']:>6}{'-':>10}{'-':>10}{'-':>10}")
+    peak = summary["peak"]
+    print(f"\n최대 동시 처리 {peak.get('in_flight', 0):.0f}건, 소켓 {peak.get('sockets', 0):.0f}개, fd {peak.get('fds', 0):.0f}개"
+          + (f", DB 풀 사용 {peak['db_pool_checked_out']:.0f}개" if "db_pool_checked_out" in peak else ""))
+    print(f"RSS {summary['rss_baseline_mb']:.0f}MB → 최대 {peak.get('rss_mb', 0):.0f}MB, 세션당 약 {summary['memory_per_session_kb']:.0f}KB"
+          + (f" (세션당 대화 기록 {summary['chat_history_messages_per_session']}개)" if "chat_history_messages_per_session" in summary else ""))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="FinanceAgent + NewsBot 동시 세션 부하 테스트")
+    parser.add_argument("--sessions", type=int, default=10, help="동시 세션 수")
+    parser.add_argument("--duration", type=float, default=60, help="측정 시간 (초)")
+    parser.add_argument("--ramp-up", type=float, default=5, help="세션 시작을 나눠 퍼뜨리는 시간 (초)")
+    parser.add_argument("--think-time", type=float, default=2.0, help="메시지 사이 평균 대기 (초, 지수 분포, 0이면 대기 없음)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="시나리오 가중치 (예: price=4,screen=3,schedule=1)")
+    parser.add_argument("--target", help="HTTP API 주소 (없으면 in-process)")
+    parser.add_argument("--timeout", type=float, default=120, help="HTTP 요청 타임아웃 (초)")
+    parser.add_argument("--backend", choices=["standin", "cassette"], default="standin", help="in-process 대상의 DB/HTTP 백엔드")
+    parser.add_argument("--llm", choices=["mock", "replay"], default="mock", help="standin 백엔드의 LLM (mock 또는 cassette 재생)")
+    parser.add_argument("--mock-latency", type=float, default=0.8, help="mock LLM 호출당 지연 (초, --latency-scale 적용)")
+    parser.add_argument("--mock-jitter", type=float, default=0.3, help="mock LLM 지연 변동 비율 (0.3이면 ±30%%)")
+    parser.add_argument("--cassette", default=GOLDEN_CASSETTE_PATH, help="재생할 cassette (LLM 응답/지연)")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="재생/mock 지연 배율 (0이면 대기 없음)")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="허용 오류율 (넘으면 exit 1)")
+    parser.add_argument("--root", default=os.path.join(tempfile.gettempdir(), "finance_agent_standin"), help="대체 DB 생성 경로")
+    parser.add_argument("--tickers", type=int, default=200)
+    parser.add_argument("--http-port", type=int, default=18765, help="기사 HTML 로컬 서버 포트")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    pool_stats = None
+    if args.target:
+        make_session = http_sender(args.target, args.timeout)
+        base_url = f"http://127.0.0.1:{args.http_port}"
+    else:
+        router, base_url, pool_stats = setup_in_process(args)
+        make_session = in_process_sender(router)
+
+    scenarios = build_scenarios(base_url)
+    weights = parse_mix(args.mix, scenarios)
+
+    monitor = Monitor(pool_stats=pool_stats)
+    baseline_rss = read_rss_mb()
+    records: List[Dict] = []
+    sessions: List = [None] * args.sessions
+    deadline = time.time() + args.ramp_up + args.duration
+
+    def worker(i: int):
+        sessions[i] = run_session(i, make_session, scenarios, weights, args, deadline, monitor, records)
+
+    print(f"세션 {args.sessions}개, {args.duration:.0f}s (+ramp-up {args.ramp_up:.0f}s), think {args.think_time}s, "
+          f"대상 {args.target or f'in-process/{args.backend}' + (f'/{args.llm}' if args.backend == 'standin' else '')}")
+    stdout = sys.stdout
+    started = time.time()
+    monitor.start()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(args.sessions)]
+    with open(os.devnull, "w") as devnull:
+        sys.stdout = devnull  # 노드 디버그 출력 숨김
+        try:
+            for t in threads:
+                t.start()
+            last_progress = started
+            while any(t.is_alive() for t in threads):
+                time.sleep(0.5)
+                if time.time() - last_progress >= 5:
+                    last_progress = time.time()
+                    print(f"  {last_progress - started:6.0f}s  요청 {len(records)}건, 처리 중 {monitor.in_flight}건", file=stdout, flush=True)
+        finally:
+            sys.stdout = stdout
+    monitor.stop()
+
+    summary = report(records, time.time() - started, args, monitor, baseline_rss, sessions)
+    print_report(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    error_rate = summary["errors"] / summary["requests"] if summary["requests"] else 1.0
+    if error_rate > args.max_error_rate:
+        print(f"\n✗ 오류율 {error_rate:.1%}가 허용치 {args.max_error_rate:.1%}를 넘었습니다.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Schema Management Runner
+krx_stockprice / News 인덱스·칼럼 타입 점검, 마이그레이션, 생성 쿼리 EXPLAIN 점검 스크립트
+"""
+
+import sys
+import os
+import argparse
+
+# 프로젝트 루트 디렉터리를 Python path에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finance_agent.schema_manager import SchemaManager
+
+
+def run_inspect(manager: SchemaManager):
+    """현재 칼럼 타입/인덱스 출력"""
+    print(manager.inspect())
+    return 0
+
+
+def run_migrate(manager: SchemaManager, dry_run: bool):
+    """인덱스 생성, market 칼럼 추가, 칼럼 타입 축소"""
+    statements = manager.migrate(dry_run=dry_run)
+    if not statements:
+        print("✓ 변경할 내용이 없습니다.")
+    elif dry_run:
+        print(f"(dry-run) {len(statements)}개 ALTER 문이 실행될 예정입니다.")
+    else:
+        print(f"✓ {len(statements)}개 ALTER 문 실행 완료")
+        print("market 칼럼을 사용하려면 USE_MARKET_COLUMN=true로 설정하세요.")
+    return 0
+
+
+def run_explain(manager: SchemaManager, log_path: str, limit: int):
+    """기록된 생성 쿼리 중 풀 스캔이 남은 쿼리 보고"""
+    report = manager.find_full_scans(log_path, limit)
+    if not report:
+        print("✓ 풀 스캔 쿼리가 없습니다.")
+        return 0
+
+    for item in report:
+        print("-" * 60)
+        if item.get("user_query"):
+            print(f"질문: {item['user_query']}")
+        print(f"SQL: {' '.join(item['sql'].split())}")
+        if "error" in item:
+            print(f"EXPLAIN 실패: {item['error']}")
+        else:
+            print(f"풀 스캔 테이블: {', '.join(item['tables'])} (예상 {item['rows']:,}행)")
+    print("-" * 60)
+    print(f"✗ {len(report)}개 쿼리에서 풀 스캔 또는 오류 발견")
+    return 1
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='DB 스키마/인덱스 관리 스크립트')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('inspect', help='칼럼 타입/인덱스 조회')
+
+    migrate_parser = subparsers.add_parser('migrate', help='인덱스/칼럼 마이그레이션')
+    migrate_parser.add_argument('--dry-run', action='store_true', help='실행하지 않고 ALTER 문만 출력')
+
+    explain_parser = subparsers.add_parser('explain', help='생성 쿼리 EXPLAIN 점검')
+    explain_parser.add_argument('--log', default=None, help='생성 쿼리 로그 경로 (기본: SQL_QUERY_LOG_PATH)')
+    explain_parser.add_argument('--limit', type=int, default=200, help='점검할 최근 쿼리 수')
+
+    args = parser.parse_args()
+    manager = SchemaManager()
+
+    if args.command == 'inspect':
+        return run_inspect(manager)
+    elif args.command == 'migrate':
+        return run_migrate(manager, args.dry_run)
+    elif args.command == 'explain':
+        return run_explain(manager, args.log, args.limit)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,22 +2,22 @@
 
 import sys
 import os
-import uuid
 import threading
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from finance_agent.agent import FinanceAgent
 from finance_agent.news_bot import NewsBot
-from langchain_core.messages import HumanMessage, AIMessage
+from finance_agent.chat_router import ChatRouter, ChatSession
+from finance_agent.tracing import start_metrics_server
+from config.config import Config
 
 class AgentController:
     def __init__(self):
         self.finance_agent = FinanceAgent()
         self.news_bot = NewsBot()
-        self.active_mode = 'finance'
-        self.session_id = str(uuid.uuid4())
-        self.chat_history = []
+        self.router = ChatRouter(self.finance_agent, self.news_bot)
+        self.session = ChatSession()
 
     def run(self):
         print("=== KU-gent v2.6 (Stable) ===")
@@ -29,6 +29,9 @@ class AgentController:
 
         scheduler_thread = threading.Thread(target=self.news_bot.run_scheduler, daemon=True)
         scheduler_thread.start()
+        # 사용자가 첫 질문을 입력하는 동안 노드/커넥션/LLM 연결 준비
+        if Config.WARMUP_ON_START:
+            self.finance_agent.warm_up()
 
         while True:
             try:
@@ -39,42 +42,7 @@ class AgentController:
                     print("🤖: Agent를 종료합니다.")
                     break
 
-                # --- 라우팅 로직 ---
-                response = None
-                
-                # NewsBot 키워드가 우선순위를 가짐
-                if any(kw in user_input for kw in ["스케줄 확인", "스케줄 취소", "뉴스 스케줄링", "주간 보고서 테스트"]):
-                    self.active_mode = 'news_bot'
-                    if "스케줄 확인" in user_input:
-                        response = self.news_bot.show_schedules(self.session_id)
-                    elif "스케줄 취소" in user_input:
-                        response = self.news_bot.start_cancellation(self.session_id)
-                    elif "뉴스 스케줄링" in user_input:
-                        response = self.news_bot.start_conversation(self.session_id)
-                    elif "주간 보고서 테스트" in user_input:
-                        response = self.news_bot.trigger_weekly_report(self.session_id)
-                
-                # 현재 NewsBot 모드에서 대화가 진행 중일 경우
-                elif self.active_mode == 'news_bot':
-                    response = self.news_bot.handle_message(self.session_id, user_input)
-                
-                # 위 모든 경우에 해당하지 않으면 FinanceAgent가 처리
-                else:
-                    self.active_mode = 'finance' # 확실하게 finance 모드임을 명시
-                    result = self.finance_agent.process_query(
-                        user_query=user_input, 
-                        session_id=self.session_id,
-                        chat_history=self.chat_history 
-                    )
-                    response = result.get('response') or result.get("clarification_question")
-                    if response:
-                        self.chat_history.append(HumanMessage(content=user_input))
-                        self.chat_history.append(AIMessage(content=response))
-
-                # ✨ [수정된 부분] NewsBot과의 대화가 끝났는지 확인하고 모드 전환
-                session_state = self.news_bot.conversation_state.get(self.session_id, {})
-                if self.active_mode == 'news_bot' and session_state.get("current_task") is None:
-                    self.active_mode = 'finance'
+                response = self.router.handle(self.session, user_input)
 
                 print(f"🤖: {response}")
                 if response: print()
@@ -88,6 +56,8 @@ class AgentController:
                 traceback.print_exc()
 
 def main():
+    if Config.METRICS_PORT:
+        start_metrics_server(Config.METRICS_PORT)
     controller = AgentController()
     controller.run()
     return 0
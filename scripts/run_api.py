@@ -0,0 +1,52 @@
+"""
+FinanceAgent HTTP API 서버 (finance_agent/api.py)를 uvicorn으로 실행합니다.
+
+사용법:
+    python scripts/run_api.py                              # 0.0.0.0:8000 (API_HOST / API_PORT)
+    python scripts/run_api.py --port 8080 --threads 16 --max-concurrency 32 --timeout 45
+    python scripts/run_api.py --workers 2                  # 프로세스 2개 (프로세스마다 에이전트/커넥션 풀을 따로 가짐)
+
+    curl -X POST localhost:8000/chat -H 'Content-Type: application/json' -d '{"message": "삼성전자 어제 종가"}'
+    curl -N -X POST localhost:8000/chat/stream -H 'Content-Type: application/json' -d '{"message": "삼성전자 어제 종가"}'
+"""
+
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="FinanceAgent HTTP API 서버")
+    parser.add_argument("--host", help="바인드 주소 (기본: API_HOST)")
+    parser.add_argument("--port", type=int, help="포트 (기본: API_PORT)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 프로세스 수")
+    parser.add_argument("--threads", type=int, help="프로세스당 에이전트 작업 스레드 수 (기본: API_WORKER_THREADS)")
+    parser.add_argument("--max-concurrency", type=int, help="프로세스당 동시 처리 요청 상한 (기본: API_MAX_CONCURRENCY)")
+    parser.add_argument("--timeout", type=float, help="요청 응답 마감 시간(초) (기본: API_REQUEST_TIMEOUT_SECONDS)")
+    args = parser.parse_args()
+
+    # Config는 import 시점에 환경 변수를 읽으므로 (uvicorn worker 프로세스에도 전달되도록) 먼저 설정
+    if args.threads:
+        os.environ["API_WORKER_THREADS"] = str(args.threads)
+    if args.max_concurrency:
+        os.environ["API_MAX_CONCURRENCY"] = str(args.max_concurrency)
+    if args.timeout:
+        os.environ["API_REQUEST_TIMEOUT_SECONDS"] = str(args.timeout)
+
+    import uvicorn
+    from config.config import Config
+
+    config = Config()
+    uvicorn.run(
+        "finance_agent.api:app",
+        host=args.host or config.API_HOST,
+        port=args.port or config.API_PORT,
+        workers=args.workers,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
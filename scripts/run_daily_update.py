@@ -55,13 +55,58 @@ def run_force_update(days: int = 30):
     finally:
         updater.close_connection()
 
+def run_rebuild(start_date: str = None, end_date: str = None):
+    """Parquet 사본으로 DB 재적재"""
+    print("=== Parquet 사본 기반 DB 재적재 시작 ===")
+    print(f"실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    updater = DailyStockUpdater()
+    
+    try:
+        updater.rebuild_from_parquet(start_date, end_date)
+        print("✓ 재적재 완료!")
+        return 0
+        
+    except Exception as e:
+        print(f"✗ 재적재 실패: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    finally:
+        updater.close_connection()
+
+def run_backfill(start_date: str = None, end_date: str = None):
+    """MySQL에 쌓인 데이터로 로컬 Parquet 사본(+ LOCAL_TABLES_DIR 스냅샷/이벤트 파일) 백필"""
+    print("=== MySQL 기반 Parquet 사본 백필 시작 ===")
+    print(f"실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    updater = DailyStockUpdater()
+    
+    try:
+        updater.backfill_parquet(start_date, end_date)
+        print("✓ 백필 완료!")
+        return 0
+        
+    except Exception as e:
+        print(f"✗ 백필 실패: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    finally:
+        updater.close_connection()
+
 def main():
     """메인 실행 함수"""
     parser = argparse.ArgumentParser(description='주가 데이터 업데이트 스크립트')
-    parser.add_argument('--mode', choices=['daily', 'force'], default='daily',
-                       help='업데이트 모드 (daily: 매일 업데이트, force: 강제 전체 업데이트)')
+    parser.add_argument('--mode', choices=['daily', 'force', 'rebuild', 'backfill'], default='daily',
+                       help='업데이트 모드 (daily: 매일 업데이트, force: 강제 전체 업데이트, rebuild: Parquet 사본으로 DB 재적재, '
+                            'backfill: MySQL 데이터로 Parquet 사본 백필)')
     parser.add_argument('--days', type=int, default=30,
                        help='강제 업데이트 시 가져올 일수 (기본: 30일)')
+    parser.add_argument('--start', default=None, help='재적재/백필 시작일 (YYYY-MM-DD)')
+    parser.add_argument('--end', default=None, help='재적재/백필 종료일 (YYYY-MM-DD)')
     
     args = parser.parse_args()
     
@@ -69,6 +114,10 @@ def main():
         return run_daily_update()
     elif args.mode == 'force':
         return run_force_update(args.days)
+    elif args.mode == 'rebuild':
+        return run_rebuild(args.start, args.end)
+    elif args.mode == 'backfill':
+        return run_backfill(args.start, args.end)
 
 
 if __name__ == "__main__":
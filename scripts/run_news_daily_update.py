@@ -1,11 +1,24 @@
+import sys
+import os
+import time
 from sqlalchemy import create_engine, text
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
 import pandas as pd
-import time
 from datetime import datetime, timedelta
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finance_agent.html_parsing import parse_many, shutdown_pool
+from finance_agent.http_client import fetch
+
+LIST_URL = "https://news.naver.com/main/list.naver?mode=LS2D&mid=shm&sid1=101&date={date}&page={page}"
+# 한 번에 받아서 파싱하는 목록 페이지 수
+PAGE_BATCH = 10
+# 목록 페이지 요청 간격 (초, 이전 브라우저 크롤링 루프와 같은 속도)
+PAGE_DELAY_SECONDS = 1.5
+# 목록 페이지 요청 실패 시 재시도 횟수와 대기 시간 (초, 시도마다 2배)
+FETCH_RETRIES = 3
+RETRY_DELAY_SECONDS = 5.0
+
 # DB 설정
 DB_CONFIG = {
     'user': 'admin',
@@ -27,45 +40,48 @@ def get_latest_date_from_db():
         result = conn.execute(text(query)).scalar()
         return result if result else None
 
-def get_economy_news_by_date(date_str, max_page=250):
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    driver = webdriver.Chrome(options=options)
+def fetch_list_page(date_str, page):
+    """목록 페이지 원본 HTML(bytes), 실패하면 None"""
+    try:
+        res = fetch(LIST_URL.format(date=date_str, page=page), timeout=10)
+    except Exception as e:
+        print(f"목록 페이지 {page} 요청 실패: {e}")
+        return None
+    if res.status_code != 200:
+        print(f"목록 페이지 {page} 요청 실패: HTTP {res.status_code}")
+        return None
+    return res.content
+
+def fetch_list_pages(date_str, pages):
+    """fetch 단계: 경제 뉴스 목록 페이지 원본 HTML(bytes), 재시도해도 받지 못한 페이지가 있으면 RuntimeError"""
+    raw_pages = []
+    for i, page in enumerate(pages):
+        if i:
+            time.sleep(PAGE_DELAY_SECONDS)
+        for attempt in range(FETCH_RETRIES + 1):
+            if attempt:
+                time.sleep(RETRY_DELAY_SECONDS * 2 ** (attempt - 1))
+            content = fetch_list_page(date_str, page)
+            if content is not None:
+                break
+        else:
+            # 실패한 페이지를 빈 페이지로 보면 그 뒤 기사를 모두 놓치므로 중단
+            raise RuntimeError(f"{date_str} 목록 페이지를 가져오지 못했습니다 (page={page})")
+        raw_pages.append(content)
+    return raw_pages
 
+def get_economy_news_by_date(date_str, max_page=250):
     articles = []
-    for page in range(1, max_page + 1):
-        url = f"https://news.naver.com/main/list.naver?mode=LS2D&mid=shm&sid1=101&date={date_str}&page={page}"
-        driver.get(url)
-        time.sleep(1.5)
-
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        news_list = soup.select("ul.type06_headline li") + soup.select("ul.type06 li")
-        if not news_list:
-            break
-
-        for li in news_list:
-            title, href = None, None
-            img_tag = li.select_one("dt.photo img")
-            if img_tag and img_tag.has_attr("alt"):
-                title = img_tag["alt"].strip()
-                a_tag = li.select_one("dt.photo a")
-                if a_tag and a_tag.has_attr("href"):
-                    href = a_tag["href"]
-
-            if not title or not href:
-                for a in li.select("dt a"):
-                    t = a.get_text(strip=True)
-                    h = a.get("href", "")
-                    if t and "n.news.naver.com" in h:
-                        title = t
-                        href = h
-                        break
-            if title and href:
-                articles.append({"date": date_str, "title": title, "link": href})
-
-    driver.quit()
+    for start in range(1, max_page + 1, PAGE_BATCH):
+        if start > 1:
+            time.sleep(PAGE_DELAY_SECONDS)
+        raw_pages = fetch_list_pages(date_str, range(start, min(start + PAGE_BATCH, max_page + 1)))
+        # parse 단계: 페이지가 많으면 프로세스 풀에서 파싱하고 {title, link}만 돌려받음
+        for items in parse_many("news_list", raw_pages):
+            # 정상적으로 받은 페이지에 기사가 없으면 마지막 페이지를 지난 것
+            if not items:
+                return pd.DataFrame(articles)
+            articles.extend({"date": date_str, **item} for item in items)
     return pd.DataFrame(articles)
 
 def insert_news_to_db(df):
@@ -91,19 +107,30 @@ def main():
     
     print(f"📆 수집 기간: {start_date.strftime('%Y%m%d')} ~ {end_date.strftime('%Y%m%d')}")
 
+    failed = False
     for single_date in pd.date_range(start=start_date, end=end_date):
         date_str = single_date.strftime('%Y%m%d')
         print(f"크롤링 중: {date_str}")
-        df = get_economy_news_by_date(date_str)
+        try:
+            df = get_economy_news_by_date(date_str)
+        except RuntimeError as e:
+            # 다음 실행은 DB의 마지막 날짜 다음 날부터 수집하므로, 이후 날짜로 넘어가지 않고 중단
+            print(f"❌ {e}")
+            failed = True
+            break
         if not df.empty:
             insert_news_to_db(df)
             print(f"→ {len(df)}건 저장 완료")
         else:
             print("→ 데이터 없음")
 
+    shutdown_pool()
     print("🧹 오래된 뉴스 삭제 중...")
     delete_old_news()
+    if failed:
+        return 1
     print("✅ 완료")
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+질문 목록을 FinanceAgent.process_query로 실행하면서 LLM/HTTP/DB 트래픽을 기록하거나 재생합니다.
+
+사용법:
+    # 운영 환경에서 기록 (ClovaX/Naver/RDS 접속 필요)
+    python scripts/run_replay.py record --cassette data/cassettes/smoke.jsonl "7월 3일 삼성전자 종가를 말해줘"
+    # 오프라인에서 재생 (기록된 지연 그대로, --latency-scale 0이면 대기 없음)
+    python scripts/run_replay.py replay --cassette data/cassettes/smoke.jsonl --file questions.txt --repeat 3
+"""
+
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def load_questions(args) -> list:
+    questions = list(args.questions)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            questions += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    return questions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="process_query record/replay 실행")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("questions", nargs="*", help="실행할 질문")
+    parser.add_argument("--file", help="질문 목록 파일 (한 줄에 하나)")
+    parser.add_argument("--cassette", help="cassette 경로 (기본: REPLAY_CASSETTE)")
+    parser.add_argument("--latency-scale", type=float, help="재생 지연 배율 (기본: REPLAY_LATENCY_SCALE)")
+    parser.add_argument("--strict", action="store_true", help="요청이 정확히 일치하는 기록만 재생")
+    parser.add_argument("--repeat", type=int, default=1, help="질문 목록 반복 횟수")
+    args = parser.parse_intermixed_args()
+
+    questions = load_questions(args)
+    if not questions:
+        parser.error("질문을 인자 또는 --file로 지정하세요.")
+
+    # Config는 import 시점에 환경 변수를 읽으므로 먼저 설정
+    os.environ["REPLAY_MODE"] = args.mode
+    if args.cassette:
+        os.environ["REPLAY_CASSETTE"] = args.cassette
+    if args.latency_scale is not None:
+        os.environ["REPLAY_LATENCY_SCALE"] = str(args.latency_scale)
+    if args.strict:
+        os.environ["REPLAY_STRICT"] = "true"
+
+    from finance_agent.agent import FinanceAgent
+    from finance_agent.tracing import get_tracer
+
+    agent = FinanceAgent()
+    for round_no in range(args.repeat):
+        for question in questions:
+            started = time.perf_counter()
+            result = agent.process_query(question)
+            elapsed = (time.perf_counter() - started) * 1000
+            answer = (result.get("response") or result.get("clarification_question") or "").replace("\n", " ")
+            print(f"[{round_no + 1}] {elapsed:8.1f}ms  {question}  →  {answer[:80]}")
+
+    tracer = get_tracer()
+    print("\n=== 지연 시간 (ms) ===")
+    for kind in ("request", "node", "llm", "sql", "http"):
+        for name, stats in sorted(tracer.latency_summary(kind).items()):
+            print(f"{name:<32} n={stats['count']:<4} p50={stats['p50']:>9.1f} p95={stats['p95']:>9.1f} p99={stats['p99']:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,11 @@
 
 import streamlit as st
 import time
-import threading
-from langchain_core.messages import HumanMessage, AIMessage
 
-# 기존의 에이전트와 봇 코드를 그대로 가져옵니다.
-from finance_agent.agent import FinanceAgent
-from finance_agent.news_bot import NewsBot
+# CLI / API와 같은 라우팅 규칙을 사용합니다.
+from config.config import Config
+from finance_agent.chat_router import ChatRouter
+from finance_agent.session_store import SessionStore
 
 # ----------------------------------------------------
 # ✨ 1. 페이지 설정 및 세션 상태 초기화
@@ -25,25 +24,34 @@ st.caption("주간 보고서 요약 : '뉴스 스케줄링', '스케줄 취소',
 st.caption("'quit' 또는 '종료' 입력 시 종료됩니다.\n")
 
 
-# Streamlit의 세션 상태(st.session_state)를 사용해 각 사용자별 대화 상태를 저장합니다.
-# 이렇게 하면 웹 페이지가 새로고침 되어도 정보가 유지됩니다.
+@st.cache_resource(show_spinner="에이전트를 준비하는 중...")
+def get_router() -> ChatRouter:
+    """서버 프로세스당 한 번만 생성해 모든 방문자가 공유
+    (컴파일된 그래프, DB 커넥션 풀, LLM 클라이언트, 종목 목록, NewsBot 스케줄러)"""
+    router = ChatRouter()
+    router.news_bot.scheduler.start()
+    # 첫 방문자의 질문이 접속/로드 비용을 내지 않도록 백그라운드에서 준비
+    if Config.WARMUP_ON_START:
+        router.finance_agent.warm_up()
+    return router
+
+
+@st.cache_resource
+def get_sessions() -> SessionStore:
+    """방문자별 ChatSession 저장소 (API와 같은 유휴 만료/세션 수/메모리 상한,
+    만료된 세션의 NewsBot 대화 상태도 함께 정리)"""
+    router = get_router()
+    return SessionStore(on_evict=router.news_bot.forget_session, loader=router.restore)
+
+
+router = get_router()
+sessions = get_sessions()
+
+# Streamlit의 세션 상태(st.session_state)에는 방문자별 가벼운 상태(세션 id, 화면에 그릴 메시지)만 저장합니다.
+# 대화 기록/모드는 프로세스 공용 SessionStore에 두어 떠난 방문자의 상태가 만료되도록 합니다.
 if "session_id" not in st.session_state:
-    # 각 에이전트와 봇을 세션 상태에 한 번만 초기화
-    st.session_state.finance_agent = FinanceAgent()
-    st.session_state.news_bot = NewsBot()
-    st.session_state.session_id = str(id(st.session_state.news_bot)) # 고유 ID 생성
-    
-    # 백그라운드 스케줄러 실행 (웹 앱이 시작될 때 한 번만)
-    scheduler_thread = threading.Thread(
-        target=st.session_state.news_bot.run_scheduler, 
-        daemon=True
-    )
-    scheduler_thread.start()
-    
-    # 대화 기록, 모드 등을 초기화
+    st.session_state.session_id = sessions.get().session_id
     st.session_state.messages = []
-    st.session_state.active_mode = 'finance'
-    st.session_state.chat_history = []
 
 # ----------------------------------------------------
 # ✨ 2. 이전 대화 내용 표시
@@ -68,44 +76,13 @@ if prompt := st.chat_input("질문을 입력하세요..."):
         message_placeholder = st.empty()
         full_response = ""
 
-        # --- 기존 AgentController의 라우팅 로직을 여기에 구현 ---
-        response = None
-        user_input = prompt
-        
-        # NewsBot 키워드 우선 처리
-        if any(kw in user_input for kw in ["스케줄 확인", "스케줄 취소", "뉴스 스케줄링", "주간 보고서 테스트"]):
-            st.session_state.active_mode = 'news_bot'
-            if "스케줄 확인" in user_input:
-                response = st.session_state.news_bot.show_schedules(st.session_state.session_id)
-            elif "스케줄 취소" in user_input:
-                response = st.session_state.news_bot.start_cancellation(st.session_state.session_id)
-            elif "뉴스 스케줄링" in user_input:
-                response = st.session_state.news_bot.start_conversation(st.session_state.session_id)
-            elif "주간 보고서 테스트" in user_input:
-                response = st.session_state.news_bot.trigger_weekly_report(st.session_state.session_id)
-        
-        # NewsBot 대화 진행
-        elif st.session_state.active_mode == 'news_bot':
-            response = st.session_state.news_bot.handle_message(st.session_state.session_id, user_input)
-        
-        # 기본 FinanceAgent 처리
-        else:
-            st.session_state.active_mode = 'finance'
-            with st.spinner("생각 중..."): # 처리 중임을 시각적으로 표시
-                result = st.session_state.finance_agent.process_query(
-                    user_query=user_input, 
-                    session_id=st.session_state.session_id,
-                    chat_history=st.session_state.chat_history 
-                )
-            response = result.get('response') or result.get("clarification_question")
-            if response:
-                st.session_state.chat_history.append(HumanMessage(content=user_input))
-                st.session_state.chat_history.append(AIMessage(content=response))
-
-        # NewsBot 대화가 끝나면 finance 모드로 복귀
-        session_state = st.session_state.news_bot.conversation_state.get(st.session_state.session_id, {})
-        if st.session_state.active_mode == 'news_bot' and session_state.get("current_task") is None:
-            st.session_state.active_mode = 'finance'
+        # NewsBot 키워드/대화는 NewsBot, 그 밖의 질문은 FinanceAgent가 처리
+        # (오래된 대화는 요약으로 접어 턴당 프롬프트 크기를 일정하게 유지)
+        with st.spinner("생각 중..."): # 처리 중임을 시각적으로 표시
+            session = sessions.get(st.session_state.session_id)
+            with session.lock:
+                response = router.handle(session, prompt) or "응답을 생성하지 못했습니다."
+            sessions.update(session)
         
         # 타이핑 효과처럼 보이도록 응답을 한 글자씩 표시
         for chunk in response.split():
@@ -114,5 +91,6 @@ if prompt := st.chat_input("질문을 입력하세요..."):
             message_placeholder.markdown(full_response + "▌")
         message_placeholder.markdown(full_response)
     
-    # 봇의 최종 응답을 대화 기록에 저장
+    # 봇의 최종 응답을 대화 기록에 저장 (화면에 다시 그리는 메시지는 최근 WEB_DEMO_MAX_MESSAGES개만 유지)
     st.session_state.messages.append({"role": "assistant", "content": full_response})
+    del st.session_state.messages[:-Config.WEB_DEMO_MAX_MESSAGES]